@@ -1,7 +1,11 @@
 from src.fltk import *
 from time import sleep
 import src.fltk
-from collections import deque
+from src import compilation, recherche, rendu
+import src.piste
+
+INTERVALLE_AFFICHAGE = 0.05
+"""Délai minimal, en secondes, entre deux affichages d'une recherche en cours."""
 
 def dessine_case():
     """
@@ -12,18 +16,13 @@ def dessine_case():
     - '*': Bleu
     - '#': Vert
 
+    La piste est peinte une seule fois dans une image (voir `src.rendu`),
+    affichée ensuite en un seul objet du canevas.
+
     Returns:
         None
     """
-    couleur = {'>': '#808080', '*': '#0000FF', '#': '#008000'}
-    for y in range(len(piste)):
-        for x in range(len(piste[y])):
-            caractere = piste[y][x]
-            if caractere in couleur:
-                abscisse_centre = x * taille_case + taille_case // 2
-                ordonnee_centre = y * taille_case + taille_case // 2
-                rayon = taille_case // 2 + 4.5
-                cercle(abscisse_centre, ordonnee_centre, rayon, remplissage=couleur[caractere], couleur=couleur[caractere])
+    image_memoire(0, 0, rendu.image_piste(piste, taille_case), ancrage='nw')
 
 def dessine_grille():
     """
@@ -62,55 +61,6 @@ def vitesse(trajectoire):
     dy = y2 - y1
     return (dx, dy) 
 
-def verif_collision_souple(debut, fin):
-    """
-    Vérifie s'il y a une collision souple entre le point de départ et le point d'arrivée.
-
-    Args:
-        debut (tuple): Tuple (x, y) représentant la position de départ.
-        fin (tuple): Tuple (x, y) représentant la position d'arrivée.
-
-    Returns:
-        bool: True si aucune collision, False sinon.
-    """
-    x1, y1 = debut
-    x2, y2 = fin
-    if piste[y2][x2] == '#':
-        return False
-    return True
-
-def verif_collision_strict(debut, fin):
-    """
-    Vérifie s'il y a une collision stricte entre le point de départ et le point d'arrivée.
-
-    Args:
-        debut (tuple): Tuple (x, y) représentant la position de départ.
-        fin (tuple): Tuple (x, y) représentant la position d'arrivée.
-
-    Returns:
-        bool: True si aucune collision, False sinon.
-    """
-    x1, y1 = debut
-    x2, y2 = fin
-    dx = abs(x2 - x1)
-    dy = -abs(y2 - y1) 
-    sx = 1 if x1 < x2 else -1 
-    sy = 1 if y1 < y2 else -1
-    err = dx + dy 
-    while True:
-        if piste[y1][x1] == '#':  
-            return False
-        if x1 == x2 and y1 == y2: 
-            break
-        e2 = 2 * err  
-        if e2 >= dy:
-            err += dy
-            x1 += sx
-        if e2 <= dx:  
-            err += dx  
-            y1 += sy
-    return True
-
 def options(trajectoire):
     """
     Génère les options de mouvement valides pour la trajectoire actuelle.
@@ -119,37 +69,23 @@ def options(trajectoire):
 
     Returns:
         list: Liste de tuples (x, y) représentant les positions valides."""
-    positions_valides = []
     if not trajectoire:
-        positions_valides = [(x, y) for y, lig in enumerate(piste) for x, char in enumerate(lig) if char == '>']
-    else:
-        derniere_position = trajectoire[-1] 
-        v = vitesse(trajectoire)
-        point_principal = (derniere_position[0] + v[0], derniere_position[1] + v[1])
-        for dx in range(-1, 2): 
-            for dy in range(-1, 2):
-                px, py = point_principal[0] + dx, point_principal[1] + dy
-                if 0 <= px < len(piste[0]) and 0 <= py < len(piste): 
-                    if souple:
-                        if verif_collision_souple(derniere_position, (px, py)):
-                            positions_valides.append((px, py))
-                    else:
-                        if verif_collision_strict(derniere_position, (px, py)):
-                            positions_valides.append((px, py))
-    return positions_valides
+        return [piste.coordonnees(indice) for indice in piste.departs]
+    return recherche.successeurs(regles[souple], trajectoire[-1], vitesse(trajectoire))
 
-def dessine_options(options):
+def dessine_options(options, tag=''):
     """
     Dessine les options de mouvement valides sur le plateau de jeu.
 
     Args:
         options (list): Liste de tuples (x, y) représentant les positions valides.
+        tag (str): Étiquette des objets dessinés, pour pouvoir les effacer avec `efface`.
 
     Returns:
         None
     """
     for x, y in options:
-        cercle(x * taille_case + taille_case // 2, y * taille_case + taille_case // 2, taille_case // 4, remplissage='white', couleur='black')
+        cercle(x * taille_case + taille_case // 2, y * taille_case + taille_case // 2, taille_case // 4, remplissage='white', couleur='black', tag=tag)
 
 def couleur_vitesse(longueur_segment, longueur_max):
     """
@@ -166,52 +102,186 @@ def couleur_vitesse(longueur_segment, longueur_max):
     bleu = int((1 - proportion) * 255)
     return f'#{rouge:02X}00{bleu:02X}'
 
-def dessine_trajectoire(trajectoire):
+def longueur_max_segments(trajectoire):
+    """
+    Calcule la longueur du plus long segment de la trajectoire, qui fixe l'échelle des couleurs.
+
+    Args:
+        trajectoire (list): Liste de tuples représentant les positions (x, y).
+
+    Returns:
+        float: La longueur maximale, ou 1 si aucun segment n'est de longueur non nulle.
+    """
+    return max((longueur_segment(a, b) for a, b in zip(trajectoire, trajectoire[1:])), default=0) or 1
+
+def longueur_segment(debut, fin):
+    """
+    Calcule la longueur d'un segment.
+
+    Args:
+        debut, fin (tuple): Positions (x, y) des extrémités du segment.
+
+    Returns:
+        float: La longueur euclidienne du segment.
+    """
+    return ((fin[0] - debut[0]) ** 2 + (fin[1] - debut[1]) ** 2) ** 0.5
+
+def dessine_segment(debut, fin, longueur_max, tag=''):
+    """
+    Dessine un segment de trajectoire et le point d'arrivée du coup.
+
+    Args:
+        debut, fin (tuple): Positions (x, y) des extrémités du segment.
+        longueur_max (float): Longueur de référence pour la couleur (voir `couleur_vitesse`).
+        tag (str): Étiquette des objets dessinés, pour pouvoir les effacer avec `efface`.
+
+    Returns:
+        tuple: Les identifiants des deux objets dessinés.
+    """
+    x1, y1 = debut
+    x2, y2 = fin
+    longueur = longueur_segment(debut, fin)
+    couleur = couleur_vitesse(longueur, longueur_max) if longueur > 0 else '#0000FF'  # Default to blue for no movement
+    return (ligne(x1 * taille_case + taille_case // 2, y1 * taille_case + taille_case // 2,
+                  x2 * taille_case + taille_case // 2, y2 * taille_case + taille_case // 2,
+                  couleur=couleur, epaisseur=3, tag=tag),
+            cercle(x2 * taille_case + taille_case // 2, y2 * taille_case + taille_case // 2, taille_case // 5, remplissage=couleur, couleur=couleur, tag=tag))
+
+def dessine_trajectoire(trajectoire, tag=''):
     """
     Dessine la trajectoire actuelle sur le plateau de jeu.
 
     Args:
         trajectoire (list): Liste de tuples représentant les positions (x, y).
+        tag (str): Étiquette des objets dessinés, pour pouvoir les effacer avec `efface`.
 
     Returns:
-        None"""
+        list: Pour chaque segment, les identifiants des objets dessinés."""
+    longueur_max = longueur_max_segments(trajectoire)
+    return [dessine_segment(debut, fin, longueur_max, tag) for debut, fin in zip(trajectoire, trajectoire[1:])]
+
+def affiche_trajectoire():
+    """
+    Redessine entièrement la couche 'trajectoire' à partir de la variable globale `trajectoire`.
+
+    Met à jour les variables globales `segments` (objets dessinés pour chaque
+    segment) et `echelle` (longueur de référence des couleurs).
+
+    Returns:
+        None
+    """
+    global segments, echelle
+    efface('trajectoire')
+    echelle = longueur_max_segments(trajectoire)
+    segments = dessine_trajectoire(trajectoire, tag='trajectoire')
+
+def ajoute_segment():
+    """
+    Dessine le segment menant à la dernière position de `trajectoire`.
+
+    Seul ce segment est dessiné, sauf s'il est plus long que tous les
+    précédents : l'échelle des couleurs change et la couche est redessinée.
+
+    Returns:
+        None
+    """
     if len(trajectoire) < 2:
         return
-    longueurs = [
-        ((trajectoire[i][0] - trajectoire[i - 1][0]) ** 2 + (trajectoire[i][1] - trajectoire[i - 1][1]) ** 2) ** 0.5
-        for i in range(1, len(trajectoire))
-        if (trajectoire[i][0] - trajectoire[i - 1][0]) ** 2 + (trajectoire[i][1] - trajectoire[i - 1][1]) ** 2 > 0
-    ]
-    longueur_max = max(longueurs) if longueurs else 1
-
-    for i in range(1, len(trajectoire)):
-        x1, y1 = trajectoire[i - 1]
-        x2, y2 = trajectoire[i]
-        longueur_segment = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
-        couleur = couleur_vitesse(longueur_segment, longueur_max) if longueur_segment > 0 else '#0000FF'  # Default to blue for no movement
-        ligne(x1 * taille_case + taille_case // 2, y1 * taille_case + taille_case // 2,
-              x2 * taille_case + taille_case // 2, y2 * taille_case + taille_case // 2,
-              couleur=couleur, epaisseur=3)
-        cercle(x2 * taille_case + taille_case // 2, y2 * taille_case + taille_case // 2, taille_case // 5, remplissage=couleur, couleur=couleur)
+    if longueur_segment(trajectoire[-2], trajectoire[-1]) > echelle:
+        affiche_trajectoire()
+    else:
+        segments.append(dessine_segment(trajectoire[-2], trajectoire[-1], echelle, tag='trajectoire'))
+
+def retire_segment():
+    """
+    Efface le dernier segment dessiné, après le retrait d'une position de `trajectoire`.
+
+    La couche est redessinée si le segment retiré fixait l'échelle des couleurs.
+
+    Returns:
+        None
+    """
+    if segments:
+        for objet in segments.pop():
+            efface(objet)
+    if longueur_max_segments(trajectoire) != echelle:
+        affiche_trajectoire()
+
+def affiche_coups():
+    """
+    Remplace les couches 'options' et 'distance' d'après les variables globales
+    `options_valides` et `trajectoire`.
+
+    Returns:
+        None
+    """
+    efface('options')
+    efface('distance')
+    dessine_options(options_valides, tag='options')
+    dessine_distance(trajectoire)
 
 def charger(fichier):
     """
     Charge une piste de jeu depuis un fichier texte.
 
+    La piste et ses champs de distances sont lus dans le cache des pistes
+    compilées (voir `src.compilation`) ; seule la première ouverture d'une
+    piste les calcule. Les états vivants, plus longs à calculer, le sont à la
+    première recherche de chaque mode de règles puis ajoutés au cache.
+
     Args:
         fichier (str): Le chemin vers le fichier texte contenant la piste.
 
     Returns:
-        list: Une liste de listes représentant la piste de jeu.
+        Piste: La piste de jeu (utilisable comme une liste de lignes), ou None si le fichier est invalide
+        (la ligne et la colonne de l'erreur sont alors affichées).
     """
-    with open(fichier, 'r') as file:
-        piste = []
-        for line in file:
-            line = line.strip() 
-            if any(char not in '.#>*' for char in line):
-                return None
-            piste.append(list(line))
-        return piste
+    try:
+        return compilation.charger(fichier)
+    except src.piste.PisteInvalide as erreur:
+        print(f"Piste invalide : {fichier}, {erreur}")
+        return None
+
+def ouvrir_piste(fichier):
+    """
+    Charge une piste, calcule une fois pour toutes ses données dérivées et l'affiche.
+
+    Met à jour les variables globales `piste`, `regles` (contexte de recherche pour
+    chaque mode de règles) et les dimensions du plateau.
+
+    Args:
+        fichier (str): Le chemin vers le fichier texte contenant la piste.
+
+    Returns:
+        bool: True si la piste a été chargée, False sinon.
+    """
+    global piste, regles, largeur_plateau, hauteur_plateau, trajectoire, options_valides
+    piste = charger(fichier)
+    if not piste:
+        return False
+    regles = {regle: recherche.Regles(piste, regle, elaguer=True) for regle in (True, False)}
+    largeur_plateau = piste.largeur
+    hauteur_plateau = piste.hauteur
+    redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
+    trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+    return True
+
+def dessine_distance(trajectoire):
+    """
+    Affiche le nombre de cases restant jusqu'à l'arrivée depuis la position actuelle.
+
+    Args:
+        trajectoire (list): Liste de tuples représentant les positions (x, y).
+
+    Returns:
+        None
+    """
+    if not trajectoire:
+        return
+    x, y = trajectoire[-1]
+    distance = regles[souple].distances()[piste.indice(x, y)]
+    message = f"Arrivée : {distance} cases" if distance >= 0 else "Arrivée inaccessible"
+    texte(5, 5, message, taille=12, couleur='black', ancrage='nw', tag='distance')
 
 def afficher_piste_txt(piste, taille_case):
     """
@@ -221,16 +291,21 @@ def afficher_piste_txt(piste, taille_case):
         piste (list): Une liste de listes représentant la piste de jeu.
         taille_case (int): La taille de chaque case sur le plateau.
 
+    La piste et la grille ne sont dessinées qu'ici : pendant la partie, seules
+    les couches 'trajectoire', 'options' et 'distance' sont modifiées.
+
     Returns:
         tuple: La trajectoire initiale (liste vide) et les options valides.
     """
+    global segments, echelle, ecran_affiche
     efface_tout()
+    ecran_affiche = None
     trajectoire = []
+    segments, echelle = [], 1
     options_valides = options(trajectoire)
     dessine_case()
     dessine_grille()
-    dessine_trajectoire(trajectoire)
-    dessine_options(options_valides)
+    dessine_options(options_valides, tag='options')
     mise_a_jour()
     return trajectoire, options_valides
 
@@ -244,13 +319,15 @@ def afficher_piste_img(piste, taille_case, im):
     Returns:
         tuple: La trajectoire initiale (liste vide) et les options valides.
     """
+    global segments, echelle, ecran_affiche
     efface_tout()
+    ecran_affiche = None
     image(400, 400, im, largeur=800, hauteur=800, ancrage='center')
     trajectoire = []
+    segments, echelle = [], 1
     options_valides = options(trajectoire)
     dessine_grille()
-    dessine_trajectoire(trajectoire)
-    dessine_options(options_valides)
+    dessine_options(options_valides, tag='options')
     mise_a_jour()
     return trajectoire, options_valides
 
@@ -264,12 +341,9 @@ def on_backspace():
     global trajectoire, options_valides
     if in_game and trajectoire:
         trajectoire.pop()
+        retire_segment()
         options_valides = options(trajectoire)
-        efface_tout()
-        dessine_case()
-        dessine_grille()
-        dessine_trajectoire(trajectoire)
-        dessine_options(options_valides)
+        affiche_coups()
         mise_a_jour()
 
 def on_escape():
@@ -318,32 +392,44 @@ def verifier_victoire(position):
         bool: True si la position est une position de victoire, False sinon.
     """
     x, y = position
-    return piste[y][x] == '*'
+    return piste.arrivee[piste.indice(x, y)] == 1
+
+def affiche_recherche(trajectoire):
+    """
+    Affiche l'état courant d'une recherche automatique sur le plateau de jeu.
+
+    Seuls la trajectoire courante et ses options, dessinés avec l'étiquette
+    'recherche', sont remplacés : la piste et la grille restent en place.
+
+    Args:
+        trajectoire (list): Liste de tuples représentant les positions (x, y).
+
+    Returns:
+        None
+    """
+    efface('recherche')
+    dessine_trajectoire(trajectoire, tag='recherche')
+    dessine_options(options(trajectoire), tag='recherche')
+    mise_a_jour()
 
 def recherche_profondeur_iterative(trajectoire_init):
-    stack = [(trajectoire_init, set())]
-    compteur = 0  
-    while stack:
-        trajectoire, visite = stack.pop()
-        position = trajectoire[-1]
-        config = (position, vitesse(trajectoire))
-        if config in visite:
-            continue
-        visite.add(config)
-        compteur += 1
-        if compteur % 500 == 0:
-            efface_tout()
-            dessine_case()
-            dessine_grille()
-            dessine_trajectoire(trajectoire)
-            dessine_options(options(trajectoire))
-            mise_a_jour()
-        if verifier_victoire(position):
-            return trajectoire
-        for option in options(trajectoire):
-            nouvelle_trajectoire = trajectoire + [option]
-            stack.append((nouvelle_trajectoire, visite.copy()))
-    return None
+    """
+    Recherche une trajectoire gagnante en utilisant l'algorithme de parcours en profondeur (DFS).
+
+    Les coups qui rapprochent le plus de l'arrivée sont essayés en premier.
+    La recherche est affichée au plus toutes les `INTERVALLE_AFFICHAGE` secondes.
+
+    Args:
+        trajectoire_init (list): Trajectoire à prolonger ; vide, la recherche part de
+            toutes les cases de départ à la fois.
+
+    Returns:
+        list: La trajectoire gagnante si elle existe, sinon None.
+    """
+    solution = recherche.recherche_profondeur(regles[souple], trajectoire_init, rappel=affiche_recherche,
+                                              frequence=64, ordonner=True, intervalle=INTERVALLE_AFFICHAGE)
+    compilation.completer(piste)
+    return solution
 
 def trouver_trajectoire_gagnante():
     """
@@ -352,65 +438,210 @@ def trouver_trajectoire_gagnante():
         None
     """
     global trajectoire
-    trajectoire = [(depart_x, depart_y)]
+    trajectoire = []
+    efface_tout()
+    dessine_case()
+    dessine_grille()
     solution = recherche_profondeur_iterative(trajectoire)
+    efface('recherche')
     if solution:
         print("Trajectoire gagnante trouvée :", solution)
         trajectoire = solution
-        dessine_trajectoire(trajectoire)
-        mise_a_jour()
+        affiche_trajectoire()
     else:
         print("Aucune trajectoire gagnante trouvée")
+    mise_a_jour()
 
 def recherche_largeur(trajectoire):
     """
     Recherche une trajectoire gagnante en utilisant l'algorithme de parcours en largeur (BFS).
     Args:
-        trajectoire (list): Liste contenant la position de départ [(x, y)].
+        trajectoire (list): Trajectoire à prolonger ; vide, la recherche part de
+            toutes les cases de départ à la fois.
         
     Returns:
         list: La trajectoire gagnante si elle existe, sinon None.
     """
-    queue = deque()
-    queue.append((trajectoire.copy(), vitesse(trajectoire)))
-    visite = set()
-    while queue:
-        current_traj, current_vitesse = queue.popleft()
-        position = current_traj[-1]
-        config = (position, current_vitesse)
-        if config in visite:
-            continue
-        visite.add(config)
-        if piste[position[1]][position[0]] == '*':  
-            return current_traj
-        for option in options(current_traj):
-            new_traj = current_traj + [option]
-            queue.append((new_traj, vitesse(new_traj)))
-    return None
+    solution = recherche.recherche_largeur(regles[souple], trajectoire)
+    compilation.completer(piste)
+    return solution
 
 def trouver_trajectoire_largeur():
     """
     Initialise et lance la recherche en largeur.
     """
     global trajectoire
-    trajectoire = [(depart_x, depart_y)]
+    trajectoire = []
     print("Début de la recherche en largeur...")
     solution = recherche_largeur(trajectoire)
     if solution:
         print("Trajectoire trouvée :", solution)
         trajectoire = solution
-        dessine_trajectoire(trajectoire)
+        affiche_trajectoire()
+        mise_a_jour()
+    else:
+        print("Aucune trajectoire trouvée.")
+
+def recherche_a_etoile(trajectoire):
+    """
+    Recherche une trajectoire gagnante de longueur minimale avec l'algorithme A*.
+    Args:
+        trajectoire (list): Trajectoire à prolonger ; vide, la recherche part de
+            toutes les cases de départ à la fois.
+
+    Returns:
+        list: La trajectoire gagnante si elle existe, sinon None.
+    """
+    solution = recherche.recherche_a_etoile(regles[souple], trajectoire)
+    compilation.completer(piste)
+    return solution
+
+def trouver_trajectoire_a_etoile():
+    """
+    Initialise et lance la recherche A*.
+    """
+    global trajectoire
+    trajectoire = []
+    print("Début de la recherche A*...")
+    solution = recherche_a_etoile(trajectoire)
+    if solution:
+        print("Trajectoire trouvée :", solution)
+        trajectoire = solution
+        affiche_trajectoire()
         mise_a_jour()
     else:
         print("Aucune trajectoire trouvée.")
 
+def dessine_menu():
+    """
+    Dessine l'écran du menu principal.
+
+    Returns:
+        None
+    """
+    image(600, 300, "assets/interface.png", ancrage='center')
+    image(55, 50, "assets/regle.png", largeur=80, hauteur=80, ancrage='center')
+    texte(55, 100, "Règles", police='jumble', ancrage='center', couleur='white')
+    rectangle(230, 350, 400, 400, remplissage="#29C230")
+    centre_x = (230 + 400) / 2
+    centre_y = (350 + 400) / 2
+    texte(centre_x, centre_y, "Manuel", police='jumble', ancrage='center', couleur='white')
+    rectangle(760, 350, 990, 450, remplissage="#29C230")
+    centre_x = (760 + 990) / 2
+    centre_y = (350 + 400) / 2
+    texte(centre_x, centre_y, "Recherche", police='jumble', ancrage='center', couleur='white')
+    texte(centre_x, 410, "en profondeur", police='jumble', ancrage='center', couleur='white')
+    rectangle(515, 500, 685, 590, remplissage="#29C230")
+    centre_x = (515 + 685) / 2
+    centre_y = (500 + 550) / 2
+    texte(centre_x, centre_y, "Recherche", police='jumble', ancrage='center', couleur='white')
+    texte(centre_x, 560, "en largeur", police='jumble', ancrage='center', couleur='white')
+    rectangle(1000, 20, 1190, 60, remplissage="#EC9033")
+    centre_x = (1000 + 1190) / 2
+    centre_y = (20 + 60) / 2
+    texte(centre_x, centre_y, "How to play", police='jumble', ancrage='center', couleur='white')
+    rectangle(540, 250, 660, 300, remplissage="#FF0000")
+    texte(600, 275, "Quitter", police='jumble', ancrage='center', couleur='white')
+
+def dessine_aide():
+    """
+    Dessine l'écran d'aide.
+
+    Returns:
+        None
+    """
+    image(600,300,'assets/how_to_play.png',largeur=1200, hauteur=600, ancrage = "center") 
+    image(1035,515,'assets/btm.png',largeur=120, hauteur=60, ancrage = "center") 
+
+def dessine_regles():
+    """
+    Dessine l'écran de choix des règles.
+
+    Returns:
+        None
+    """
+    image(600, 300, "assets/Background.png", ancrage='center')
+    rectangle(160, 110, 415, 370, couleur='green',remplissage="white")
+    image(290, 250, "assets/règles souples.png", largeur=250, hauteur=250, ancrage='center')
+    rectangle(780, 110, 1035, 370, couleur='green',remplissage="white")
+    image(910, 250, "assets/règles strictes.png", largeur=250, hauteur=250, ancrage='center')
+    image(605,550,'assets/btm.png',largeur=120, hauteur=60, ancrage = "center") 
+    dessine_choix_regles()
+
+def dessine_choix_regles():
+    """
+    Dessine les cadres indiquant les règles choisies, avec l'étiquette 'choix_regles'.
+
+    Seule cette partie de l'écran des règles change quand on clique sur un cadre.
+
+    Returns:
+        None
+    """
+    efface('choix_regles')
+    if souple == False:
+        rectangle(170, 40, 410, 90, couleur='red', tag='choix_regles')
+        texte(185, 50, "Règles souples", couleur='darkred', police='benguiat', taille="22", tag='choix_regles')
+    elif souple:
+        rectangle(170, 40, 410, 90, couleur='green', tag='choix_regles')
+        texte(185, 50, "Règles souples", couleur='darkgreen', police='benguiat', taille="22", tag='choix_regles')
+
+    if strict == False:
+        rectangle(805, 40, 1040, 90, couleur='red', tag='choix_regles')
+        texte(820, 50, "Règles strictes", couleur='darkred', police='benguiat', taille="22", tag='choix_regles')
+    elif strict:
+        rectangle(805, 40, 1040, 90, couleur='green', tag='choix_regles')
+        texte(820, 50, "Règles strictes", couleur='darkgreen', police='benguiat', taille="22", tag='choix_regles')
+
+def dessine_pistes():
+    """
+    Dessine l'écran de choix de la piste.
+
+    Returns:
+        None
+    """
+    image(600, 300, "assets/Background.png", ancrage='center')
+    texte(550, 30, "Pistes", couleur='white', police='benguiat', taille="30")
+    image(605,555,'assets/btm.png',largeur=120, hauteur=60, ancrage = "center")  
+    rectangle(30, 150, 230, 350, couleur='green',remplissage="white")
+    image(130, 250, "assets/map1.png",largeur=170, hauteur=150, ancrage='center')
+    rectangle(260, 150, 460, 350, couleur='green',remplissage="white")
+    image(360, 250, "assets/map2.png",largeur=170, hauteur=150, ancrage='center')
+    rectangle(490, 150, 690, 350, couleur='green',remplissage="white")
+    image(590, 250, "assets/map3.png",largeur=170, hauteur=150, ancrage='center')
+    rectangle(720, 150, 920, 350, couleur='green',remplissage="white")
+    image(820, 250, "assets/map4.png", largeur=170, hauteur=150, ancrage='center')
+    rectangle(950, 150, 1150, 350, couleur='green',remplissage="white")
+    image(1050, 250, "assets/map6.png", largeur=170, hauteur=150, ancrage='center')
+
+ECRANS = {'menu': dessine_menu, 'aide': dessine_aide, 'regles': dessine_regles, 'pistes': dessine_pistes}
+"""Fonctions de dessin des écrans de menu."""
+
+def affiche_ecran(nom):
+    """
+    Affiche l'écran de menu `nom`, sauf s'il est déjà à l'écran.
+
+    Les objets d'un écran sont créés une seule fois, à l'arrivée sur l'écran :
+    tant qu'aucun événement ne modifie l'affichage, la boucle d'événements ne
+    redessine rien.
+
+    Args:
+        nom (str): Nom d'un écran de `ECRANS`.
+
+    Returns:
+        None
+    """
+    global ecran_affiche
+    if ecran_affiche != nom:
+        efface_tout()
+        ECRANS[nom]()
+        ecran_affiche = nom
+
 if __name__ == "__main__":
     taille_case = 20
     souple = False
     strict = False
     largeur_plateau = 60
     hauteur_plateau = 30
-    depart_x, depart_y = 1, 1
     menu = True
     regle = False
     how_to_play = False
@@ -420,33 +651,11 @@ if __name__ == "__main__":
     jouer = True
     in_game = False
     trajectoire = []
+    ecran_affiche = None
     cree_fenetre(largeur_plateau * taille_case, hauteur_plateau * taille_case)
     while jouer:
         while menu:
-            efface_tout()
-            image(600, 300, "assets/interface.png", ancrage='center')
-            image(55, 50, "assets/regle.png", largeur=80, hauteur=80, ancrage='center')
-            texte(55, 100, "Règles", police='jumble', ancrage='center', couleur='white')
-            rectangle(230, 350, 400, 400, remplissage="#29C230")
-            centre_x = (230 + 400) / 2
-            centre_y = (350 + 400) / 2
-            texte(centre_x, centre_y, "Manuel", police='jumble', ancrage='center', couleur='white')
-            rectangle(760, 350, 990, 450, remplissage="#29C230")
-            centre_x = (760 + 990) / 2
-            centre_y = (350 + 400) / 2
-            texte(centre_x, centre_y, "Recherche", police='jumble', ancrage='center', couleur='white')
-            texte(centre_x, 410, "en profondeur", police='jumble', ancrage='center', couleur='white')
-            rectangle(515, 500, 685, 590, remplissage="#29C230")
-            centre_x = (515 + 685) / 2
-            centre_y = (500 + 550) / 2
-            texte(centre_x, centre_y, "Recherche", police='jumble', ancrage='center', couleur='white')
-            texte(centre_x, 560, "en largeur", police='jumble', ancrage='center', couleur='white')
-            rectangle(1000, 20, 1190, 60, remplissage="#EC9033")
-            centre_x = (1000 + 1190) / 2
-            centre_y = (20 + 60) / 2
-            texte(centre_x, centre_y, "How to play", police='jumble', ancrage='center', couleur='white')
-            rectangle(540, 250, 660, 300, remplissage="#FF0000")
-            texte(600, 275, "Quitter", police='jumble', ancrage='center', couleur='white')
+            affiche_ecran('menu')
 
             ev = donne_ev()
             ty = type_ev(ev)
@@ -476,8 +685,7 @@ if __name__ == "__main__":
                     menu = False
             mise_a_jour()
         while how_to_play:
-            image(600,300,'assets/how_to_play.png',largeur=1200, hauteur=600, ancrage = "center") 
-            image(1035,515,'assets/btm.png',largeur=120, hauteur=60, ancrage = "center") 
+            affiche_ecran('aide')
             mise_a_jour()
             ev = donne_ev()
             ty = type_ev(ev)
@@ -489,27 +697,7 @@ if __name__ == "__main__":
                     menu = True
                     how_to_play = False
         while regle:
-            efface_tout()
-            image(600, 300, "assets/Background.png", ancrage='center')
-            rectangle(160, 110, 415, 370, couleur='green',remplissage="white")
-            image(290, 250, "assets/règles souples.png", largeur=250, hauteur=250, ancrage='center')
-            rectangle(780, 110, 1035, 370, couleur='green',remplissage="white")
-            image(910, 250, "assets/règles strictes.png", largeur=250, hauteur=250, ancrage='center')
-
-            if souple == False:
-                rectangle(170, 40, 410, 90, couleur='red')
-                texte(185, 50, "Règles souples", couleur='darkred', police='benguiat', taille="22")
-            elif souple:
-                rectangle(170, 40, 410, 90, couleur='green')
-                texte(185, 50, "Règles souples", couleur='darkgreen', police='benguiat', taille="22")
-
-            if strict == False:
-                rectangle(805, 40, 1040, 90, couleur='red')
-                texte(820, 50, "Règles strictes", couleur='darkred', police='benguiat', taille="22")
-            elif strict:
-                rectangle(805, 40, 1040, 90, couleur='green')
-                texte(820, 50, "Règles strictes", couleur='darkgreen', police='benguiat', taille="22")
-            image(605,550,'assets/btm.png',largeur=120, hauteur=60, ancrage = "center") 
+            affiche_ecran('regles')
 
             ev = donne_ev()
             ty = type_ev(ev)
@@ -523,10 +711,12 @@ if __name__ == "__main__":
                     souple = not souple
                     if souple:
                         strict = False
+                    dessine_choix_regles()
                 elif 800 <= abscisse(ev) <= 1025 and 40 <= ordonnee(ev) <= 90:
                     strict = not strict
                     if strict:
                         souple = False
+                    dessine_choix_regles()
                 elif 540 <= abscisse(ev) <= 670 and 525 <= ordonnee(ev) <= 575:
                     regle = False
                     menu = True
@@ -534,20 +724,7 @@ if __name__ == "__main__":
             mise_a_jour()
 
         while manuel:
-            efface_tout()
-            image(600, 300, "assets/Background.png", ancrage='center')
-            texte(550, 30, "Pistes", couleur='white', police='benguiat', taille="30")
-            image(605,555,'assets/btm.png',largeur=120, hauteur=60, ancrage = "center")  
-            rectangle(30, 150, 230, 350, couleur='green',remplissage="white")
-            image(130, 250, "assets/map1.png",largeur=170, hauteur=150, ancrage='center')
-            rectangle(260, 150, 460, 350, couleur='green',remplissage="white")
-            image(360, 250, "assets/map2.png",largeur=170, hauteur=150, ancrage='center')
-            rectangle(490, 150, 690, 350, couleur='green',remplissage="white")
-            image(590, 250, "assets/map3.png",largeur=170, hauteur=150, ancrage='center')
-            rectangle(720, 150, 920, 350, couleur='green',remplissage="white")
-            image(820, 250, "assets/map4.png", largeur=170, hauteur=150, ancrage='center')
-            rectangle(950, 150, 1150, 350, couleur='green',remplissage="white")
-            image(1050, 250, "assets/map6.png", largeur=170, hauteur=150, ancrage='center')
+            affiche_ecran('pistes')
             mise_a_jour()
 
             ev = donne_ev()
@@ -564,91 +741,33 @@ if __name__ == "__main__":
                     menu = True
                     continue
                 elif 30 <= x <= 230 and 150 <= y <= 350:
-                    piste = charger('assets/map_mini.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map_mini.txt'):
                         manuel = False
                         menu = False
                         in_game = True
                 elif 260 <= x <= 460 and 150 <= y <= 350:
-                    piste = charger('assets/map_test.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map_test.txt'):
                         manuel = False
                         menu = False
                         in_game = True
                 elif 490 <= x <= 690 and 150 <= y <= 350:
-                    piste = charger('assets/map2.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map2.txt'):
                         manuel = False
                         menu = False
                         in_game = True
                 elif 720 <= x <= 920 and 150 <= y <= 350:
-                    piste = charger('assets/map1.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map1.txt'):
                         manuel = False
                         menu = False
                         in_game = True
                 elif 950 <= x <= 1150 and 150 <= y <= 350:
-                    piste = charger('assets/map3.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case )
+                    if ouvrir_piste('assets/map3.txt'):
                         manuel = False
                         menu = False
                         in_game = True
 
         while profondeur:
-            efface_tout()
-            image(600, 300, "assets/Background.png", ancrage='center')
-            texte(550, 30, "Pistes", couleur='white', police='benguiat', taille="30")
-            image(605,555,'assets/btm.png',largeur=120, hauteur=60, ancrage = "center")  
-            rectangle(30, 150, 230, 350, couleur='green',remplissage="white")
-            image(130, 250, "assets/map1.png",largeur=170, hauteur=150, ancrage='center')
-            rectangle(260, 150, 460, 350, couleur='green',remplissage="white")
-            image(360, 250, "assets/map2.png",largeur=170, hauteur=150, ancrage='center')
-            rectangle(490, 150, 690, 350, couleur='green',remplissage="white")
-            image(590, 250, "assets/map3.png",largeur=170, hauteur=150, ancrage='center')
-            rectangle(720, 150, 920, 350, couleur='green',remplissage="white")
-            image(820, 250, "assets/map4.png", largeur=170, hauteur=150, ancrage='center')
-            rectangle(950, 150, 1150, 350, couleur='green',remplissage="white")
-            image(1050, 250, "assets/map6.png", largeur=170, hauteur=150, ancrage='center')
+            affiche_ecran('pistes')
             mise_a_jour()
 
             ev = donne_ev()
@@ -665,73 +784,28 @@ if __name__ == "__main__":
                     menu = True
                     continue
                 elif 0 <= x <= 170 and 80 <= y <= 250:
-                    piste = charger('assets/map_mini.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map_mini.txt'):
                         profondeur = False
                         in_game = True
                         trouver_trajectoire_gagnante()
                 elif 260 <= x <= 460 and 150 <= y <= 350:
-                    piste = charger('assets/map_test.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map_test.txt'):
                         profondeur = False
                         in_game = True
                         trouver_trajectoire_gagnante()
                 elif 490 <= x <= 690 and 150 <= y <= 350:
-                    piste = charger('assets/map2.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map2.txt'):
                         profondeur = False
                         in_game = True
                         trouver_trajectoire_gagnante()
                 
                 elif 720 <= x <= 920 and 150 <= y <= 350:
-                    piste = charger('assets/map1.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map1.txt'):
                         profondeur = False
                         in_game = True
                         trouver_trajectoire_gagnante()
                 elif 950 <= x <= 1150 and 150 <= y <= 350:
-                    piste = charger('assets/map3.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map3.txt'):
                         profondeur = False
                         in_game = True
                         trouver_trajectoire_gagnante()
@@ -739,20 +813,7 @@ if __name__ == "__main__":
             mise_a_jour()
 
         while largeur:
-            efface_tout()
-            image(600, 300, "assets/Background.png", ancrage='center')
-            texte(550, 30, "Pistes", couleur='white', police='benguiat', taille="30")
-            image(605,555,'assets/btm.png',largeur=120, hauteur=60, ancrage = "center")  
-            rectangle(30, 150, 230, 350, couleur='green',remplissage="white")
-            image(130, 250, "assets/map1.png",largeur=170, hauteur=150, ancrage='center')
-            rectangle(260, 150, 460, 350, couleur='green',remplissage="white")
-            image(360, 250, "assets/map2.png",largeur=170, hauteur=150, ancrage='center')
-            rectangle(490, 150, 690, 350, couleur='green',remplissage="white")
-            image(590, 250, "assets/map3.png",largeur=170, hauteur=150, ancrage='center')
-            rectangle(720, 150, 920, 350, couleur='green',remplissage="white")
-            image(820, 250, "assets/map4.png", largeur=170, hauteur=150, ancrage='center')
-            rectangle(950, 150, 1150, 350, couleur='green',remplissage="white")
-            image(1050, 250, "assets/map6.png", largeur=170, hauteur=150, ancrage='center')
+            affiche_ecran('pistes')
             mise_a_jour()
             ev = donne_ev()
             ty = type_ev(ev)
@@ -769,73 +830,28 @@ if __name__ == "__main__":
                     menu = True
                     continue
                 elif 0 <= x <= 170 and 80 <= y <= 250:
-                    piste = charger('assets/map_mini.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map_mini.txt'):
                         largeur = False
                         in_game = True
                         trouver_trajectoire_largeur()
 
                 elif 260 <= x <= 460 and 150 <= y <= 350:
-                    piste = charger('assets/map_test.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map_test.txt'):
                         largeur = False
                         in_game = True
                         trouver_trajectoire_largeur()
                 elif 490 <= x <= 690 and 150 <= y <= 350:
-                    piste = charger('assets/map2.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map2.txt'):
                         largeur = False
                         in_game = True
                         trouver_trajectoire_largeur()
                 elif 720 <= x <= 920 and 150 <= y <= 350:
-                    piste = charger('assets/map1.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map1.txt'):
                         largeur = False
                         in_game = True
                         trouver_trajectoire_largeur()
                 elif 950 <= x <= 1150 and 150 <= y <= 350:
-                    piste = charger('assets/map3.txt')
-                    if piste:
-                        largeur_plateau = len(piste[0])
-                        hauteur_plateau = len(piste)
-                        for y, l in enumerate(piste):
-                            for x, char in enumerate(l):
-                                if char == '>':
-                                    depart_x, depart_y = x, y
-                        redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
-                        trajectoire, options_valides = afficher_piste_txt(piste, taille_case)
+                    if ouvrir_piste('assets/map3.txt'):
                         largeur = False
                         in_game = True
                         trouver_trajectoire_largeur()
@@ -861,11 +877,8 @@ if __name__ == "__main__":
                         redimensionne_fenetre(taille_case * largeur_plateau, taille_case * hauteur_plateau)
                     else:
                         options_valides = options(trajectoire)
-                        efface_tout()
-                        dessine_case()
-                        dessine_grille()
-                        dessine_trajectoire(trajectoire)
-                        dessine_options(options_valides)
+                        ajoute_segment()
+                        affiche_coups()
                 else:
                     pass
             elif ty == 'Touche':
@@ -0,0 +1,146 @@
+"""
+Banc d'essai des algorithmes de recherche.
+
+Chaque algorithme de `src.cli.ALGORITHMES` est lancé sur les pistes fournies
+avec les deux modes de règles. Pour chaque combinaison, on relève la durée
+(la meilleure de plusieurs répétitions), le nombre d'états développés, le pic
+de mémoire mesuré par `tracemalloc` lors d'une exécution séparée, et la
+longueur de la trajectoire.
+
+Les mesures s'enregistrent dans un fichier JSON qui sert ensuite de référence :
+une nouvelle série de mesures est comparée à la référence, et tout écart
+au-delà d'un seuil est signalé comme une régression.
+"""
+import json
+import tracemalloc
+from time import perf_counter
+
+from src.cli import ALGORITHMES, REGLES, case_depart
+from src.piste import charger
+from src.recherche import Regles
+from src.statistiques import Statistiques
+
+PISTES = ['assets/map_mini.txt', 'assets/map_test.txt', 'assets/map1.txt', 'assets/map2.txt', 'assets/map3.txt']
+"""Pistes mesurées par défaut."""
+
+TOLERANCE_DUREE = 0.01
+"""Écart de durée (en secondes) en dessous duquel une variation n'est jamais une régression."""
+
+
+def mesurer(fichier, algorithme, regles, repetitions=3):
+    """
+    Mesure un algorithme sur une piste avec un mode de règles.
+
+    La mémoire est mesurée lors d'une exécution supplémentaire, `tracemalloc`
+    ralentissant fortement le code. Les allocations des processus lancés par
+    l'algorithme 'parallele' ne sont pas comptées. Comme pour `src.cli.resoudre`,
+    une piste sans case de départ n'est pas résolue : la mesure est alors nulle.
+
+    Args:
+        fichier (str): Le chemin vers le fichier texte contenant la piste.
+        algorithme (str): Nom d'un algorithme de `ALGORITHMES`.
+        regles (str): Nom d'un mode de `REGLES`.
+        repetitions (int): Nombre d'exécutions chronométrées.
+
+    Returns:
+        dict: La mesure : piste, algorithme, règles, nombre de coups (None si
+        aucune trajectoire), nombre d'états développés, durée minimale en
+        secondes et pic de mémoire en octets.
+
+    Raises:
+        ValueError: Si `repetitions` est inférieur à 1.
+    """
+    if repetitions < 1:
+        raise ValueError(f"au moins une répétition est nécessaire, pas {repetitions}")
+    piste = charger(fichier)
+    depart = case_depart(piste)
+    recherche = ALGORITHMES[algorithme]
+    souple = REGLES[regles]
+    mesure = {'piste': fichier, 'algorithme': algorithme, 'regles': regles}
+    if depart is None:
+        mesure.update(coups=None, etats=0, duree=0.0, memoire=0)
+        return mesure
+    durees = []
+    for _ in range(repetitions):
+        contexte = Regles(piste, souple)
+        stats = Statistiques()
+        debut = perf_counter()
+        trajectoire = recherche(contexte, [depart], stats=stats)
+        durees.append(perf_counter() - debut)
+    tracemalloc.start()
+    recherche(Regles(piste, souple), [depart])
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    mesure.update(coups=None if trajectoire is None else len(trajectoire) - 1, etats=stats.etats_developpes,
+                  duree=min(durees), memoire=pic)
+    return mesure
+
+
+def comparer(mesures, reference, seuil):
+    """
+    Compare des mesures à une référence et décrit les régressions.
+
+    Une mesure régresse si sa durée, son pic de mémoire ou son nombre d'états
+    développés dépasse la référence de plus de `seuil` (en proportion), si sa
+    trajectoire est plus longue, ou si elle n'en trouve plus. Les combinaisons
+    absentes de la référence sont ignorées.
+
+    Args:
+        mesures (list): Mesures renvoyées par `mesurer`.
+        reference (list): Mesures de référence.
+        seuil (float): Hausse relative tolérée, par exemple 0.2 pour 20 %.
+
+    Returns:
+        list: Une description (str) par régression.
+    """
+    references = {(m['piste'], m['algorithme'], m['regles']): m for m in reference}
+    regressions = []
+    for mesure in mesures:
+        ancienne = references.get((mesure['piste'], mesure['algorithme'], mesure['regles']))
+        if ancienne is None:
+            continue
+        nom = f"{mesure['piste']} {mesure['algorithme']} {mesure['regles']}"
+        if mesure['coups'] is None and ancienne['coups'] is not None:
+            regressions.append(f"{nom} : plus de trajectoire trouvée")
+            continue
+        if ancienne['coups'] is not None and mesure['coups'] > ancienne['coups']:
+            regressions.append(f"{nom} : trajectoire de {mesure['coups']} coups au lieu de {ancienne['coups']}")
+        if mesure['duree'] > ancienne['duree'] * (1 + seuil) and mesure['duree'] - ancienne['duree'] > TOLERANCE_DUREE:
+            regressions.append(f"{nom} : {mesure['duree']:.3f} s au lieu de {ancienne['duree']:.3f} s")
+        for cle, unite in (('memoire', 'octets'), ('etats', 'états')):
+            if mesure[cle] > ancienne[cle] * (1 + seuil):
+                regressions.append(f"{nom} : {mesure[cle]} {unite} au lieu de {ancienne[cle]}")
+    return regressions
+
+
+def banc(fichiers, algorithmes, regles, repetitions=3, sortie=None, reference=None, seuil=0.2):
+    """
+    Mesure toutes les combinaisons, affiche les résultats et les compare à la référence.
+
+    Args:
+        fichiers (list): Chemins des fichiers de pistes.
+        algorithmes (list): Noms d'algorithmes de `ALGORITHMES`.
+        regles (list): Noms de modes de `REGLES`.
+        repetitions (int): Nombre d'exécutions chronométrées par combinaison.
+        sortie (str): Fichier où enregistrer les mesures (nouvelle référence), ou None.
+        reference (str): Fichier de mesures de référence, ou None.
+        seuil (float): Hausse relative tolérée avant de signaler une régression.
+
+    Returns:
+        list: Les régressions constatées (vide sans référence).
+    """
+    mesures = []
+    for fichier in fichiers:
+        for algorithme in algorithmes:
+            for regle in regles:
+                mesure = mesurer(fichier, algorithme, regle, repetitions)
+                mesures.append(mesure)
+                print(f"{fichier:24} {algorithme:16} {regle:8} {str(mesure['coups']):>5} coups "
+                      f"{mesure['etats']:>9} états {mesure['duree']:8.3f} s {mesure['memoire'] / 1e6:8.1f} Mo")
+    if sortie:
+        with open(sortie, 'w') as fichier:
+            json.dump(mesures, fichier, indent=1)
+    if not reference:
+        return []
+    with open(reference) as fichier:
+        return comparer(mesures, json.load(fichier), seuil)
@@ -0,0 +1,300 @@
+"""
+Résolution de pistes en ligne de commande, sans interface graphique.
+
+Ce module n'importe ni tkinter ni `src.fltk` : il peut tourner sur une machine
+sans affichage. Exemples :
+
+    python -m src resoudre assets/map1.txt --algo largeur --regles strictes
+    python -m src lot assets --algos largeur a-etoile --regles souples strictes
+    python -m src generer labyrinthe pistes --taille 500 500 --nombre 20
+
+La commande `lot` répartit les couples (piste, algorithme, règles) sur un
+ensemble de processus et écrit un résultat par ligne, au format JSON, dès
+qu'il est disponible.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from time import perf_counter
+
+from src import generateur, parallele, recherche, vectoriel
+from src.piste import PisteInvalide, charger
+from src.statistiques import Rapporteur, Statistiques
+
+
+def recherche_profondeur(regles, trajectoire, stats=None):
+    """
+    Lance le parcours en profondeur sans affichage, en essayant d'abord les coups
+    qui rapprochent de l'arrivée, comme dans le jeu.
+    """
+    return recherche.recherche_profondeur(regles, trajectoire, ordonner=True, stats=stats)
+
+
+ALGORITHMES = {
+    'largeur': recherche.recherche_largeur,
+    'profondeur': recherche_profondeur,
+    'a-etoile': recherche.recherche_a_etoile,
+    'bidirectionnelle': recherche.recherche_bidirectionnelle,
+    'vectorielle': vectoriel.recherche_largeur_vectorielle,
+    'parallele': parallele.recherche_largeur_parallele,
+}
+"""Algorithmes disponibles, associés à leur nom en ligne de commande."""
+
+REGLES = {'souples': True, 'strictes': False}
+"""Modes de règles, associés à la valeur du paramètre `souple` des recherches."""
+
+ALGORITHMES_LOT = [nom for nom in ALGORITHMES if nom != 'parallele']
+"""Algorithmes comparés par défaut par `lot`. La recherche 'parallele' lance un
+processus par cœur dans chaque processus du lot ; elle n'est lancée que si elle
+est demandée explicitement."""
+
+
+def case_depart(piste):
+    """
+    Renvoie la case de départ utilisée par le jeu : la dernière case '>' de la piste.
+
+    Args:
+        piste (Piste): La piste de jeu.
+
+    Returns:
+        tuple: La position (x, y), ou None si la piste n'a pas de case de départ.
+    """
+    return piste.coordonnees(piste.departs[-1]) if piste.departs else None
+
+
+def resoudre(piste, algorithme, regles, rapport=None, tous_departs=False, elaguer=False):
+    """
+    Cherche une trajectoire gagnante depuis la case de départ et mesure la recherche.
+
+    Args:
+        piste (Piste): La piste de jeu.
+        algorithme (str): Nom d'un algorithme de `ALGORITHMES`.
+        regles (str): Nom d'un mode de `REGLES`.
+        rapport (float): Si fourni, intervalle en secondes entre deux affichages
+            des statistiques sur la sortie d'erreur pendant la recherche.
+        tous_departs (bool): Si True, la recherche part à la fois de toutes les
+            cases '>' au lieu de la seule case renvoyée par `case_depart`.
+        elaguer (bool): Si True, les états depuis lesquels l'arrivée est hors
+            d'atteinte sont calculés avant la recherche (phase 'elagage', non
+            comptée dans la durée) puis écartés par celle-ci.
+
+    Returns:
+        dict: Le résultat : algorithme, règles, trajectoire (None si aucune),
+        nombre de coups, nombre d'états développés, durée de la recherche en
+        secondes et statistiques détaillées (voir `Statistiques.resume`).
+    """
+    depart = case_depart(piste)
+    contexte = recherche.Regles(piste, REGLES[regles], elaguer)
+    stats = Statistiques()
+    if elaguer:
+        with stats.phase('elagage'):
+            contexte.vivants()
+    debut = perf_counter()
+    trajectoire = None
+    if depart is not None:
+        initiale = [] if tous_departs else [depart]
+        if rapport:
+            with Rapporteur(stats, rapport):
+                trajectoire = ALGORITHMES[algorithme](contexte, initiale, stats=stats)
+        else:
+            trajectoire = ALGORITHMES[algorithme](contexte, initiale, stats=stats)
+    duree = perf_counter() - debut
+    return {
+        'algorithme': algorithme,
+        'regles': regles,
+        'trajectoire': trajectoire,
+        'coups': None if trajectoire is None else len(trajectoire) - 1,
+        'etats': stats.etats_developpes,
+        'duree': duree,
+        'statistiques': stats.resume(),
+    }
+
+
+def resoudre_fichier(fichier, algorithme, regles):
+    """
+    Charge une piste et la résout ; fonction exécutée par les processus de `lot`.
+
+    Args:
+        fichier (str): Le chemin vers le fichier texte contenant la piste.
+        algorithme (str): Nom d'un algorithme de `ALGORITHMES`.
+        regles (str): Nom d'un mode de `REGLES`.
+
+    Returns:
+        dict: Le résultat de `resoudre` sans la trajectoire, complété du nom de la
+        piste, ou un dictionnaire contenant la clé 'erreur' si la piste est illisible.
+    """
+    resultat = {'piste': fichier, 'algorithme': algorithme, 'regles': regles}
+    try:
+        piste = charger(fichier)
+    except (OSError, PisteInvalide) as erreur:
+        resultat['erreur'] = str(erreur)
+        return resultat
+    resultat.update(resoudre(piste, algorithme, regles))
+    del resultat['trajectoire']
+    return resultat
+
+
+def lot(fichiers, algorithmes, regles, processus=None, sortie=sys.stdout):
+    """
+    Résout toutes les combinaisons (piste, algorithme, règles) en parallèle.
+
+    Les tâches sont réparties sur un `ProcessPoolExecutor` ; chaque résultat est
+    écrit sur `sortie` sous forme d'une ligne JSON dès qu'il est terminé, donc
+    pas forcément dans l'ordre des tâches.
+
+    Args:
+        fichiers (list): Chemins des fichiers de pistes.
+        algorithmes (list): Noms d'algorithmes de `ALGORITHMES`.
+        regles (list): Noms de modes de `REGLES`.
+        processus (int): Nombre de processus ; par défaut le nombre de cœurs.
+        sortie (file): Flux où écrire les résultats.
+
+    Returns:
+        int: Le nombre de tâches en erreur.
+    """
+    erreurs = 0
+    with ProcessPoolExecutor(max_workers=processus or os.cpu_count()) as executeur:
+        taches = [executeur.submit(resoudre_fichier, fichier, algorithme, regle)
+                  for fichier in fichiers for algorithme in algorithmes for regle in regles]
+        for tache in as_completed(taches):
+            resultat = tache.result()
+            erreurs += 'erreur' in resultat
+            sortie.write(json.dumps(resultat) + '\n')
+            sortie.flush()
+    return erreurs
+
+
+def entier_positif(texte):
+    """
+    Type d'argument `argparse` : un entier strictement positif.
+
+    Args:
+        texte (str): L'argument tel qu'il a été saisi.
+
+    Returns:
+        int: Sa valeur.
+
+    Raises:
+        argparse.ArgumentTypeError: Si l'argument n'est pas un entier supérieur ou égal à 1.
+    """
+    try:
+        valeur = int(texte)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"nombre entier attendu : {texte!r}") from None
+    if valeur < 1:
+        raise argparse.ArgumentTypeError(f"doit valoir au moins 1 : {valeur}")
+    return valeur
+
+
+def analyseur():
+    """
+    Construit l'analyseur des arguments de la ligne de commande.
+
+    Returns:
+        argparse.ArgumentParser: L'analyseur.
+    """
+    parser = argparse.ArgumentParser(prog='python -m src', description="Racetrack sans interface graphique.")
+    commandes = parser.add_subparsers(dest='commande', required=True)
+    resolution = commandes.add_parser('resoudre', help="cherche une trajectoire gagnante sur une piste")
+    resolution.add_argument('piste', help="fichier texte de la piste")
+    resolution.add_argument('--algo', choices=ALGORITHMES, default='largeur', help="algorithme de recherche")
+    resolution.add_argument('--regles', choices=REGLES, default='strictes', help="règles de collision")
+    resolution.add_argument('--sortie', help="écrit le résultat au format JSON dans ce fichier")
+    resolution.add_argument('--rapport', type=float, metavar='SECONDES',
+                            help="affiche les statistiques de la recherche à cet intervalle")
+    resolution.add_argument('--tous-departs', action='store_true',
+                            help="part de toutes les cases '>' à la fois au lieu de la dernière")
+    resolution.add_argument('--elaguer', action='store_true',
+                            help="écarte d'abord les états depuis lesquels l'arrivée est hors d'atteinte")
+    traitement = commandes.add_parser('lot', help="résout en parallèle toutes les pistes d'un dossier")
+    traitement.add_argument('dossier', help="dossier contenant les pistes")
+    traitement.add_argument('--motif', default='*.txt', help="motif des fichiers de pistes (défaut : *.txt)")
+    traitement.add_argument('--algos', nargs='+', choices=ALGORITHMES, default=ALGORITHMES_LOT,
+                            help="algorithmes à comparer (défaut : tous sauf parallele)")
+    traitement.add_argument('--regles', nargs='+', choices=REGLES, default=list(REGLES),
+                            help="règles de collision (défaut : les deux)")
+    traitement.add_argument('--processus', type=int, help="nombre de processus (défaut : nombre de cœurs)")
+    mesure = commandes.add_parser('banc', help="mesure les algorithmes et les compare à une référence")
+    mesure.add_argument('pistes', nargs='*', help="fichiers de pistes (défaut : les pistes de assets)")
+    mesure.add_argument('--algos', nargs='+', choices=ALGORITHMES, default=list(ALGORITHMES),
+                        help="algorithmes à mesurer (défaut : tous)")
+    mesure.add_argument('--regles', nargs='+', choices=REGLES, default=list(REGLES),
+                        help="règles de collision (défaut : les deux)")
+    mesure.add_argument('--repetitions', type=entier_positif, default=3,
+                        help="exécutions chronométrées par mesure (défaut : 3)")
+    mesure.add_argument('--sortie', help="enregistre les mesures dans ce fichier JSON")
+    mesure.add_argument('--reference', help="fichier JSON de mesures de référence")
+    mesure.add_argument('--seuil', type=float, default=0.2, help="hausse relative tolérée (défaut : 0.2)")
+    generation = commandes.add_parser('generer', help="génère des pistes synthétiques")
+    generation.add_argument('forme', choices=generateur.FORMES, help="forme de la piste")
+    generation.add_argument('dossier', help="dossier où écrire les pistes")
+    generation.add_argument('--taille', type=int, nargs=2, default=[200, 200], metavar=('LARGEUR', 'HAUTEUR'),
+                            help="dimensions des pistes (défaut : 200 200)")
+    generation.add_argument('--graine', type=int, default=0, help="graine de la première piste (défaut : 0)")
+    generation.add_argument('--nombre', type=int, default=1, help="nombre de pistes, de graines consécutives")
+    return parser
+
+
+def main(arguments=None):
+    """
+    Point d'entrée de la ligne de commande.
+
+    Args:
+        arguments (list): Arguments à analyser ; par défaut ceux de `sys.argv`.
+
+    Returns:
+        int: Le code de sortie. Pour `resoudre` : 0 si une trajectoire a été trouvée,
+        1 sinon, 2 si la piste n'a pas pu être chargée. Pour `lot` : 0 si toutes les
+        pistes ont pu être chargées, 2 sinon. Pour `banc` : 0 sans régression, 1 sinon.
+        Pour `generer` : 0, ou 2 si les dimensions sont invalides.
+    """
+    options = analyseur().parse_args(arguments)
+    if options.commande == 'lot':
+        fichiers = sorted(str(chemin) for chemin in Path(options.dossier).glob(options.motif))
+        if not fichiers:
+            print(f"Aucune piste trouvée dans {options.dossier}", file=sys.stderr)
+            return 2
+        return 2 if lot(fichiers, options.algos, options.regles, options.processus) else 0
+    if options.commande == 'generer':
+        largeur, hauteur = options.taille
+        os.makedirs(options.dossier, exist_ok=True)
+        for graine in range(options.graine, options.graine + options.nombre):
+            try:
+                lignes = generateur.generer(options.forme, largeur, hauteur, graine)
+            except ValueError as erreur:
+                print(erreur, file=sys.stderr)
+                return 2
+            fichier = os.path.join(options.dossier, f"{options.forme}_{largeur}x{hauteur}_{graine}.txt")
+            generateur.ecrire(fichier, lignes)
+            print(fichier)
+        return 0
+    if options.commande == 'banc':
+        from src import banc
+        regressions = banc.banc(options.pistes or banc.PISTES, options.algos, options.regles, options.repetitions,
+                                options.sortie, options.reference, options.seuil)
+        for regression in regressions:
+            print(f"Régression : {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    try:
+        piste = charger(options.piste)
+    except OSError as erreur:
+        print(f"Impossible d'ouvrir la piste : {erreur}", file=sys.stderr)
+        return 2
+    except PisteInvalide as erreur:
+        print(f"Piste invalide : {options.piste}, {erreur}", file=sys.stderr)
+        return 2
+    resultat = resoudre(piste, options.algo, options.regles, options.rapport, options.tous_departs,
+                        options.elaguer)
+    resultat['piste'] = options.piste
+    if options.sortie:
+        with open(options.sortie, 'w') as fichier:
+            json.dump(resultat, fichier)
+    if resultat['trajectoire'] is None:
+        print(f"Aucune trajectoire trouvée ({resultat['duree']:.3f} s).")
+        return 1
+    print(f"Trajectoire trouvée en {resultat['coups']} coups ({resultat['duree']:.3f} s) :")
+    print(resultat['trajectoire'])
+    return 0
@@ -0,0 +1,313 @@
+"""
+Cache disque des pistes compilées.
+
+Une piste compilée est enregistrée dans un fichier binaire nommé d'après le
+chemin du fichier texte d'origine et l'empreinte SHA-256 de son contenu :
+modifier la piste change son empreinte, et l'ancienne version compilée est
+supprimée quand la nouvelle est écrite (voir `nettoyer`). Le fichier contient
+le tableau `cases` de la piste et ses tables dérivées (voir `TABLES`), que
+`Regles` reprend au lieu de les recalculer. Les tables coûteuses qui ne servent
+qu'à certaines recherches (voir `OPTIONNELLES`) ne sont pas calculées au
+chargement : une recherche les calcule au besoin, et `completer` les ajoute
+ensuite au fichier.
+
+Format : un en-tête (`ENTETE`), une entrée par section (`SECTION` : nom, code
+de type de `array`, position et taille), puis le contenu brut des sections.
+Le fichier est ouvert avec `mmap` et chaque section est copiée d'un bloc dans
+son tableau, sans aucune analyse. Un fichier illisible, d'une autre version ou
+auquel il manque une section de `TABLES` est ignoré puis reconstruit.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import weakref
+from array import array
+
+from src.piste import Piste, analyser
+from src.recherche import TAILLE_ELAGAGE_MAX, IndexEtats, champ_distances
+
+VERSION = 4
+"""Version du format ; les fichiers d'une autre version sont reconstruits."""
+
+MAGIE = b'RTPC'
+
+ENTETE = struct.Struct('<4sIBBxxIII')
+"""Magie, version, ordre des octets (1 si petit-boutiste), taille d'un 'i',
+largeur, hauteur et nombre de sections."""
+
+SECTION = struct.Struct('<24scxxxQQ')
+"""Nom, code de type, position et taille en octets d'une section."""
+
+EXTENSION = '.piste'
+"""Extension des pistes compilées, seuls fichiers que `nettoyer` peut supprimer."""
+
+
+def longueur_vivants(piste):
+    """
+    Renvoie le nombre d'octets de la table des états vivants de la piste (voir `etats_vivants`).
+
+    Args:
+        piste (Piste): La piste de jeu.
+
+    Returns:
+        int: Un bit par état, ou 0 si la piste compte trop d'états pour l'élagage.
+    """
+    nombre = IndexEtats(piste).nombre
+    return 0 if nombre > TAILLE_ELAGAGE_MAX else (nombre + 7) >> 3
+
+
+TABLES = {
+    'distances_souples': (lambda piste: champ_distances(piste, traverse_murs=True), lambda piste: len(piste.cases)),
+    'distances_strictes': (lambda piste: champ_distances(piste, traverse_murs=False), lambda piste: len(piste.cases)),
+}
+"""Tables dérivées enregistrées avec la piste, associées à leur fonction de calcul
+et à celle qui donne leur nombre d'éléments attendu."""
+
+OPTIONNELLES = {
+    'vivants_souples': longueur_vivants,
+    'vivants_strictes': longueur_vivants,
+}
+"""Tables enregistrées seulement si une recherche les a calculées (voir
+`Regles.vivants`), associées à la fonction qui donne leur nombre d'éléments."""
+
+ORIGINES = weakref.WeakKeyDictionary()
+"""Piste chargée par `charger` -> (fichier compilé, noms des tables qu'il contient)."""
+
+
+def repertoire_cache():
+    """
+    Renvoie le répertoire des pistes compilées.
+
+    Returns:
+        str: La variable d'environnement RACETRACK_CACHE si elle est définie,
+        sinon le sous-répertoire 'racetrack' du cache de l'utilisateur.
+    """
+    if os.environ.get('RACETRACK_CACHE'):
+        return os.environ['RACETRACK_CACHE']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'racetrack')
+
+
+def nom_fichier(fichier, donnees):
+    """
+    Renvoie le nom de la piste compilée correspondant à un fichier texte.
+
+    Args:
+        fichier (str): Le chemin vers le fichier texte.
+        donnees (bytes): Son contenu.
+
+    Returns:
+        str: L'empreinte du chemin absolu du fichier, qui désigne toutes ses
+        versions compilées, suivie de celle de son contenu.
+    """
+    origine = hashlib.sha256(os.path.abspath(fichier).encode()).hexdigest()[:16]
+    return f"{origine}-{hashlib.sha256(donnees).hexdigest()}{EXTENSION}"
+
+
+def compatible(entete):
+    """
+    Indique si l'en-tête d'une piste compilée correspond au format lu par ce programme.
+
+    Args:
+        entete (tuple): Les champs de `ENTETE`.
+
+    Returns:
+        bool: True si la magie, la version, l'ordre des octets et la taille d'un 'i' correspondent.
+    """
+    return tuple(entete[:4]) == (MAGIE, VERSION, sys.byteorder == 'little', array('i').itemsize)
+
+
+def nettoyer(repertoire, garde):
+    """
+    Supprime les pistes compilées périmées d'un répertoire de cache.
+
+    Sont périmées les autres versions compilées du même fichier texte (même
+    préfixe de nom que `garde`) et les fichiers d'un autre format, écrits par
+    une autre version du programme ou illisibles. Un fichier qui ne peut pas
+    être supprimé (par exemple ouvert par un autre processus) est laissé.
+
+    Args:
+        repertoire (str): Le répertoire du cache.
+        garde (str): Le nom de la piste compilée qui vient d'être écrite.
+
+    Returns:
+        None
+    """
+    origine = garde.split('-', 1)[0]
+    for nom in os.listdir(repertoire):
+        if not nom.endswith(EXTENSION) or nom == garde:
+            continue
+        chemin = os.path.join(repertoire, nom)
+        try:
+            if not nom.startswith(origine + '-'):
+                with open(chemin, 'rb') as fichier:
+                    if compatible(ENTETE.unpack(fichier.read(ENTETE.size))):
+                        continue
+            os.remove(chemin)
+        except (OSError, struct.error):
+            pass
+
+
+def compiler(piste):
+    """
+    Calcule les tables de `TABLES` qui manquent à la piste.
+
+    Args:
+        piste (Piste): La piste, dont `tables` est complété.
+
+    Returns:
+        Piste: La même piste.
+    """
+    for nom, (calcul, _) in TABLES.items():
+        if nom not in piste.tables:
+            piste.tables[nom] = calcul(piste)
+    return piste
+
+
+def ecrire(chemin, piste):
+    """
+    Écrit une piste compilée.
+
+    Le fichier est écrit sous un nom temporaire puis renommé, si bien qu'un
+    autre processus ne lit jamais un fichier incomplet.
+
+    Args:
+        chemin (str): Le fichier à écrire.
+        piste (Piste): La piste, avec toutes les tables de `TABLES` et
+            éventuellement certaines de `OPTIONNELLES`.
+
+    Returns:
+        None
+    """
+    noms = list(TABLES) + [nom for nom in OPTIONNELLES if nom in piste.tables]
+    sections = [('cases', 'B', piste.cases)] + [(nom, piste.tables[nom].typecode, piste.tables[nom]) for nom in noms]
+    position = ENTETE.size + SECTION.size * len(sections)
+    entrees = []
+    for nom, type_, donnees in sections:
+        taille = len(donnees) * (donnees.itemsize if isinstance(donnees, array) else 1)
+        entrees.append(SECTION.pack(nom.encode(), type_.encode(), position, taille))
+        position += taille
+    temporaire = f"{chemin}.{os.getpid()}"
+    with open(temporaire, 'wb') as fichier:
+        fichier.write(ENTETE.pack(MAGIE, VERSION, sys.byteorder == 'little', array('i').itemsize,
+                                  piste.largeur, piste.hauteur, len(sections)))
+        fichier.writelines(entrees)
+        for _, _, donnees in sections:
+            fichier.write(donnees)
+    os.replace(temporaire, chemin)
+
+
+def lire(chemin):
+    """
+    Lit une piste compilée.
+
+    Args:
+        chemin (str): Le fichier à lire.
+
+    Returns:
+        Piste: La piste avec ses tables, ou None si le fichier est absent, d'une
+        autre version, incomplet, illisible ou incohérent (dimensions de l'en-tête
+        ou taille d'une section ne correspondant pas à la piste, section inconnue).
+    """
+    try:
+        with open(chemin, 'rb') as fichier, mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) as carte:
+            with memoryview(carte) as vue:
+                entete = ENTETE.unpack_from(vue)
+                if not compatible(entete):
+                    return None
+                largeur, hauteur, nombre = entete[4:]
+                sections = {}
+                for rang in range(nombre):
+                    nom, type_, position, taille = SECTION.unpack_from(vue, ENTETE.size + rang * SECTION.size)
+                    if position + taille > len(vue):
+                        return None
+                    if nom.rstrip(b'\0') == b'cases':
+                        sections['cases'] = bytearray(vue[position:position + taille])
+                    else:
+                        table = array(type_.decode())
+                        table.frombytes(vue[position:position + taille])
+                        sections[nom.rstrip(b'\0').decode()] = table
+        if 'cases' not in sections or any(nom not in sections for nom in TABLES):
+            return None
+        piste = Piste.depuis_cases(largeur, hauteur, sections.pop('cases'))
+        longueurs = {nom: longueur for nom, (_, longueur) in TABLES.items()}
+        longueurs.update(OPTIONNELLES)
+        if any(nom not in longueurs or len(table) != longueurs[nom](piste) for nom, table in sections.items()):
+            return None
+    except (OSError, ValueError, struct.error):
+        return None
+    piste.tables.update(sections)
+    return piste
+
+
+def charger(fichier, repertoire=None):
+    """
+    Charge une piste depuis son fichier texte en passant par le cache des pistes compilées.
+
+    Si la version compilée du contenu actuel du fichier existe, elle est lue
+    directement ; sinon la piste est analysée, ses tables calculées, et le
+    résultat enregistré pour la fois suivante, à la place des versions
+    périmées (voir `nettoyer`). Un répertoire de cache inaccessible en
+    écriture n'empêche pas le chargement.
+
+    Args:
+        fichier (str): Le chemin vers le fichier texte contenant la piste.
+        repertoire (str): Répertoire du cache ; par défaut `repertoire_cache()`.
+
+    Returns:
+        Piste: La piste de jeu, avec les tables de `TABLES` et celles de
+        `OPTIONNELLES` déjà enregistrées (voir `completer`).
+
+    Raises:
+        OSError: Si le fichier texte ne peut pas être lu.
+        PisteInvalide: Si le fichier texte ne décrit pas une piste valide.
+    """
+    with open(fichier, 'rb') as file:
+        donnees = file.read()
+    repertoire = repertoire or repertoire_cache()
+    nom = nom_fichier(fichier, donnees)
+    chemin = os.path.join(repertoire, nom)
+    piste = lire(chemin)
+    if piste is None:
+        piste = compiler(analyser(donnees))
+        try:
+            os.makedirs(repertoire, exist_ok=True)
+            ecrire(chemin, piste)
+            nettoyer(repertoire, nom)
+        except OSError:
+            pass
+    ORIGINES[piste] = (chemin, frozenset(piste.tables))
+    return piste
+
+
+def completer(piste):
+    """
+    Ajoute à la piste compilée les tables calculées depuis son chargement.
+
+    À appeler après une recherche : si elle a calculé une table de
+    `OPTIONNELLES` (par exemple les états vivants), le fichier compilé est
+    réécrit avec, et les prochains chargements de la piste la reprennent. Les
+    tables qu'un autre processus a entre-temps ajoutées au fichier sont
+    conservées. Ne fait rien pour une piste qui ne vient pas de `charger` ou
+    à laquelle rien n'a été ajouté.
+
+    Args:
+        piste (Piste): Une piste renvoyée par `charger`.
+
+    Returns:
+        None
+    """
+    chemin, enregistrees = ORIGINES.get(piste, (None, None))
+    if chemin is None or enregistrees.issuperset(piste.tables):
+        return
+    fichier = lire(chemin)
+    if fichier is not None and fichier.empreinte == piste.empreinte:
+        for nom, table in fichier.tables.items():
+            piste.tables.setdefault(nom, table)
+    try:
+        ecrire(chemin, piste)
+    except OSError:
+        pass
+    ORIGINES[piste] = (chemin, frozenset(piste.tables))
@@ -57,6 +57,7 @@ __all__ = [
     "arc",
     "point",
     "image",
+    "image_memoire",
     "texte",
     "taille_texte",
     # effacer
@@ -195,7 +196,7 @@ class CustomCanvas:
 
 
 __canevas: Optional[CustomCanvas] = None
-__img: Dict[Tuple[Path, int, int], PhotoImage] = {}
+__img: Dict[Tuple[Path, Optional[int], Optional[int]], PhotoImage] = {}
 
 
 #############################################################################
@@ -558,10 +559,39 @@ def image(
     return img_object
 
 
+@_fenetre_creee
+def image_memoire(
+        x: float,
+        y: float,
+        tk_image: PhotoImage,
+        ancrage: Anchor = "center",
+        tag: str = "",
+) -> int:
+    """
+    Affiche une image déjà chargée en mémoire (``PhotoImage`` de Tk ou de PIL)
+    avec ``(x, y)`` comme point d'ancrage. L'appelant doit conserver une
+    référence à l'image tant qu'elle est affichée.
+
+    :param float x: abscisse du point d'ancrage
+    :param float y: ordonnée du point d'ancrage
+    :param tk_image: image à afficher
+    :param ancrage: position du point d'ancrage par rapport à l'image
+    :param str tag: étiquette d'objet (défaut : pas d'étiquette)
+    :return: identificateur d'objet
+    """
+    assert __canevas is not None
+    return __canevas.canvas.create_image(
+        x, y, anchor=ancrage, image=tk_image, tags=tag
+    )
+
+
 def _load_tk_image(fichier: str,
                    hauteur: Optional[int] = None,
                    largeur: Optional[int] = None) -> PhotoImage:
     chemin = Path(fichier)
+    cle = (chemin, largeur, hauteur)
+    if cle in __img:
+        return __img[cle]
     ph_image = PhotoImage(file=fichier)
     largeur_o = ph_image.width()
     hauteur_o = ph_image.height()
@@ -573,13 +603,9 @@ def _load_tk_image(fichier: str,
     zoom_h = max(1, hauteur // hauteur_o)
     red_l = max(1, largeur_o // largeur)
     red_h = max(1, hauteur_o // hauteur)
-    largeur = largeur_o * zoom_l // red_l
-    hauteur = hauteur_o * zoom_h // red_h
-    if (chemin, largeur, hauteur) in __img:
-        return __img[(chemin, largeur, hauteur)]
     ph_image = ph_image.zoom(zoom_l, zoom_h)
     ph_image = ph_image.subsample(red_l, red_h)
-    __img[(chemin, largeur, hauteur)] = ph_image
+    __img[cle] = ph_image
     return ph_image
 
 
@@ -587,16 +613,17 @@ def _load_pil_image(fichier: str,
                     hauteur: Optional[int] = None,
                     largeur: Optional[int] = None) -> PhotoImage:
     chemin = Path(fichier)
+    cle = (chemin, largeur, hauteur)
+    if cle in __img:
+        return __img[cle]
     img = Image.open(fichier)
     if largeur is None:
         largeur = img.width
     if hauteur is None:
         hauteur = img.height
-    if (chemin, largeur, hauteur) in __img:
-        return __img[(chemin, largeur, hauteur)]
     img = img.resize((largeur, hauteur))
     ph_image = ImageTk.PhotoImage(img)
-    __img[(chemin, largeur, hauteur)] = ph_image  # type:ignore
+    __img[cle] = ph_image  # type:ignore
     return ph_image  # type:ignore
 
 
@@ -0,0 +1,216 @@
+"""
+Génération de pistes synthétiques pour les mesures à grande échelle.
+
+Quatre formes sont disponibles (voir `FORMES`) : une boucle de couloir, une
+spirale, un labyrinthe et un terrain ouvert parsemé d'obstacles. La
+génération est déterministe pour une graine donnée, et chaque forme est
+construite de sorte qu'un chemin de cases libres relie toujours la zone de
+départ '>' à la zone d'arrivée '*' : en avançant case par case et en
+s'arrêtant à chaque pas, la voiture peut le suivre avec les règles souples
+comme avec les règles strictes.
+
+Les pistes produites s'écrivent dans le format lu par `src.piste.charger`.
+"""
+import random
+
+TAILLE_MIN = 10
+"""Largeur et hauteur minimales d'une piste générée."""
+
+
+def grille(largeur, hauteur):
+    """
+    Crée une grille remplie de murs.
+
+    Args:
+        largeur, hauteur (int): Dimensions de la grille.
+
+    Returns:
+        list: Liste de `hauteur` lignes (bytearray) de `largeur` caractères '#'.
+    """
+    return [bytearray(b'#') * largeur for _ in range(hauteur)]
+
+
+def remplir(lignes, x1, y1, x2, y2, caractere=b'.'):
+    """
+    Remplit le rectangle [x1, x2) x [y1, y2) avec un caractère.
+
+    Args:
+        lignes (list): La grille.
+        x1, y1, x2, y2 (int): Bornes du rectangle.
+        caractere (bytes): Le caractère à écrire.
+
+    Returns:
+        None
+    """
+    if x2 <= x1:
+        return
+    for y in range(max(y1, 0), min(y2, len(lignes))):
+        lignes[y][x1:x2] = caractere * (x2 - x1)
+
+
+def couloir(alea, largeur, hauteur):
+    """
+    Boucle de couloir autour d'un bloc de murs, coupée par une barrière : le
+    départ est d'un côté de la barrière, l'arrivée de l'autre, et il faut faire
+    le tour complet. Des piliers isolés encombrent le couloir.
+    """
+    w = alea.randint(max(3, min(largeur, hauteur) // 10), max(3, min(largeur, hauteur) // 5))
+    lignes = grille(largeur, hauteur)
+    remplir(lignes, 1, 1, largeur - 1, hauteur - 1)
+    remplir(lignes, 1 + w, 1 + w, largeur - 1 - w, hauteur - 1 - w, b'#')
+    # Piliers sur les lignes et colonnes intérieures du couloir, jamais sur ses bords.
+    for _ in range(2 * (largeur + hauteur) * w // 25):
+        x, y = alea.randrange(2, largeur - 2), alea.randrange(2, hauteur - 2)
+        if not (w <= x <= largeur - 1 - w and w <= y <= hauteur - 1 - w):
+            lignes[y][x] = ord('#')
+    barriere = largeur // 2
+    zone = min(3, (largeur - 2 * w) // 4)
+    remplir(lignes, barriere - zone, 1, barriere + zone + 1, w + 1)
+    remplir(lignes, barriere, 1, barriere + 1, w + 1, b'#')
+    remplir(lignes, barriere + 1, 1, barriere + 1 + zone, w + 1, b'>')
+    remplir(lignes, barriere - zone, 1, barriere, w + 1, b'*')
+    return lignes
+
+
+def spirale(alea, largeur, hauteur):
+    """
+    Anneaux de murs emboîtés, chacun percé d'une seule ouverture placée
+    alternativement en bas à droite et en haut à gauche : le chemin s'enroule
+    de l'extérieur, où se trouve le départ, jusqu'au centre, où est l'arrivée.
+    """
+    w = alea.randint(2, max(2, min(largeur, hauteur) // 20))
+    pas = w + 1
+    lignes = grille(largeur, hauteur)
+    remplir(lignes, 1, 1, largeur - 1, hauteur - 1)
+    x0, y0, x1, y1 = 0, 0, largeur - 1, hauteur - 1
+    anneau = 0
+    while x1 - x0 > 2 * pas + 2 and y1 - y0 > 2 * pas + 2:
+        anneau += 1
+        x0, y0, x1, y1 = x0 + pas, y0 + pas, x1 - pas, y1 - pas
+        remplir(lignes, x0, y0, x1 + 1, y0 + 1, b'#')
+        remplir(lignes, x0, y1, x1 + 1, y1 + 1, b'#')
+        remplir(lignes, x0, y0, x0 + 1, y1 + 1, b'#')
+        remplir(lignes, x1, y0, x1 + 1, y1 + 1, b'#')
+        milieu = (x0 + x1) // 2
+        if anneau % 2:
+            ouverture = alea.randint(milieu, x1 - w)
+            remplir(lignes, ouverture, y1, ouverture + w, y1 + 1)
+        else:
+            ouverture = alea.randint(x0 + 1, milieu)
+            remplir(lignes, ouverture, y0, ouverture + w, y0 + 1)
+    remplir(lignes, x0 + 1, y0 + 1, x1, y1, b'*')
+    remplir(lignes, 1, 1, 1 + min(w, 3), 1 + min(w, 3), b'>')
+    return lignes
+
+
+def labyrinthe(alea, largeur, hauteur):
+    """
+    Labyrinthe parfait creusé par un parcours en profondeur aléatoire, dans
+    lequel quelques murs supplémentaires sont abattus pour créer des boucles.
+    Le départ est dans la cellule en haut à gauche, l'arrivée en bas à droite.
+    """
+    w = alea.randint(1, max(1, min(largeur, hauteur) // 100))
+    pas = w + 1
+    colonnes, rangees = (largeur - 1) // pas, (hauteur - 1) // pas
+    lignes = grille(largeur, hauteur)
+
+    def cellule(c, r, caractere=b'.'):
+        remplir(lignes, 1 + c * pas, 1 + r * pas, 1 + c * pas + w, 1 + r * pas + w, caractere)
+
+    def passage(c, r, dc, dr):
+        x, y = 1 + c * pas, 1 + r * pas
+        if dc:
+            remplir(lignes, x + w if dc > 0 else x - 1, y, x + w + 1 if dc > 0 else x, y + w)
+        else:
+            remplir(lignes, x, y + w if dr > 0 else y - 1, x + w, y + w + 1 if dr > 0 else y)
+
+    vues = bytearray(colonnes * rangees)
+    vues[0] = 1
+    cellule(0, 0)
+    pile = [(0, 0)]
+    while pile:
+        c, r = pile[-1]
+        voisins = [(dc, dr) for dc, dr in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                   if 0 <= c + dc < colonnes and 0 <= r + dr < rangees and not vues[(r + dr) * colonnes + c + dc]]
+        if not voisins:
+            pile.pop()
+            continue
+        dc, dr = alea.choice(voisins)
+        passage(c, r, dc, dr)
+        cellule(c + dc, r + dr)
+        vues[(r + dr) * colonnes + c + dc] = 1
+        pile.append((c + dc, r + dr))
+    for _ in range(colonnes * rangees // 20):
+        c, r = alea.randrange(colonnes - 1), alea.randrange(rangees - 1)
+        passage(c, r, *alea.choice(((1, 0), (0, 1))))
+    cellule(0, 0, b'>')
+    cellule(colonnes - 1, rangees - 1, b'*')
+    return lignes
+
+
+def ouvert(alea, largeur, hauteur):
+    """
+    Terrain ouvert semé d'obstacles rectangulaires, traversé d'un chemin
+    garanti entre le départ, sur le bord gauche, et l'arrivée, sur le bord droit.
+    """
+    lignes = grille(largeur, hauteur)
+    remplir(lignes, 1, 1, largeur - 1, hauteur - 1)
+    cote = max(2, min(largeur, hauteur) // 15)
+    for _ in range(largeur * hauteur // (5 * cote * cote)):
+        x, y = alea.randrange(1, largeur - 1), alea.randrange(1, hauteur - 1)
+        remplir(lignes, x, y, min(x + alea.randint(1, cote), largeur - 1), min(y + alea.randint(1, cote), hauteur - 1),
+                b'#')
+    zone = min(3, hauteur // 4)
+    debut_y, fin_y = alea.randrange(1, hauteur - zone), alea.randrange(1, hauteur - zone)
+    x, y = 1, debut_y
+    while x < largeur - 2 or y != fin_y:
+        lignes[y][x] = ord('.')
+        if x < largeur - 2 and (y == fin_y or alea.random() < 0.6):
+            x += 1
+        else:
+            y += 1 if fin_y > y else -1
+    lignes[y][x] = ord('.')
+    remplir(lignes, largeur - 2, fin_y, largeur - 1, fin_y + zone, b'*')
+    lignes[debut_y][1] = ord('>')
+    return lignes
+
+
+FORMES = {'couloir': couloir, 'spirale': spirale, 'labyrinthe': labyrinthe, 'ouvert': ouvert}
+"""Formes de pistes disponibles, associées à leur fonction de génération."""
+
+
+def generer(forme, largeur, hauteur, graine=0):
+    """
+    Génère une piste synthétique.
+
+    Args:
+        forme (str): Nom d'une forme de `FORMES`.
+        largeur, hauteur (int): Dimensions de la piste, au moins `TAILLE_MIN`.
+        graine (int): Graine du générateur aléatoire.
+
+    Returns:
+        list: Les lignes de la piste (str), composées des caractères '.#>*'.
+
+    Raises:
+        ValueError: Si la forme est inconnue ou la piste trop petite.
+    """
+    if forme not in FORMES:
+        raise ValueError(f"Forme inconnue : {forme}")
+    if largeur < TAILLE_MIN or hauteur < TAILLE_MIN:
+        raise ValueError(f"Piste trop petite : {largeur}x{hauteur} (minimum {TAILLE_MIN}x{TAILLE_MIN})")
+    return [ligne.decode() for ligne in FORMES[forme](random.Random(graine), largeur, hauteur)]
+
+
+def ecrire(fichier, lignes):
+    """
+    Écrit une piste dans un fichier texte lisible par `src.piste.charger`.
+
+    Args:
+        fichier (str): Le chemin du fichier à écrire.
+        lignes (list): Les lignes de la piste.
+
+    Returns:
+        None
+    """
+    with open(fichier, 'w') as file:
+        file.write('\n'.join(lignes) + '\n')
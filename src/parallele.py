@@ -0,0 +1,466 @@
+"""
+Recherche en largeur répartie sur plusieurs processus.
+
+Le parcours avance couche par couche, comme `src.vectoriel`. Chaque couche est
+découpée en tranches contiguës, une par processus, et chaque processus
+développe sa tranche avec `vectoriel.successeurs_couche`. Les états découverts
+sont ensuite envoyés à leur propriétaire : l'état d'identifiant `e` appartient
+au processus `e % processus`. Seul le propriétaire d'un état connaît sa
+visite, si bien que les processus n'ont jamais à se synchroniser sur une
+table commune.
+
+Les tableaux échangés (couche courante, successeurs, états nouveaux) passent
+par des segments de `multiprocessing.shared_memory` créés par le processus
+principal ; les tubes ne transportent que les noms des segments et les
+tailles.
+
+Chaque successeur porte une clé `rang du parent * 9 + indice de l'accélération`,
+qui est son ordre de génération dans `src.recherche.recherche_largeur`. En
+gardant pour chaque état la plus petite clé, puis en triant la couche
+suivante par clé, on retrouve exactement la même trajectoire que la
+recherche en largeur séquentielle.
+
+NumPy est nécessaire ; sans lui, la recherche se rabat sur
+`src.recherche.recherche_largeur`.
+"""
+import multiprocessing
+import os
+import traceback
+from multiprocessing import resource_tracker, shared_memory
+
+from src import recherche, vectoriel
+from src.piste import ARRIVEE
+from src.statistiques import Statistiques
+
+if vectoriel.NUMPY_AVAILABLE:
+    import numpy as np
+
+DELAI_ARRET = 5.0
+"""Délai, en secondes, laissé à un processus pour s'arrêter avant d'être interrompu."""
+
+
+class ErreurProcessus(RuntimeError):
+    """
+    Erreur levée lorsqu'un processus de la recherche s'arrête sans répondre, ou
+    cause attachée à l'erreur d'un processus relancée dans le processus principal
+    (le message contient alors la trace d'origine).
+    """
+
+
+class Echec:
+    """
+    Réponse d'un processus dont l'exécution a échoué.
+
+    Attributs :
+        erreur (Exception): L'erreur, ou None si elle n'a pas pu être transmise.
+        trace (str): La trace de l'erreur dans le processus.
+    """
+
+    def __init__(self, erreur, trace):
+        self.erreur = erreur
+        self.trace = trace
+
+
+class Tampon:
+    """
+    Tableau d'entiers 64 bits en mémoire partagée, à deux lignes de même capacité
+    (identifiants d'états et clés), agrandi à la demande.
+    """
+
+    def __init__(self):
+        self.memoire = None
+        self.capacite = 0
+
+    def reserver(self, capacite):
+        """
+        Garantit une capacité d'au moins `capacite` éléments par ligne.
+
+        Le segment est remplacé (et son contenu perdu) s'il est trop petit ; la
+        capacité au moins doublée limite le nombre de remplacements.
+
+        Args:
+            capacite (int): Nombre d'éléments nécessaires.
+
+        Returns:
+            None
+        """
+        if self.memoire is not None and capacite <= self.capacite:
+            return
+        self.liberer()
+        self.capacite = max(capacite, 2 * self.capacite, 1024)
+        self.memoire = shared_memory.SharedMemory(create=True, size=2 * 8 * self.capacite)
+
+    def lignes(self):
+        """
+        Renvoie les deux lignes du tampon sous forme de tableaux NumPy.
+
+        Returns:
+            tuple: (identifiants, cles).
+        """
+        return lignes(self.memoire, self.capacite)
+
+    def liberer(self):
+        """
+        Détruit le segment de mémoire partagée.
+
+        Returns:
+            None
+        """
+        if self.memoire is not None:
+            self.memoire.close()
+            self.memoire.unlink()
+            self.memoire = None
+            self.capacite = 0
+
+
+def lignes(memoire, capacite):
+    """
+    Découpe un segment de mémoire partagée en deux tableaux d'entiers 64 bits.
+
+    Args:
+        memoire (SharedMemory): Le segment.
+        capacite (int): Nombre d'éléments de chaque ligne.
+
+    Returns:
+        tuple: (identifiants, cles).
+    """
+    tableau = np.ndarray((2, capacite), dtype=np.int64, buffer=memoire.buf)
+    return tableau[0], tableau[1]
+
+
+def decoder(index, ids):
+    """
+    Version vectorisée de `IndexEtats.decoder`.
+
+    Args:
+        index (IndexEtats): Numérotation des états de la piste.
+        ids (ndarray): Identifiants d'états.
+
+    Returns:
+        tuple: Les tableaux (x, y, vx, vy).
+    """
+    ids, vy = np.divmod(ids, 2 * index.vitesse_max_y + 1)
+    case, vx = np.divmod(ids, 2 * index.vitesse_max_x + 1)
+    y, x = np.divmod(case, index.largeur)
+    return x + index.x0, y + index.y0, vx - index.vitesse_max_x, vy - index.vitesse_max_y
+
+
+def encoder(index, x, y, vx, vy):
+    """
+    Version vectorisée de `IndexEtats.encoder`.
+
+    Args:
+        index (IndexEtats): Numérotation des états de la piste.
+        x, y, vx, vy (ndarray): Positions et vitesses.
+
+    Returns:
+        ndarray: Les identifiants d'états.
+    """
+    vmax_x, vmax_y = index.vitesse_max_x, index.vitesse_max_y
+    case = (y - index.y0) * index.largeur + x - index.x0
+    return (case * (2 * vmax_x + 1) + vx + vmax_x) * (2 * vmax_y + 1) + vy + vmax_y
+
+
+class Visites:
+    """
+    États visités appartenant à un processus : ceux dont l'identifiant vaut `rang`
+    modulo `processus`. L'état `e` occupe le bit `e // processus`.
+    """
+
+    def __init__(self, index, processus):
+        self.processus = processus
+        taille = index.nombre // processus + 1
+        if index.nombre <= recherche.TAILLE_BITMAP_MAX:
+            self.bits, self.triees = np.zeros((taille + 7) // 8, dtype=np.uint8), None
+        else:
+            self.bits, self.triees = None, vectoriel.VisitesTriees(np.empty(0, dtype=np.int64))
+
+    def filtrer(self, ids):
+        """
+        Garde les identifiants jamais vus et les marque comme visités.
+
+        Args:
+            ids (ndarray): Identifiants distincts appartenant à ce processus.
+
+        Returns:
+            ndarray: Masque des identifiants nouveaux.
+        """
+        if self.bits is None:
+            nouveaux = self.triees.nouveaux(ids)
+            self.triees.ajouter(ids[nouveaux])
+            return nouveaux
+        local = ids // self.processus
+        nouveaux = ((self.bits[local >> 3] >> (local & 7)) & 1) == 0
+        local = local[nouveaux]
+        np.bitwise_or.at(self.bits, local >> 3, (1 << (local & 7)).astype(np.uint8))
+        return nouveaux
+
+
+def travailleur(connexion, piste, souple, rang, processus, departs):
+    """
+    Point d'entrée d'un processus de la recherche : exécute `executer_ordres` et, en
+    cas d'erreur, la renvoie au processus principal sous forme d'`Echec` (voir `recevoir`).
+
+    Les arguments sont ceux de `executer_ordres`.
+    """
+    try:
+        executer_ordres(connexion, piste, souple, rang, processus, departs)
+    except Exception as erreur:
+        trace = traceback.format_exc()
+        try:
+            try:
+                connexion.send(Echec(erreur, trace))
+            except (TypeError, AttributeError, ValueError):
+                # Erreur impossible à sérialiser : seule sa trace est transmise.
+                connexion.send(Echec(None, trace))
+        except OSError:
+            pass
+
+
+def recevoir(connexion, rang):
+    """
+    Reçoit la réponse d'un processus de la recherche.
+
+    Args:
+        connexion (Connection): Extrémité du tube vers le processus.
+        rang (int): Numéro du processus.
+
+    Returns:
+        object: La réponse.
+
+    Raises:
+        Exception: L'erreur survenue dans le processus, avec pour cause une
+            `ErreurProcessus` contenant sa trace.
+        ErreurProcessus: Si le processus s'est arrêté sans répondre.
+    """
+    try:
+        reponse = connexion.recv()
+    except EOFError:
+        raise ErreurProcessus(f"le processus {rang} s'est arrêté sans répondre") from None
+    if isinstance(reponse, Echec):
+        cause = ErreurProcessus(f"erreur dans le processus {rang} :\n{reponse.trace}")
+        if reponse.erreur is None:
+            raise cause
+        raise reponse.erreur from cause
+    return reponse
+
+
+def executer_ordres(connexion, piste, souple, rang, processus, departs):
+    """
+    Boucle d'un processus de la recherche : exécute les ordres reçus sur `connexion`.
+
+    Ordres reconnus :
+        ('developper', nom, taille, debut, fin, sortie, capacite) : développe les états
+        de rangs [debut, fin) de la couche, et range les successeurs par propriétaire
+        dans le segment `sortie` ; répond le nombre de successeurs par propriétaire,
+        le nombre de vérifications de collision et le nombre de
+        successeurs élagués (voir `src.recherche.Regles.vivants`).
+        ('fusionner', sources, resultat) : dédoublonne les successeurs reçus des
+        `sources` [(nom, capacite, debut, compte)], écarte les états déjà visités et
+        écrit les nouveaux, triés par clé, dans le segment `resultat` ; répond leur nombre.
+        None : fin de la recherche.
+
+    Args:
+        connexion (Connection): Extrémité du tube vers le processus principal.
+        piste (Piste): La piste de jeu.
+        souple (bool): True pour les règles souples, False pour les règles strictes.
+        rang (int): Numéro de ce processus.
+        processus (int): Nombre total de processus.
+        departs (ndarray): Identifiants des états de départ, déjà visités.
+    """
+    regles = recherche.Regles(piste, souple)
+    index = recherche.IndexEtats(piste)
+    cases = np.frombuffer(piste.cases, dtype=np.uint8)
+    vivants = vectoriel.table_vivants(regles)
+    visites = Visites(index, processus)
+    visites.filtrer(departs[departs % processus == rang])
+    # Segments attachés, par rôle : un tampon agrandi change de segment, et
+    # l'ancien, détruit par le processus principal, est alors fermé ici.
+    segments = {}
+
+    def attacher(role, nom):
+        segment = segments.get(role)
+        if segment is None or segment.name != nom:
+            if segment is not None:
+                segment.close()
+            segment = segments[role] = shared_memory.SharedMemory(name=nom)
+        return segment
+
+    ordre = connexion.recv()
+    while ordre is not None:
+        if ordre[0] == 'developper':
+            _, nom, taille, debut, fin, sortie, capacite = ordre
+            ids = np.array(lignes(attacher('couche', nom), taille)[0][debut:fin])
+            x, y, vx, vy = decoder(index, ids)
+            stats = Statistiques()
+            parents, px, py, nvx, nvy = vectoriel.successeurs_couche(regles, cases, x, y, vx, vy, stats)
+            coups = (nvx - vx[parents] + 1) * 3 + nvy - vy[parents] + 1
+            cles = (parents + debut) * len(recherche.ACCELERATIONS) + coups
+            suivants = encoder(index, px, py, nvx, nvy)
+            elagues = 0
+            if vivants is not None:
+                garde = ((vivants[suivants >> 3] >> (suivants & 7)) & 1) == 1
+                elagues = len(suivants) - int(garde.sum())
+                suivants, cles = suivants[garde], cles[garde]
+            proprietaires = suivants % processus
+            tri = np.argsort(proprietaires, kind='stable')
+            ids_sortie, cles_sortie = lignes(attacher(('sortie', rang), sortie), capacite)
+            ids_sortie[:len(tri)] = suivants[tri]
+            cles_sortie[:len(tri)] = cles[tri]
+            # Aucune vue sur un segment ne survit à l'ordre, sans quoi il ne pourrait pas être fermé.
+            del ids_sortie, cles_sortie
+            connexion.send((np.bincount(proprietaires, minlength=processus).tolist(), stats.verifications,
+                            elagues))
+        else:
+            _, sources, resultat = ordre
+            blocs = [lignes(attacher(('sortie', origine), nom), capacite)
+                     for origine, (nom, capacite, _, _) in enumerate(sources)]
+            ids = np.concatenate([bloc[0][debut:debut + compte] for bloc, (_, _, debut, compte) in zip(blocs, sources)])
+            cles = np.concatenate([bloc[1][debut:debut + compte] for bloc, (_, _, debut, compte) in zip(blocs, sources)])
+            del blocs
+            tri = np.argsort(cles)
+            ids, cles = ids[tri], cles[tri]
+            # Première occurrence de chaque état, c'est-à-dire sa plus petite clé.
+            _, premiers = np.unique(ids, return_index=True)
+            premiers.sort()
+            ids, cles = ids[premiers], cles[premiers]
+            nouveaux = visites.filtrer(ids)
+            ids_resultat, cles_resultat = lignes(attacher('resultat', resultat[0]), resultat[1])
+            compte = int(nouveaux.sum())
+            ids_resultat[:compte] = ids[nouveaux]
+            cles_resultat[:compte] = cles[nouveaux]
+            del ids_resultat, cles_resultat
+            connexion.send(compte)
+        ordre = connexion.recv()
+    for segment in segments.values():
+        segment.close()
+
+
+def recherche_largeur_parallele(regles, trajectoire, stats=None, processus=None):
+    """
+    Recherche une trajectoire gagnante par un parcours en largeur réparti sur plusieurs processus.
+
+    La trajectoire renvoyée est la même que celle de `src.recherche.recherche_largeur`.
+
+    Args:
+        regles (Regles): La piste et le mode de règles.
+        trajectoire (list): Liste de positions (x, y) ; la recherche part de la dernière. Vide,
+            la recherche part à la fois de toutes les cases de départ (voir `src.recherche.etats_initiaux`).
+        stats (Statistiques): Statistiques à tenir à jour, optionnelles.
+        processus (int): Nombre de processus ; par défaut le nombre de cœurs.
+
+    Returns:
+        list: La trajectoire gagnante (précédée de `trajectoire`) si elle existe, sinon None.
+    """
+    if not vectoriel.NUMPY_AVAILABLE:
+        return recherche.recherche_largeur(regles, trajectoire, stats)
+    processus = processus or os.cpu_count()
+    piste = regles.piste
+    index = recherche.IndexEtats(piste)
+    cases = np.frombuffer(piste.cases, dtype=np.uint8)
+
+    if stats is None:
+        stats = Statistiques()
+    departs = recherche.etats_initiaux(piste, index, trajectoire)
+    for depart in departs:
+        x0, y0, _, _ = index.decoder(depart)
+        if piste.case(x0, y0) == ARRIVEE:
+            return trajectoire[:-1] + [(x0, y0)]
+    departs = np.array(departs, dtype=np.int64)
+    # Calculée avant le lancement des processus, la table des états vivants leur
+    # parvient avec la piste (voir `Regles.vivants`).
+    with stats.phase('preparation'):
+        regles.vivants()
+
+    contexte = multiprocessing.get_context()
+    connexions = []
+    travailleurs = []
+    couche = Tampon()
+    sorties = [Tampon() for _ in range(processus)]
+    resultats = [Tampon() for _ in range(processus)]
+    # Les processus doivent hériter du suivi des segments du processus principal,
+    # sans quoi chacun lancerait le sien et détruirait les segments à sa sortie.
+    resource_tracker.ensure_running()
+    try:
+        with stats.phase('preparation'):
+            for rang in range(processus):
+                local, distant = contexte.Pipe()
+                travail = contexte.Process(target=travailleur,
+                                           args=(distant, piste, regles.souple, rang, processus, departs), daemon=True)
+                travail.start()
+                # Seul le processus garde son extrémité : s'il s'arrête, `recv` lève EOFError
+                # au lieu d'attendre indéfiniment.
+                distant.close()
+                connexions.append(local)
+                travailleurs.append(travail)
+
+        # Chaque couche garde ses identifiants d'états et, pour chacun, le rang de son parent.
+        couches = [(departs, None)]
+        stats.visites = len(departs)
+        with stats.phase('recherche'):
+            while len(couches[-1][0]):
+                ids = couches[-1][0]
+                taille = len(ids)
+                stats.etats_developpes += taille
+                stats.frontiere = taille
+                couche.reserver(taille)
+                couche.lignes()[0][:taille] = ids
+                bornes = [taille * rang // processus for rang in range(processus + 1)]
+                for rang, connexion in enumerate(connexions):
+                    sorties[rang].reserver(len(recherche.ACCELERATIONS) * (bornes[rang + 1] - bornes[rang]))
+                    connexion.send(('developper', couche.memoire.name, couche.capacite, bornes[rang], bornes[rang + 1],
+                                    sorties[rang].memoire.name, sorties[rang].capacite))
+                reponses = [recevoir(connexion, rang) for rang, connexion in enumerate(connexions)]
+                comptes = [compte for compte, _, _ in reponses]
+                stats.verifications += sum(verifications for _, verifications, _ in reponses)
+                stats.elagues += sum(elagues for _, _, elagues in reponses)
+
+                for rang, connexion in enumerate(connexions):
+                    sources = []
+                    for origine in range(processus):
+                        debut = sum(comptes[origine][:rang])
+                        sources.append((sorties[origine].memoire.name, sorties[origine].capacite,
+                                        debut, comptes[origine][rang]))
+                    resultats[rang].reserver(sum(compte[rang] for compte in comptes))
+                    connexion.send(('fusionner', sources, (resultats[rang].memoire.name, resultats[rang].capacite)))
+                nombres = [recevoir(connexion, rang) for rang, connexion in enumerate(connexions)]
+                stats.visites += sum(nombres)
+                stats.doublons += sum(map(sum, comptes)) - sum(nombres)
+
+                ids = np.concatenate([resultat.lignes()[0][:nombre] for resultat, nombre in zip(resultats, nombres)])
+                cles = np.concatenate([resultat.lignes()[1][:nombre] for resultat, nombre in zip(resultats, nombres)])
+                tri = np.argsort(cles)
+                ids, parents = ids[tri], cles[tri] // len(recherche.ACCELERATIONS)
+                couches.append((ids, parents))
+
+                x, y, _, _ = decoder(index, ids)
+                arrivees = np.flatnonzero(cases[(y + piste.marge) * piste.pas + x + piste.marge] == ARRIVEE)
+                if len(arrivees):
+                    indice = int(arrivees[0])
+                    chemin = []
+                    for ids_couche, parents_couche in reversed(couches):
+                        chemin.append(index.decoder(int(ids_couche[indice]))[:2])
+                        if parents_couche is not None:
+                            indice = int(parents_couche[indice])
+                    chemin.reverse()
+                    return trajectoire[:-1] + chemin
+        return None
+    finally:
+        # Un processus arrêté sur une erreur ne doit ni masquer cette erreur ni
+        # empêcher la destruction des segments.
+        try:
+            for connexion in connexions:
+                try:
+                    connexion.send(None)
+                except OSError:
+                    pass
+            for travail in travailleurs:
+                travail.join(DELAI_ARRET)
+                if travail.is_alive():
+                    travail.terminate()
+                    travail.join()
+            for connexion in connexions:
+                connexion.close()
+        finally:
+            for tampon in [couche] + sorties + resultats:
+                tampon.liberer()
@@ -0,0 +1,316 @@
+"""
+Représentation compacte d'une piste de Racetrack.
+
+Les cases sont stockées dans un seul `bytearray`, ligne après ligne, sous forme
+de codes numériques. La grille est entourée d'une marge de cases `HORS` assez
+large pour qu'aucun coup partant de la piste ne sorte du tableau : les tests de
+bornes disparaissent des boucles de recherche.
+
+La classe `Piste` reste utilisable comme l'ancienne liste de listes de
+caractères (`len(piste)`, `piste[y][x]`, `for ligne in piste`), ce qui permet à
+l'affichage de continuer à fonctionner sans modification.
+
+Le chargement lit le fichier d'un bloc et le valide en une seule passe d'une
+expression régulière : même une piste de plusieurs mégaoctets se charge sans
+boucle Python sur les caractères.
+"""
+import hashlib
+import re
+from array import array
+
+VIDE, DEPART, ARRIVEE, MUR, HORS = range(5)
+"""Codes des cases. Un code supérieur ou égal à `MUR` est infranchissable."""
+
+CARACTERES = '.>*#'
+"""Caractère associé à chaque code de case de la piste."""
+
+CODES = bytes.maketrans(CARACTERES.encode(), bytes(range(len(CARACTERES))))
+"""Table de traduction des caractères du fichier vers les codes."""
+
+VERS_CARACTERES = bytes.maketrans(bytes(range(len(CARACTERES) + 1)), (CARACTERES + '#').encode())
+"""Table de traduction inverse ; les cases hors piste sont vues comme des murs."""
+
+MASQUE_ARRIVEE = bytes(int(code == ARRIVEE) for code in range(256))
+"""Table de traduction des codes vers 1 pour une case d'arrivée, 0 sinon."""
+
+MASQUE_PRATICABLE = bytes(int(code < MUR) for code in range(256))
+"""Table de traduction des codes vers 1 pour une case praticable, 0 sinon."""
+
+INVALIDE = re.compile(rb'[^.#>*\s]|(?<=[.#>*])[ \t\r\f\v]+(?=[.#>*])')
+"""Premier caractère invalide d'un fichier de piste : tout caractère autre que '.#>*'
+et les blancs, ou un blanc au milieu d'une ligne (les blancs en début et fin de
+ligne sont ignorés)."""
+
+
+class PisteInvalide(ValueError):
+    """
+    Erreur levée par `charger` lorsqu'un fichier ne décrit pas une piste valide.
+
+    Attributs :
+        ligne (int): Numéro (à partir de 1) de la ligne du fichier en cause, ou None.
+        colonne (int): Numéro (à partir de 1) de la colonne en cause, ou None.
+    """
+
+    def __init__(self, message, ligne=None, colonne=None):
+        if ligne is not None:
+            message = f"ligne {ligne}" + (f", colonne {colonne}" if colonne is not None else "") + f" : {message}"
+        super().__init__(message)
+        self.ligne = ligne
+        self.colonne = colonne
+
+
+def vitesse_max(taille):
+    """
+    Calcule la plus grande vitesse atteignable sur un axe de `taille` cases.
+
+    Partant d'une vitesse nulle et en accélérant d'au plus 1 par tour, atteindre
+    la vitesse v demande de parcourir au moins 1 + 2 + ... + v cases.
+
+    Args:
+        taille (int): Nombre de cases sur l'axe.
+
+    Returns:
+        int: La vitesse maximale (en valeur absolue) sur cet axe.
+    """
+    v = 0
+    while (v + 1) * (v + 2) // 2 <= taille - 1:
+        v += 1
+    return v
+
+
+class Piste:
+    """
+    Piste de jeu stockée dans un tableau d'octets à plat.
+
+    La case (x, y) se trouve à l'indice `indice(x, y)` de `cases`. La marge autour
+    de la grille est plus large que la plus grande vitesse atteignable, si bien
+    que toute case visée en un coup depuis la piste existe dans le tableau.
+
+    `tables` contient des données dérivées déjà calculées, indexées par nom
+    (par exemple les champs de distances lus dans le cache de `src.compilation`).
+
+    Les cases remarquables sont indexées une fois pour toutes à la construction :
+        departs (array): Indices (dans `cases`) des cases '>', dans l'ordre de lecture.
+        arrivees (array): Indices des cases '*', dans l'ordre de lecture.
+        arrivee (bytearray): Un octet par case de `cases`, 1 pour les cases '*'.
+        boite (tuple): Rectangle (xmin, ymin, xmax, ymax) englobant les cases
+            praticables, bornes comprises, ou None si la piste n'en a aucune ;
+            il borne la numérotation des états (voir `src.recherche.IndexEtats`).
+        empreinte (bytes): Empreinte des dimensions et du contenu de `cases`, qui
+            identifie la piste sans comparer ses cases (par exemple dans un cache).
+    """
+
+    def __init__(self, lignes):
+        """
+        Construit la piste à partir de ses lignes.
+
+        Args:
+            lignes (list): Lignes de la piste, octets, chaînes ou listes de caractères
+                '.#>*' de même longueur.
+        """
+        lignes = [ligne if isinstance(ligne, (bytes, bytearray)) else ''.join(ligne).encode() for ligne in lignes]
+        largeur = len(lignes[0])
+        lignes = [ligne[:largeur].ljust(largeur, b'#') for ligne in lignes]
+        self.dimensionner(largeur, len(lignes))
+        self.cases = bytearray([HORS]) * (self.pas * (self.hauteur + 2 * self.marge))
+        for y, ligne in enumerate(lignes):
+            debut = self.indice(0, y)
+            self.cases[debut:debut + self.largeur] = ligne.translate(CODES)
+        self.tables = {}
+        self.indexer()
+
+    @classmethod
+    def depuis_cases(cls, largeur, hauteur, cases):
+        """
+        Reconstruit une piste à partir de son tableau `cases` déjà rempli, sans analyse.
+
+        Args:
+            largeur, hauteur (int): Dimensions de la piste.
+            cases (bytearray): Le tableau des codes de cases, marge comprise.
+
+        Returns:
+            Piste: La piste.
+
+        Raises:
+            ValueError: Si la taille de `cases` ne correspond pas aux dimensions.
+        """
+        piste = cls.__new__(cls)
+        piste.dimensionner(largeur, hauteur)
+        if len(cases) != piste.pas * (hauteur + 2 * piste.marge):
+            raise ValueError(f"{len(cases)} cases pour une piste de {largeur}x{hauteur}")
+        piste.cases = cases
+        piste.tables = {}
+        piste.indexer()
+        return piste
+
+    def dimensionner(self, largeur, hauteur):
+        """
+        Fixe les dimensions de la piste et en déduit la marge et le pas des lignes.
+
+        Args:
+            largeur, hauteur (int): Dimensions de la piste.
+
+        Returns:
+            None
+        """
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.vitesse_max_x = vitesse_max(largeur)
+        self.vitesse_max_y = vitesse_max(hauteur)
+        self.marge = max(self.vitesse_max_x, self.vitesse_max_y) + 1
+        self.pas = largeur + 2 * self.marge
+
+    def indexer(self):
+        """
+        Construit l'index des cases de départ et d'arrivée, la boîte englobante
+        des cases praticables et l'empreinte de la piste (voir la description de la classe).
+
+        Returns:
+            None
+        """
+        empreinte = hashlib.blake2b(self.cases, digest_size=16)
+        empreinte.update(f"{self.largeur}x{self.hauteur}".encode())
+        self.empreinte = empreinte.digest()
+        self.departs = array('i', (m.start() for m in re.finditer(bytes([DEPART]), self.cases)))
+        self.arrivees = array('i', (m.start() for m in re.finditer(bytes([ARRIVEE]), self.cases)))
+        self.arrivee = self.cases.translate(MASQUE_ARRIVEE)
+        praticable = self.cases.translate(MASQUE_PRATICABLE)
+        premiere, derniere = praticable.find(1), praticable.rfind(1)
+        if premiere < 0:
+            self.boite = None
+            return
+        ymin, ymax = self.coordonnees(premiere)[1], self.coordonnees(derniere)[1]
+        xmin, xmax = self.largeur, -1
+        for y in range(ymin, ymax + 1):
+            debut = self.indice(0, y)
+            ligne = praticable[debut:debut + self.largeur]
+            if 1 in ligne:
+                xmin, xmax = min(xmin, ligne.find(1)), max(xmax, ligne.rfind(1))
+        self.boite = (xmin, ymin, xmax, ymax)
+
+    def indice(self, x, y):
+        """
+        Renvoie l'indice de la case (x, y) dans `cases`.
+
+        Args:
+            x, y (int): Coordonnées de la case.
+
+        Returns:
+            int: L'indice de la case.
+        """
+        return (y + self.marge) * self.pas + x + self.marge
+
+    def coordonnees(self, indice):
+        """
+        Renvoie les coordonnées (x, y) de la case d'indice `indice`.
+
+        Args:
+            indice (int): Indice d'une case dans `cases`.
+
+        Returns:
+            tuple: Les coordonnées (x, y).
+        """
+        y, x = divmod(indice, self.pas)
+        return x - self.marge, y - self.marge
+
+    def case(self, x, y):
+        """
+        Renvoie le code de la case (x, y).
+
+        Args:
+            x, y (int): Coordonnées de la case.
+
+        Returns:
+            int: Le code de la case (`VIDE`, `DEPART`, `ARRIVEE`, `MUR` ou `HORS`).
+        """
+        return self.cases[self.indice(x, y)]
+
+    def __len__(self):
+        return self.hauteur
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.hauteur:
+            raise IndexError(y)
+        debut = self.indice(0, y)
+        return self.cases[debut:debut + self.largeur].translate(VERS_CARACTERES).decode()
+
+    def __iter__(self):
+        for y in range(self.hauteur):
+            yield self[y]
+
+
+def charger(fichier):
+    """
+    Charge une piste de jeu depuis un fichier texte.
+
+    Les lignes vides et les blancs en début et fin de ligne sont ignorés.
+
+    Args:
+        fichier (str): Le chemin vers le fichier texte contenant la piste.
+
+    Returns:
+        Piste: La piste de jeu.
+
+    Raises:
+        OSError: Si le fichier ne peut pas être lu.
+        PisteInvalide: Voir `analyser`.
+    """
+    with open(fichier, 'rb') as file:
+        return analyser(file.read())
+
+
+def decrire_caractere(donnees, position):
+    """
+    Décrit le caractère invalide qui commence à `position` pour un message d'erreur.
+
+    Args:
+        donnees (bytes): Le contenu du fichier.
+        position (int): Position du premier octet du caractère.
+
+    Returns:
+        str: Le caractère, décodé en UTF-8 avec les octets qui le suivent, ou la
+        valeur de l'octet s'il ne commence aucun caractère UTF-8 valide.
+    """
+    for fin in range(position + 1, min(position + 4, len(donnees)) + 1):
+        try:
+            return f"caractère invalide {donnees[position:fin].decode('utf-8')!r}"
+        except UnicodeDecodeError:
+            pass
+    return f"octet invalide 0x{donnees[position]:02x}"
+
+
+def analyser(donnees):
+    """
+    Construit une piste à partir du contenu d'un fichier texte.
+
+    Les fins de ligne '\n', '\r\n' et '\r' sont acceptées ; les numéros de ligne
+    des erreurs les comptent toutes trois.
+
+    Args:
+        donnees (bytes): Le contenu du fichier.
+
+    Returns:
+        Piste: La piste de jeu.
+
+    Raises:
+        PisteInvalide: Si le contenu est vide, contient un caractère invalide ou des
+            lignes de longueurs différentes ; l'erreur indique la ligne et la colonne.
+    """
+    # Fins de ligne universelles, comme un fichier ouvert en mode texte : '\r\n' et '\r' deviennent '\n'.
+    if b'\r' in donnees:
+        donnees = donnees.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    # Cas courant : rien d'autre que les caractères de la piste et des fins de ligne.
+    erreur = donnees.translate(None, b'.#>*\n') and INVALIDE.search(donnees)
+    if erreur:
+        position = erreur.start()
+        raise PisteInvalide(decrire_caractere(donnees, position), donnees.count(b'\n', 0, position) + 1,
+                            position - donnees.rfind(b'\n', 0, position))
+    lignes = donnees.split()
+    if not lignes:
+        raise PisteInvalide("piste vide")
+    largeur = len(lignes[0])
+    for rang, ligne in enumerate(lignes):
+        if len(ligne) != largeur:
+            position = next(m.start() for i, m in enumerate(re.finditer(rb'\S+', donnees)) if i == rang)
+            raise PisteInvalide(f"{len(ligne)} cases au lieu de {largeur}", donnees.count(b'\n', 0, position) + 1)
+    return Piste(lignes)
@@ -0,0 +1,1091 @@
+"""
+Moteur de recherche de trajectoires pour Racetrack.
+
+Ce module ne dépend pas de l'interface graphique ni d'aucune variable globale :
+les recherches reçoivent explicitement un objet `Regles`, qui associe une piste
+(voir `src.piste.Piste`) à un mode de règles et porte les données qui en
+dépendent (cache de collisions, champ de distances). Plusieurs recherches
+peuvent ainsi tourner en même temps, sur des pistes ou des règles différentes.
+
+Un état de la voiture est le quadruplet (x, y, vx, vy). Pour économiser la
+mémoire, chaque état est numéroté par un entier (`IndexEtats`), les états
+visités sont marqués dans une table de bits (`EnsembleVisites`), et la
+recherche en largeur ne mémorise pour chaque état découvert que l'indice de
+son parent : la trajectoire n'est reconstruite qu'une fois l'arrivée atteinte.
+
+La recherche A* (`recherche_a_etoile`) est guidée par un champ de distances
+à l'arrivée calculé sur la grille (`champ_distances`) et par le nombre de
+tours qu'il faut, sur chaque axe, pour rejoindre les cases d'arrivée (`tours_axe`).
+
+Les états depuis lesquels l'arrivée n'est plus accessible, par exemple parce
+que la voiture va trop vite pour éviter un mur, peuvent être marqués à
+l'avance (`etats_vivants`) : les recherches les écartent alors sans les développer.
+
+Chaque recherche accepte un paramètre `stats` (voir `src.statistiques`) qu'elle
+tient à jour pendant le calcul.
+"""
+import heapq
+import threading
+from array import array
+from collections import OrderedDict, deque
+from time import perf_counter
+
+from src.piste import ARRIVEE, HORS, MUR, vitesse_max
+from src.statistiques import Statistiques
+
+
+TAILLE_BITMAP_MAX = 1 << 31
+"""Nombre maximal d'états pour lequel l'ensemble des visites est une table de bits."""
+
+DECALAGE_TRANCHE = 24
+"""Une tranche de `EnsembleVisites` couvre 2**DECALAGE_TRANCHE états."""
+
+OCTETS_TRANCHE = 1 << (DECALAGE_TRANCHE - 3)
+"""Taille en octets d'une tranche de `EnsembleVisites` (2 Mio)."""
+
+TAILLE_ELAGAGE_MAX = 1 << 24
+"""Nombre maximal d'états pour lequel `etats_vivants` est calculé."""
+
+PROFONDEUR_CHAINE = 3
+"""Longueur des chaînes de prédécesseurs exigées des états du parcours arrière
+de `recherche_bidirectionnelle`."""
+
+
+class IndexEtats:
+    """
+    Numérote les états (x, y, vx, vy) d'une piste par des entiers consécutifs.
+
+    La voiture ne quitte jamais les cases praticables : les positions sont
+    bornées par leur boîte englobante (`Piste.boite`), de coin (x0, y0) et de
+    dimensions `largeur` x `hauteur`, et les vitesses par la plus grande vitesse
+    atteignable dans cette boîte (voir `src.piste.vitesse_max`). Les identifiants vont de
+    0 à `nombre - 1` ; une piste entourée de murs ou de marges vides n'occupe
+    ainsi que l'espace de ses cases utiles.
+    """
+
+    def __init__(self, piste):
+        xmin, ymin, xmax, ymax = piste.boite or (0, 0, -1, -1)
+        self.x0, self.y0 = xmin, ymin
+        self.largeur = xmax - xmin + 1
+        self.hauteur = ymax - ymin + 1
+        self.vitesse_max_x = vitesse_max(self.largeur)
+        self.vitesse_max_y = vitesse_max(self.hauteur)
+        self.nombre = self.largeur * self.hauteur * (2 * self.vitesse_max_x + 1) * (2 * self.vitesse_max_y + 1)
+
+    def encoder(self, x, y, vx, vy):
+        """
+        Compacte un état (x, y, vx, vy) en un entier unique.
+
+        Args:
+            x, y (int): Position de la voiture.
+            vx, vy (int): Vitesse de la voiture.
+
+        Returns:
+            int: L'identifiant de l'état.
+        """
+        vmax_x, vmax_y = self.vitesse_max_x, self.vitesse_max_y
+        case = (y - self.y0) * self.largeur + x - self.x0
+        return (case * (2 * vmax_x + 1) + vx + vmax_x) * (2 * vmax_y + 1) + vy + vmax_y
+
+    def decoder(self, etat):
+        """
+        Retrouve le quadruplet (x, y, vx, vy) à partir d'un identifiant d'état.
+
+        Args:
+            etat (int): Identifiant renvoyé par `encoder`.
+
+        Returns:
+            tuple: (x, y, vx, vy).
+        """
+        vmax_x, vmax_y = self.vitesse_max_x, self.vitesse_max_y
+        etat, vy = divmod(etat, 2 * vmax_y + 1)
+        case, vx = divmod(etat, 2 * vmax_x + 1)
+        y, x = divmod(case, self.largeur)
+        return x + self.x0, y + self.y0, vx - vmax_x, vy - vmax_y
+
+    def ensemble_visites(self):
+        """
+        Crée un ensemble vide d'identifiants d'états.
+
+        Returns:
+            EnsembleVisites: Une table de bits couvrant tous les états, ou un `set`
+            si l'espace des états dépasse `TAILLE_BITMAP_MAX`.
+        """
+        if self.nombre <= TAILLE_BITMAP_MAX:
+            return EnsembleVisites(self.nombre)
+        return set()
+
+
+class EnsembleVisites:
+    """
+    Ensemble d'identifiants d'états stocké dans une table de bits.
+
+    La table, un bit par état possible, est découpée en tranches de
+    2**`DECALAGE_TRANCHE` états, chacune allouée au premier état qui y est
+    ajouté : une recherche qui ne parcourt qu'une partie de l'espace des états
+    n'occupe que la mémoire des tranches qu'elle touche. L'ensemble s'utilise
+    comme un `set` (`in`, `add`, `len`).
+    """
+
+    def __init__(self, taille):
+        self.nombre = taille
+        self.tranches = [None] * ((taille >> DECALAGE_TRANCHE) + 1)
+        self.taille = 0
+
+    @classmethod
+    def depuis_octets(cls, bits):
+        """
+        Crée un ensemble à partir d'une table de bits existante, sans la copier.
+
+        Args:
+            bits (array): Table de bits, un bit à 1 par état de l'ensemble.
+
+        Returns:
+            EnsembleVisites: L'ensemble.
+        """
+        ensemble = cls(len(bits) << 3)
+        if len(bits) <= OCTETS_TRANCHE:
+            ensemble.tranches = [bits]
+        else:
+            vue = memoryview(bits).cast('B')
+            ensemble.tranches = [vue[debut:debut + OCTETS_TRANCHE] for debut in range(0, len(bits), OCTETS_TRANCHE)]
+        ensemble.taille = bin(int.from_bytes(bytes(bits), 'little')).count('1')
+        return ensemble
+
+    def octets(self):
+        """
+        Renvoie la table de bits d'un seul tenant, les tranches absentes valant zéro.
+
+        Returns:
+            bytes: La table (la tranche elle-même, sans copie, s'il n'y en a qu'une).
+        """
+        tranches = [bytes(self.longueur_tranche(rang)) if tranche is None else tranche
+                    for rang, tranche in enumerate(self.tranches)]
+        return tranches[0] if len(tranches) == 1 else b''.join(tranches)
+
+    def longueur_tranche(self, rang):
+        """
+        Args:
+            rang (int): Numéro d'une tranche.
+
+        Returns:
+            int: Sa taille en octets ; la dernière tranche est plus courte.
+        """
+        return max(0, min(OCTETS_TRANCHE, ((self.nombre + 7) >> 3) - rang * OCTETS_TRANCHE))
+
+    def __contains__(self, etat):
+        tranche = self.tranches[etat >> DECALAGE_TRANCHE]
+        return tranche is not None and tranche[(etat >> 3) & (OCTETS_TRANCHE - 1)] >> (etat & 7) & 1 == 1
+
+    def add(self, etat):
+        rang = etat >> DECALAGE_TRANCHE
+        tranche = self.tranches[rang]
+        if tranche is None:
+            tranche = self.tranches[rang] = bytearray(self.longueur_tranche(rang))
+        position = (etat >> 3) & (OCTETS_TRANCHE - 1)
+        octet = tranche[position]
+        masque = 1 << (etat & 7)
+        if not octet & masque:
+            tranche[position] = octet | masque
+            self.taille += 1
+
+    def __len__(self):
+        return self.taille
+
+
+def verif_collision_souple(piste, debut, fin):
+    """
+    Vérifie s'il y a une collision souple entre le point de départ et le point d'arrivée.
+
+    Args:
+        piste (Piste): La piste de jeu.
+        debut (tuple): Tuple (x, y) représentant la position de départ.
+        fin (tuple): Tuple (x, y) représentant la position d'arrivée.
+
+    Returns:
+        bool: True si aucune collision, False sinon.
+    """
+    return piste.cases[piste.indice(*fin)] < MUR
+
+
+def verif_collision_strict(piste, debut, fin):
+    """
+    Vérifie s'il y a une collision stricte entre le point de départ et le point d'arrivée.
+
+    Toutes les cases traversées par le segment (tracé de Bresenham) doivent être libres.
+
+    Args:
+        piste (Piste): La piste de jeu.
+        debut (tuple): Tuple (x, y) représentant la position de départ.
+        fin (tuple): Tuple (x, y) représentant la position d'arrivée.
+
+    Returns:
+        bool: True si aucune collision, False sinon.
+    """
+    x1, y1 = debut
+    x2, y2 = fin
+    cases = piste.cases
+    i = piste.indice(x1, y1)
+    dx = abs(x2 - x1)
+    dy = -abs(y2 - y1)
+    sx = 1 if x1 < x2 else -1
+    sy = piste.pas if y1 < y2 else -piste.pas
+    err = dx + dy
+    # Le tracé avance d'une case sur l'axe principal à chaque pas.
+    for _ in range(max(dx, -dy)):
+        if cases[i] >= MUR:
+            return False
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            i += sx
+        if e2 <= dx:
+            err += dx
+            i += sy
+    return cases[i] < MUR
+
+
+class CacheCollisions:
+    """
+    Mémorise, pour une piste, la validité des segments vérifiés avec les règles strictes.
+
+    Un segment est identifié par sa case de départ et son déplacement (dx, dy).
+    Tant que l'espace de ces clés est de taille raisonnable, les résultats sont
+    rangés dans un tableau dense (0 : inconnu, 1 : libre, 2 : bloqué) ; sinon
+    un cache LRU de taille bornée est utilisé. Chaque tracé effectivement calculé
+    est compté dans les statistiques de la recherche qui le demande, si elle en fournit.
+
+    Un même cache peut servir à plusieurs fils d'exécution : le cache LRU est
+    protégé par un verrou, et une écriture concurrente dans le tableau dense ne
+    peut au pire que faire tracer deux fois le même segment.
+    """
+
+    TAILLE_DENSE_MAX = 1 << 25
+
+    def __init__(self, piste, taille_max=1 << 20):
+        self.piste = piste
+        self.index = IndexEtats(piste)
+        self.taille_max = taille_max
+        self.table = bytearray(self.index.nombre) if self.index.nombre <= CacheCollisions.TAILLE_DENSE_MAX else None
+        self.lru = OrderedDict()
+        self.verrou = threading.Lock()
+
+    def tracer(self, debut, fin, stats):
+        """
+        Trace un segment sans passer par le cache.
+
+        Args:
+            debut, fin (tuple): Extrémités (x, y) du segment.
+            stats (Statistiques): Statistiques où compter le tracé, ou None.
+
+        Returns:
+            bool: True si aucune collision, False sinon.
+        """
+        if stats is not None:
+            stats.verifications += 1
+        return verif_collision_strict(self.piste, debut, fin)
+
+    def segment_libre(self, debut, fin, stats=None):
+        """
+        Vérifie, en réutilisant les résultats déjà calculés, qu'un segment ne traverse aucun mur.
+
+        Args:
+            debut (tuple): Tuple (x, y) représentant la position de départ.
+            fin (tuple): Tuple (x, y) représentant la position d'arrivée.
+            stats (Statistiques): Statistiques où compter un tracé effectué, optionnelles.
+
+        Returns:
+            bool: True si aucune collision, False sinon.
+        """
+        index = self.index
+        largeur, vmax_x, vmax_y = index.largeur, index.vitesse_max_x, index.vitesse_max_y
+        x, y = debut[0] - index.x0, debut[1] - index.y0
+        dx, dy = fin[0] - debut[0], fin[1] - debut[1]
+        if not (-vmax_x <= dx <= vmax_x and -vmax_y <= dy <= vmax_y and 0 <= x < largeur and 0 <= y < index.hauteur):
+            return self.tracer(debut, fin, stats)
+        cle = ((y * largeur + x) * (2 * vmax_x + 1) + dx + vmax_x) * (2 * vmax_y + 1) + dy + vmax_y
+        table = self.table
+        if table is not None:
+            connu = table[cle]
+            if connu:
+                return connu == 1
+            libre = self.tracer(debut, fin, stats)
+            table[cle] = 1 if libre else 2
+            return libre
+        with self.verrou:
+            libre = self.lru.get(cle)
+            if libre is not None:
+                self.lru.move_to_end(cle)
+                return libre
+        # Le tracé se fait hors du verrou : les autres fils ne l'attendent pas.
+        libre = self.tracer(debut, fin, stats)
+        with self.verrou:
+            self.lru[cle] = libre
+            if len(self.lru) > self.taille_max:
+                self.lru.popitem(last=False)
+        return libre
+
+
+class Regles:
+    """
+    Contexte d'une recherche : une piste et le mode de règles qui s'y applique.
+
+    L'objet garde les données calculées pour ce couple et réutilisables d'une
+    recherche à l'autre : le cache des segments vérifiés avec les règles strictes,
+    le champ de distances à l'arrivée et l'ensemble des états vivants. Deux
+    instances ne partagent rien, sauf les tables rangées avec la piste (voir `vivants`).
+
+    Les statistiques propres à chaque recherche ne sont pas rangées dans l'objet :
+    elles sont passées explicitement aux fonctions qui les tiennent à jour, si
+    bien que plusieurs recherches peuvent partager le même contexte.
+    """
+
+    def __init__(self, piste, souple, elaguer=False):
+        """
+        Associe une piste à un mode de règles.
+
+        Args:
+            piste (Piste): La piste de jeu.
+            souple (bool): True pour les règles souples, False pour les règles strictes.
+            elaguer (bool): Si True, l'ensemble des états vivants est calculé quand
+                il ne figure pas dans les tables de la piste (voir `vivants`).
+        """
+        self.piste = piste
+        self.souple = souple
+        self.elaguer = elaguer
+        self.collisions = None if souple else CacheCollisions(piste)
+        self._distances = None
+        self._vivants = None
+        self._vivants_lus = False
+
+    def distances(self):
+        """
+        Renvoie le champ de distances adapté aux règles, calculé au premier appel
+        s'il ne figure pas déjà dans les tables de la piste (voir `src.compilation`).
+
+        Returns:
+            array: Le champ de distances (voir `champ_distances`).
+        """
+        if self._distances is None:
+            self._distances = self.piste.tables.get('distances_souples' if self.souple else 'distances_strictes')
+        if self._distances is None:
+            self._distances = champ_distances(self.piste, traverse_murs=self.souple)
+        return self._distances
+
+    def vivants(self):
+        """
+        Renvoie l'ensemble des états depuis lesquels l'arrivée reste accessible
+        (voir `etats_vivants`), que les recherches utilisent pour écarter les autres.
+
+        La table est lue dans les tables de la piste (voir `src.compilation`). Si
+        elle n'y figure pas, elle n'est calculée que si l'élagage a été demandé
+        (`elaguer`), puis rangée avec la piste : les autres recherches sur la
+        même piste, y compris dans d'autres processus, la reprennent, et
+        `src.compilation.completer` peut l'enregistrer dans le cache.
+
+        Returns:
+            EnsembleVisites: Les états vivants, ou None si la table n'est pas
+            disponible ou si la piste compte trop d'états pour l'élagage.
+        """
+        if not self._vivants_lus:
+            nom = 'vivants_souples' if self.souple else 'vivants_strictes'
+            if nom not in self.piste.tables and self.elaguer:
+                self.piste.tables[nom] = etats_vivants(self.piste, self.souple)
+            table = self.piste.tables.get(nom)
+            self._vivants = EnsembleVisites.depuis_octets(table) if table else None
+            self._vivants_lus = True
+        return self._vivants
+
+
+ACCELERATIONS = tuple((dx, dy) for dx in range(-1, 2) for dy in range(-1, 2))
+
+
+def deplacement_valide(regles, debut, fin, stats=None):
+    """
+    Vérifie qu'un déplacement reste dans la piste et respecte les règles de collision.
+
+    Avec les règles strictes, le résultat est mémorisé dans le cache de collisions de `regles`.
+
+    Args:
+        regles (Regles): La piste et le mode de règles.
+        debut (tuple): Tuple (x, y) représentant la position de départ.
+        fin (tuple): Tuple (x, y) représentant la position d'arrivée.
+        stats (Statistiques): Statistiques où compter les vérifications de collision, optionnelles.
+
+    Returns:
+        bool: True si le déplacement est autorisé, False sinon.
+    """
+    piste = regles.piste
+    px, py = fin
+    if not (0 <= px < piste.largeur and 0 <= py < piste.hauteur):
+        return False
+    if regles.souple:
+        if stats is not None:
+            stats.verifications += 1
+        return verif_collision_souple(piste, debut, fin)
+    return regles.collisions.segment_libre(debut, fin, stats)
+
+
+def successeurs(regles, position, vitesse, stats=None):
+    """
+    Génère les positions atteignables en un tour depuis une position et une vitesse.
+
+    Les neuf accélérations sont parcourues dans l'ordre de `ACCELERATIONS`
+    (dx de -1 à 1, puis dy de -1 à 1), comme dans le jeu.
+
+    Args:
+        regles (Regles): La piste et le mode de règles.
+        position (tuple): Tuple (x, y) représentant la position actuelle.
+        vitesse (tuple): Tuple (vx, vy) représentant la vitesse actuelle.
+        stats (Statistiques): Statistiques où compter les vérifications de collision, optionnelles.
+
+    Returns:
+        list: Liste de tuples (x, y) représentant les positions valides.
+    """
+    piste = regles.piste
+    cases, pas = piste.cases, piste.pas
+    libre = None if regles.souple else regles.collisions.segment_libre
+    cx, cy = position[0] + vitesse[0], position[1] + vitesse[1]
+    centre = piste.indice(cx, cy)
+    positions_valides = []
+    for dx, dy in ACCELERATIONS:
+        # Les cases hors de la grille font partie de la marge et sont infranchissables.
+        if cases[centre + dy * pas + dx] >= MUR:
+            continue
+        if libre is None or libre(position, (cx + dx, cy + dy), stats):
+            positions_valides.append((cx + dx, cy + dy))
+    if libre is None and stats is not None:
+        # Règles souples : chaque case d'arrivée examinée est une vérification.
+        stats.verifications += len(ACCELERATIONS)
+    return positions_valides
+
+
+def predecesseurs(regles, position, vitesse, index, stats=None):
+    """
+    Génère les états depuis lesquels un coup mène à l'état (position, vitesse).
+
+    C'est la transition inverse de `successeurs` : la position précédente est
+    `position - vitesse`, et la vitesse précédente diffère de `vitesse` d'une
+    des neuf accélérations. Le coup doit respecter les mêmes règles que dans le jeu.
+
+    Args:
+        regles (Regles): La piste et le mode de règles.
+        position (tuple): Tuple (x, y) représentant la position atteinte.
+        vitesse (tuple): Tuple (vx, vy) représentant la vitesse à l'arrivée.
+        index (IndexEtats): Numérotation des états de la piste.
+        stats (Statistiques): Statistiques où compter les vérifications de collision, optionnelles.
+
+    Returns:
+        list: Liste de couples ((x, y), (vx, vy)) représentant les états précédents.
+    """
+    vmax_x, vmax_y = index.vitesse_max_x, index.vitesse_max_y
+    debut = (position[0] - vitesse[0], position[1] - vitesse[1])
+    if not (0 <= debut[0] - index.x0 < index.largeur and 0 <= debut[1] - index.y0 < index.hauteur):
+        return []
+    if not deplacement_valide(regles, debut, position, stats):
+        return []
+    etats_precedents = []
+    for dx, dy in ACCELERATIONS:
+        vx, vy = vitesse[0] - dx, vitesse[1] - dy
+        if abs(vx) <= vmax_x and abs(vy) <= vmax_y:
+            etats_precedents.append((debut, (vx, vy)))
+    return etats_precedents
+
+
+def etats_initiaux(piste, index, trajectoire):
+    """
+    Renvoie les états depuis lesquels part une recherche.
+
+    Une trajectoire non vide donne un seul état : sa dernière position, avec la
+    vitesse de son dernier coup. Une trajectoire vide (partie non commencée)
+    donne toutes les cases de départ de la piste à vitesse nulle : une seule
+    recherche trouve alors la meilleure trajectoire et le départ qui lui convient.
+
+    Args:
+        piste (Piste): La piste de jeu.
+        index (IndexEtats): Numérotation des états de la piste.
+        trajectoire (list): Liste de positions (x, y), éventuellement vide.
+
+    Returns:
+        list: Les identifiants des états initiaux, sans doublon.
+    """
+    if not trajectoire:
+        return [index.encoder(*piste.coordonnees(indice), 0, 0) for indice in piste.departs]
+    x, y = trajectoire[-1]
+    vx, vy = (0, 0) if len(trajectoire) < 2 else (x - trajectoire[-2][0], y - trajectoire[-2][1])
+    return [index.encoder(x, y, vx, vy)]
+
+
+def reconstruire_trajectoire(etats, parents, indice, index):
+    """
+    Reconstruit la suite des positions menant à un état en remontant les parents.
+
+    Args:
+        etats (array): Identifiants des états découverts.
+        parents (array): Pour chaque état découvert, l'indice de son parent (-1 pour une racine).
+        indice (int): Indice de l'état final dans `etats`.
+        index (IndexEtats): Numérotation des états de la piste.
+
+    Returns:
+        list: Liste de tuples (x, y), de la racine jusqu'à l'état final.
+    """
+    chemin = []
+    while indice != -1:
+        x, y, _, _ = index.decoder(etats[indice])
+        chemin.append((x, y))
+        indice = parents[indice]
+    chemin.reverse()
+    return chemin
+
+
+def recherche_largeur(regles, trajectoire, stats=None):
+    """
+    Recherche une trajectoire gagnante en utilisant l'algorithme de parcours en largeur (BFS).
+
+    La file contient des identifiants d'états compactés et non des trajectoires,
+    et les états visités sont marqués dans une table de bits : la mémoire utilisée
+    ne dépend pas de la longueur des chemins.
+
+    Args:
+        regles (Regles): La piste et le mode de règles.
+        trajectoire (list): Liste de positions (x, y) ; la recherche part de la dernière. Vide,
+            la recherche part à la fois de toutes les cases de départ (voir `etats_initiaux`).
+        stats (Statistiques): Statistiques à tenir à jour, optionnelles.
+
+    Returns:
+        list: La trajectoire gagnante (précédée de `trajectoire`) si elle existe, sinon None.
+    """
+    if stats is None:
+        stats = Statistiques()
+    piste = regles.piste
+    with stats.phase('preparation'):
+        vivants = regles.vivants()
+        index = IndexEtats(piste)
+        etats = array('q', etats_initiaux(piste, index, trajectoire))
+        parents = array('q', [-1]) * len(etats)
+        visite = index.ensemble_visites()
+        for etat in etats:
+            visite.add(etat)
+    stats.visites = len(etats)
+    tete = 0
+    with stats.phase('recherche'):
+        while tete < len(etats):
+            stats.frontiere = len(etats) - tete
+            x, y, vx, vy = index.decoder(etats[tete])
+            if piste.case(x, y) == ARRIVEE:
+                return trajectoire[:-1] + reconstruire_trajectoire(etats, parents, tete, index)
+            stats.etats_developpes += 1
+            for px, py in successeurs(regles, (x, y), (vx, vy), stats):
+                suivant = index.encoder(px, py, px - x, py - y)
+                if suivant in visite:
+                    stats.doublons += 1
+                    continue
+                if vivants is not None and suivant not in vivants:
+                    stats.elagues += 1
+                    continue
+                visite.add(suivant)
+                etats.append(suivant)
+                parents.append(tete)
+                stats.visites += 1
+            tete += 1
+    return None
+
+
+def recherche_bidirectionnelle(regles, trajectoire, stats=None):
+    """
+    Recherche une trajectoire gagnante de longueur minimale par un parcours en largeur bidirectionnel.
+
+    Deux parcours en largeur progressent couche par couche : l'un depuis le départ,
+    l'autre en remontant depuis les états d'arrivée (cases '*' avec toute vitesse),
+    grâce à `predecesseurs`. La couche développée est toujours celle de la plus
+    petite frontière, et le premier état commun aux deux parcours donne une
+    trajectoire de même longueur que `recherche_largeur`.
+
+    Le parcours arrière n'admet que les états par lesquels une trajectoire
+    venue d'un départ peut passer : la voiture n'est jamais sur un mur, et
+    l'état doit avoir une chaîne de `PROFONDEUR_CHAINE` prédécesseurs, ou une
+    plus courte remontant à un arrêt (vitesse nulle). Sans ce filtre, la
+    plupart des vitesses d'arrivée, trop grandes pour être atteintes sur la
+    piste, gonflent la frontière arrière, et le parcours avant fait presque
+    tout le travail.
+
+    Args:
+        regles (Regles): La piste et le mode de règles.
+        trajectoire (list): Liste de positions (x, y) ; la recherche part de la dernière. Vide,
+            la recherche part à la fois de toutes les cases de départ (voir `etats_initiaux`).
+        stats (Statistiques): Statistiques à tenir à jour, optionnelles.
+
+    Returns:
+        list: La trajectoire gagnante (précédée de `trajectoire`) si elle existe, sinon None.
+    """
+    if stats is None:
+        stats = Statistiques()
+    piste = regles.piste
+    index = IndexEtats(piste)
+    vmax_x, vmax_y = index.vitesse_max_x, index.vitesse_max_y
+    departs = etats_initiaux(piste, index, trajectoire)
+    for depart in departs:
+        x, y, _, _ = index.decoder(depart)
+        if piste.case(x, y) == ARRIVEE:
+            return trajectoire[:-1] + [(x, y)]
+    # Chaque parcours associe à un état découvert son voisin du côté de sa racine.
+    avant = dict.fromkeys(departs)
+    arriere = {}
+    # Prédécesseurs (sur la piste) de chaque état rencontré en arrière, calculés une seule fois.
+    connus = {}
+    # Longueur de chaîne de prédécesseurs déjà vérifiée pour un état, -1 s'il n'en a pas.
+    chaines = {}
+
+    def precedents(etat):
+        liste = connus.get(etat)
+        if liste is None:
+            x, y, vx, vy = index.decoder(etat)
+            liste = connus[etat] = [index.encoder(px, py, pvx, pvy) for (px, py), (pvx, pvy)
+                                    in predecesseurs(regles, (x, y), (vx, vy), index, stats)
+                                    if piste.case(px, py) < MUR]
+        return liste
+
+    def accessible(etat, longueur):
+        connue = chaines.get(etat, 0)
+        if connue < 0 or connue >= longueur:
+            return connue >= longueur
+        _, _, vx, vy = index.decoder(etat)
+        if vx == 0 and vy == 0:
+            chaines[etat] = PROFONDEUR_CHAINE
+            return True
+        for precedent in precedents(etat):
+            if longueur <= 1 or accessible(precedent, longueur - 1):
+                chaines[etat] = longueur
+                return True
+        chaines[etat] = -1
+        return False
+
+    with stats.phase('preparation'):
+        vivants = regles.vivants()
+        for indice in piste.arrivees:
+            x, y = piste.coordonnees(indice)
+            for vx in range(-vmax_x, vmax_x + 1):
+                for vy in range(-vmax_y, vmax_y + 1):
+                    etat = index.encoder(x, y, vx, vy)
+                    if accessible(etat, PROFONDEUR_CHAINE):
+                        arriere[etat] = None
+    frontiere_avant = list(departs)
+    frontiere_arriere = list(arriere)
+    rencontre = None
+    with stats.phase('recherche'):
+        while rencontre is None and frontiere_avant and frontiere_arriere:
+            stats.frontiere = len(frontiere_avant) + len(frontiere_arriere)
+            stats.visites = len(avant) + len(arriere)
+            nouvelle_frontiere = []
+            if len(frontiere_avant) <= len(frontiere_arriere):
+                for etat in frontiere_avant:
+                    stats.etats_developpes += 1
+                    x, y, vx, vy = index.decoder(etat)
+                    for px, py in successeurs(regles, (x, y), (vx, vy), stats):
+                        suivant = index.encoder(px, py, px - x, py - y)
+                        if suivant in avant:
+                            stats.doublons += 1
+                            continue
+                        if vivants is not None and suivant not in vivants:
+                            stats.elagues += 1
+                            continue
+                        avant[suivant] = etat
+                        nouvelle_frontiere.append(suivant)
+                        if suivant in arriere:
+                            rencontre = suivant
+                            break
+                    if rencontre is not None:
+                        break
+                frontiere_avant = nouvelle_frontiere
+            else:
+                for etat in frontiere_arriere:
+                    stats.etats_developpes += 1
+                    for precedent in precedents(etat):
+                        if precedent in arriere:
+                            stats.doublons += 1
+                            continue
+                        if not accessible(precedent, PROFONDEUR_CHAINE):
+                            stats.elagues += 1
+                            continue
+                        arriere[precedent] = etat
+                        nouvelle_frontiere.append(precedent)
+                        if precedent in avant:
+                            rencontre = precedent
+                            break
+                    if rencontre is not None:
+                        break
+                frontiere_arriere = nouvelle_frontiere
+    stats.visites = len(avant) + len(arriere)
+    if rencontre is None:
+        return None
+    chemin = []
+    etat = rencontre
+    while etat is not None:
+        chemin.append(etat)
+        etat = avant[etat]
+    chemin.reverse()
+    etat = arriere[rencontre]
+    while etat is not None:
+        chemin.append(etat)
+        etat = arriere[etat]
+    return trajectoire[:-1] + [index.decoder(etat)[:2] for etat in chemin]
+
+
+def ordre_coups(piste, x, y, vx, vy, distances):
+    """
+    Ordonne les accélérations à essayer depuis un état, la plus prometteuse en dernier.
+
+    Sans champ de distances, l'ordre est celui de `ACCELERATIONS`. Sinon, les coups
+    sont triés par distance à l'arrivée décroissante de la case visée, les cases
+    hors piste ou depuis lesquelles l'arrivée est inaccessible étant placées en tête.
+
+    Args:
+        piste (Piste): La piste de jeu.
+        x, y (int): Position de la voiture.
+        vx, vy (int): Vitesse de la voiture.
+        distances (array): Champ de distances (voir `champ_distances`) ou None.
+
+    Returns:
+        list: Indices dans `ACCELERATIONS`, à dépiler depuis la fin.
+    """
+    if distances is None:
+        return list(range(len(ACCELERATIONS)))
+
+    centre = piste.indice(x + vx, y + vy)
+
+    def cle(coup):
+        distance = distances[centre + ACCELERATIONS[coup][1] * piste.pas + ACCELERATIONS[coup][0]]
+        # Toute distance réelle est inférieure à `len(distances)` : les coups sans issue passent en tête.
+        return -len(distances) if distance < 0 else -distance
+
+    return sorted(range(len(ACCELERATIONS)), key=cle)
+
+
+def recherche_profondeur(regles, trajectoire, rappel=None, frequence=500, ordonner=False, stats=None,
+                         intervalle=0.0):
+    """
+    Recherche une trajectoire gagnante en utilisant un parcours en profondeur (DFS) itératif.
+
+    Chaque état (position, vitesse) n'est exploré qu'une seule fois grâce à une
+    table de visite commune à toutes les branches : le temps de calcul est
+    linéaire en nombre d'états. La pile ne contient que les états du chemin
+    courant et, pour chacun, les indices des accélérations restant à essayer.
+
+    Args:
+        regles (Regles): La piste et le mode de règles.
+        trajectoire (list): Liste de positions (x, y) ; la recherche part de la dernière. Vide,
+            la recherche part à la fois de toutes les cases de départ (voir `etats_initiaux`).
+        rappel (callable): Fonction optionnelle appelée avec la trajectoire courante
+            tous les `frequence` états explorés (par exemple pour l'affichage).
+        frequence (int): Nombre d'états explorés entre deux appels à `rappel`.
+        ordonner (bool): Si True, les coups qui rapprochent de l'arrivée (d'après
+            `Regles.distances`) sont essayés en premier.
+        stats (Statistiques): Statistiques à tenir à jour, optionnelles.
+        intervalle (float): Délai minimal, en secondes, entre deux appels à
+            `rappel` : tous les `frequence` états, le rappel n'a lieu que si ce
+            délai est écoulé depuis le précédent. Permet de limiter l'affichage
+            à quelques images par seconde quelle que soit la vitesse de la recherche.
+
+    Returns:
+        list: La trajectoire gagnante (précédée de `trajectoire`) si elle existe, sinon None.
+    """
+    if stats is None:
+        stats = Statistiques()
+    piste = regles.piste
+    with stats.phase('preparation'):
+        distances = regles.distances() if ordonner else None
+        vivants = regles.vivants()
+        index = IndexEtats(piste)
+        visite = index.ensemble_visites()
+    prefixe = trajectoire[:-1]
+    departs = etats_initiaux(piste, index, trajectoire)
+    for depart in departs:
+        x, y, _, _ = index.decoder(depart)
+        if piste.case(x, y) == ARRIVEE:
+            return prefixe + [(x, y)]
+    pile_etats = []
+    pile_coups = []
+    dernier_rappel = perf_counter()
+    with stats.phase('recherche'):
+        # Les départs sont explorés l'un après l'autre, avec une table de visite commune.
+        while pile_etats or departs:
+            if not pile_etats:
+                depart = departs.pop(0)
+                if depart in visite:
+                    continue
+                visite.add(depart)
+                stats.visites += 1
+                stats.etats_developpes += 1
+                pile_etats.append(depart)
+                pile_coups.append(ordre_coups(piste, *index.decoder(depart), distances))
+                continue
+            coups = pile_coups[-1]
+            if not coups:
+                pile_etats.pop()
+                pile_coups.pop()
+                continue
+            x, y, vx, vy = index.decoder(pile_etats[-1])
+            dx, dy = ACCELERATIONS[coups.pop()]
+            px, py = x + vx + dx, y + vy + dy
+            if not deplacement_valide(regles, (x, y), (px, py), stats):
+                continue
+            suivant = index.encoder(px, py, px - x, py - y)
+            if suivant in visite:
+                stats.doublons += 1
+                continue
+            if vivants is not None and suivant not in vivants:
+                stats.elagues += 1
+                continue
+            visite.add(suivant)
+            stats.visites += 1
+            pile_etats.append(suivant)
+            pile_coups.append(ordre_coups(piste, px, py, px - x, py - y, distances))
+            stats.frontiere = len(pile_etats)
+            if piste.case(px, py) == ARRIVEE:
+                return prefixe + [index.decoder(etat)[:2] for etat in pile_etats]
+            stats.etats_developpes += 1
+            if rappel is not None and stats.etats_developpes % frequence == 0:
+                if perf_counter() - dernier_rappel >= intervalle:
+                    rappel(prefixe + [index.decoder(etat)[:2] for etat in pile_etats])
+                    dernier_rappel = perf_counter()
+    return None
+
+
+def champ_distances(piste, traverse_murs=False):
+    """
+    Calcule, pour chaque case, le nombre minimal de pas (y compris en diagonale)
+    pour rejoindre la case '*' la plus proche.
+
+    Le calcul est un parcours en largeur partant de toutes les cases '*' à la fois.
+
+    Args:
+        piste (Piste): La piste de jeu.
+        traverse_murs (bool): Si True, les cases '#' peuvent être traversées
+            (règles souples, où seule la case d'arrivée d'un coup est vérifiée).
+
+    Returns:
+        array: Distances indexées comme `piste.cases`, -1 pour les cases hors
+        piste et celles depuis lesquelles l'arrivée est inaccessible.
+    """
+    cases, pas = piste.cases, piste.pas
+    voisins = tuple(dy * pas + dx for dx in range(-1, 2) for dy in range(-1, 2) if dx or dy)
+    limite = HORS if traverse_murs else MUR
+    distances = array('i', [-1]) * len(cases)
+    file = deque(piste.arrivees)
+    for i in file:
+        distances[i] = 0
+    while file:
+        i = file.popleft()
+        suivante = distances[i] + 1
+        for decalage in voisins:
+            j = i + decalage
+            if distances[j] == -1 and cases[j] < limite:
+                distances[j] = suivante
+                file.append(j)
+    return distances
+
+
+def etats_vivants(piste, souple):
+    """
+    Marque les états depuis lesquels l'arrivée reste accessible.
+
+    Le calcul est un point fixe en arrière : tout état d'arrivée (toute case '*'
+    avec toute vitesse) est vivant, ainsi que tout état dont un coup mène à un
+    état vivant, trouvé avec `predecesseurs`. Depuis les autres états, l'arrivée
+    est hors d'atteinte quoi que fasse la voiture (elle va par exemple trop vite
+    pour éviter un mur) : aucune trajectoire gagnante n'y passe, et les
+    recherches les écartent sans changer la trajectoire trouvée.
+
+    Args:
+        piste (Piste): La piste de jeu.
+        souple (bool): True pour les règles souples, False pour les règles strictes.
+
+    Returns:
+        array: Table de bits (octets 'B') indexée par les identifiants de
+        `IndexEtats`, un bit à 1 par état vivant ; vide si la piste compte plus
+        de `TAILLE_ELAGAGE_MAX` états.
+    """
+    index = IndexEtats(piste)
+    if index.nombre > TAILLE_ELAGAGE_MAX:
+        return array('B')
+    regles = Regles(piste, souple)
+    cases = piste.cases
+    vmax_x, vmax_y = index.vitesse_max_x, index.vitesse_max_y
+    vivants = EnsembleVisites(index.nombre)
+    file = array('q')
+    for indice in piste.arrivees:
+        x, y = piste.coordonnees(indice)
+        for vx in range(-vmax_x, vmax_x + 1):
+            for vy in range(-vmax_y, vmax_y + 1):
+                etat = index.encoder(x, y, vx, vy)
+                vivants.add(etat)
+                file.append(etat)
+    tete = 0
+    while tete < len(file):
+        x, y, vx, vy = index.decoder(file[tete])
+        tete += 1
+        # La voiture n'est jamais sur un mur : inutile de remonter depuis une telle position.
+        if cases[piste.indice(x - vx, y - vy)] >= MUR:
+            continue
+        for (px, py), (pvx, pvy) in predecesseurs(regles, (x, y), (vx, vy), index):
+            precedent = index.encoder(px, py, pvx, pvy)
+            if precedent not in vivants:
+                vivants.add(precedent)
+                file.append(precedent)
+    return array('B', vivants.octets())
+
+
+def tours_minimum(distance, vitesse):
+    """
+    Minore le nombre de tours nécessaires pour parcourir `distance` pas.
+
+    Au k-ième tour, la vitesse a varié d'au plus k sur chaque axe : le coup
+    couvre donc au plus `vitesse + k` pas, où `vitesse` est max(|vx|, |vy|).
+
+    Args:
+        distance (int): Nombre de pas restant à parcourir.
+        vitesse (int): Norme max(|vx|, |vy|) de la vitesse actuelle.
+
+    Returns:
+        int: Le nombre minimal de tours.
+    """
+    tours = 0
+    parcouru = 0
+    while parcouru < distance:
+        tours += 1
+        parcouru += vitesse + tours
+    return tours
+
+
+def tours_axe(taille, vmax, debut, fin):
+    """
+    Minore, sur un seul axe, le nombre de tours pour atteindre un intervalle de positions.
+
+    Sur un axe, la voiture est un point de [0, taille) dont la vitesse, bornée par
+    `vmax`, varie d'au plus 1 par tour. Un parcours en largeur en arrière depuis
+    les positions de [debut, fin] donne, pour chaque couple (position, vitesse), le
+    nombre minimal de tours pour y arriver. Les murs et l'autre axe sont ignorés :
+    c'est un minorant du nombre de coups sur la piste, qui tient compte du sens de
+    la vitesse (une voiture lancée dans la mauvaise direction doit d'abord freiner).
+
+    Args:
+        taille (int): Nombre de positions sur l'axe.
+        vmax (int): Vitesse maximale sur l'axe.
+        debut, fin (int): Bornes de l'intervalle visé, comprises.
+
+    Returns:
+        array: Nombre minimal de tours, indexé par position * (2 * vmax + 1) + vitesse + vmax,
+        ou -1 si l'intervalle est hors d'atteinte.
+    """
+    largeur = 2 * vmax + 1
+    tours = array('i', [-1]) * (taille * largeur)
+    file = array('q', range(debut * largeur, (fin + 1) * largeur))
+    for etat in file:
+        tours[etat] = 0
+    tete = 0
+    while tete < len(file):
+        etat = file[tete]
+        tete += 1
+        position, vitesse = divmod(etat, largeur)
+        vitesse -= vmax
+        precedente = position - vitesse
+        if not 0 <= precedente < taille:
+            continue
+        suivant = tours[etat] + 1
+        for acceleration in (-1, 0, 1):
+            vitesse_precedente = vitesse - acceleration
+            if -vmax <= vitesse_precedente <= vmax:
+                etat_precedent = precedente * largeur + vitesse_precedente + vmax
+                if tours[etat_precedent] < 0:
+                    tours[etat_precedent] = suivant
+                    file.append(etat_precedent)
+    return tours
+
+
+def recherche_a_etoile(regles, trajectoire, stats=None):
+    """
+    Recherche une trajectoire gagnante de longueur minimale avec l'algorithme A*.
+
+    L'heuristique est le plus grand de trois minorants du nombre de coups
+    restants : le nombre minimal de tours pour parcourir la distance restante
+    (lue dans le champ de distances) compte tenu de la vitesse actuelle, et,
+    sur chaque axe, le nombre minimal de tours pour entrer dans le rectangle
+    englobant les cases d'arrivée (voir `tours_axe`). Elle ne surestime jamais
+    le nombre de coups restants, la trajectoire trouvée a donc la même longueur
+    que celle de `recherche_largeur`.
+
+    Args:
+        regles (Regles): La piste et le mode de règles.
+        trajectoire (list): Liste de positions (x, y) ; la recherche part de la dernière. Vide,
+            la recherche part à la fois de toutes les cases de départ (voir `etats_initiaux`).
+        stats (Statistiques): Statistiques à tenir à jour, optionnelles.
+
+    Returns:
+        list: La trajectoire gagnante (précédée de `trajectoire`) si elle existe, sinon None.
+    """
+    if stats is None:
+        stats = Statistiques()
+    piste = regles.piste
+    with stats.phase('preparation'):
+        distances = regles.distances()
+        vivants = regles.vivants()
+        index = IndexEtats(piste)
+        fermes = index.ensemble_visites()
+        vmax_x, vmax_y = index.vitesse_max_x, index.vitesse_max_y
+        arrivees = [piste.coordonnees(indice) for indice in piste.arrivees]
+        if not arrivees:
+            return None
+        tours_x = tours_axe(piste.largeur, vmax_x, min(x for x, _ in arrivees), max(x for x, _ in arrivees))
+        tours_y = tours_axe(piste.hauteur, vmax_y, min(y for _, y in arrivees), max(y for _, y in arrivees))
+
+    def heuristique(x, y, vx, vy):
+        distance = distances[piste.indice(x, y)]
+        tx = tours_x[x * (2 * vmax_x + 1) + vx + vmax_x]
+        ty = tours_y[y * (2 * vmax_y + 1) + vy + vmax_y]
+        if distance < 0 or tx < 0 or ty < 0:
+            return None
+        return max(tours_minimum(distance, max(abs(vx), abs(vy))), tx, ty)
+
+    etats = array('q')
+    parents = array('q')
+    meilleur_cout = {}
+    tas = []
+    for depart in etats_initiaux(piste, index, trajectoire):
+        h = heuristique(*index.decoder(depart))
+        if h is not None:
+            meilleur_cout[depart] = 0
+            etats.append(depart)
+            parents.append(-1)
+            tas.append((h, h, len(etats) - 1))
+    heapq.heapify(tas)
+    with stats.phase('recherche'):
+        while tas:
+            stats.frontiere = len(tas)
+            _, _, indice = heapq.heappop(tas)
+            etat = etats[indice]
+            if etat in fermes:
+                continue
+            fermes.add(etat)
+            x, y, vx, vy = index.decoder(etat)
+            if piste.case(x, y) == ARRIVEE:
+                return trajectoire[:-1] + reconstruire_trajectoire(etats, parents, indice, index)
+            stats.etats_developpes += 1
+            cout = meilleur_cout[etat] + 1
+            for px, py in successeurs(regles, (x, y), (vx, vy), stats):
+                nvx, nvy = px - x, py - y
+                suivant = index.encoder(px, py, nvx, nvy)
+                if suivant in fermes or meilleur_cout.get(suivant, cout + 1) <= cout:
+                    stats.doublons += 1
+                    continue
+                if vivants is not None and suivant not in vivants:
+                    stats.elagues += 1
+                    continue
+                h = heuristique(px, py, nvx, nvy)
+                if h is None:
+                    continue
+                meilleur_cout[suivant] = cout
+                stats.visites = len(meilleur_cout)
+                etats.append(suivant)
+                parents.append(indice)
+                heapq.heappush(tas, (cout + h, h, len(etats) - 1))
+    return None
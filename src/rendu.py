@@ -0,0 +1,136 @@
+"""
+Rendu de la piste en une seule image.
+
+Dessiner une piste case par case crée un objet du canevas Tk par case colorée,
+soit des milliers d'objets sur les grandes pistes, et le canevas ralentit avec
+leur nombre. La piste est donc peinte une fois dans une image, affichée ensuite
+par un seul appel à `src.fltk.image_memoire`.
+
+L'image est produite avec PIL si la bibliothèque est disponible. Sinon, les
+disques sont tracés en Python dans un tableau de pixels encodé en PNG, format
+lu directement par le `PhotoImage` de Tk. Les dernières images produites sont
+conservées en cache, pour chaque couple (piste, taille de case) ; la piste y
+est identifiée par son empreinte (`Piste.empreinte`), calculée au chargement.
+"""
+import base64
+import struct
+import zlib
+from collections import OrderedDict
+from tkinter import PhotoImage
+
+from src.fltk import PIL_AVAILABLE
+
+if PIL_AVAILABLE:
+    from PIL import Image, ImageDraw, ImageTk
+
+COULEURS = {'>': (0x80, 0x80, 0x80), '*': (0x00, 0x00, 0xFF), '#': (0x00, 0x80, 0x00)}
+"""Couleur (r, v, b) des cases de départ (gris), d'arrivée (bleu) et des murs (vert)."""
+
+IMAGES_MAX = 8
+"""Nombre d'images conservées dans le cache ; les moins récemment utilisées sont oubliées."""
+
+_images = OrderedDict()
+
+
+def disques(piste, taille_case):
+    """
+    Énumère les disques à peindre, dans l'ordre de l'ancien dessin case par case.
+
+    Chaque case colorée est un disque un peu plus grand que la case, si bien que
+    les disques voisins se recouvrent et forment des zones continues.
+
+    Args:
+        piste (Piste): La piste à dessiner.
+        taille_case (int): La taille de chaque case en pixels.
+
+    Returns:
+        generator: Des tuples (abscisse du centre, ordonnée du centre, rayon, couleur).
+    """
+    rayon = taille_case // 2 + 4.5
+    for y, ligne in enumerate(piste):
+        for x, caractere in enumerate(ligne):
+            if caractere in COULEURS:
+                yield x * taille_case + taille_case // 2, y * taille_case + taille_case // 2, rayon, COULEURS[caractere]
+
+
+def pixels(piste, taille_case):
+    """
+    Peint la piste dans un tableau de pixels RGBA, sans bibliothèque externe.
+
+    Les pixels hors des disques restent transparents.
+
+    Args:
+        piste (Piste): La piste à dessiner.
+        taille_case (int): La taille de chaque case en pixels.
+
+    Returns:
+        bytearray: Les pixels, ligne après ligne, 4 octets par pixel.
+    """
+    largeur, hauteur = piste.largeur * taille_case, piste.hauteur * taille_case
+    image = bytearray(largeur * hauteur * 4)
+    for cx, cy, rayon, couleur in disques(piste, taille_case):
+        pixel = bytes(couleur) + b'\xff'
+        for py in range(max(0, int(cy - rayon)), min(hauteur, int(cy + rayon) + 1)):
+            carre = rayon * rayon - (py + 0.5 - cy) ** 2
+            if carre < 0:
+                continue
+            demi = carre ** 0.5
+            debut, fin = max(0, round(cx - demi)), min(largeur, round(cx + demi))
+            if debut < fin:
+                image[(py * largeur + debut) * 4:(py * largeur + fin) * 4] = pixel * (fin - debut)
+    return image
+
+
+def png(largeur, hauteur, rgba):
+    """
+    Encode des pixels RGBA au format PNG.
+
+    Args:
+        largeur, hauteur (int): Dimensions de l'image.
+        rgba (bytes): Les pixels, ligne après ligne, 4 octets par pixel.
+
+    Returns:
+        bytes: Le contenu du fichier PNG.
+    """
+    def bloc(nom, donnees):
+        return struct.pack('>I', len(donnees)) + nom + donnees + struct.pack('>I', zlib.crc32(nom + donnees))
+
+    pas = largeur * 4
+    brut = b''.join(b'\x00' + bytes(rgba[y * pas:(y + 1) * pas]) for y in range(hauteur))
+    return (b'\x89PNG\r\n\x1a\n'
+            + bloc(b'IHDR', struct.pack('>IIBBBBB', largeur, hauteur, 8, 6, 0, 0, 0))
+            + bloc(b'IDAT', zlib.compress(brut))
+            + bloc(b'IEND', b''))
+
+
+def image_piste(piste, taille_case):
+    """
+    Renvoie l'image de la piste, en la dessinant lors du premier appel.
+
+    La fenêtre doit avoir été créée (`cree_fenetre`) avant l'appel.
+
+    Args:
+        piste (Piste): La piste à dessiner.
+        taille_case (int): La taille de chaque case en pixels.
+
+    Returns:
+        PhotoImage: L'image de la piste, de `taille_case` pixels par case.
+    """
+    cle = (piste.empreinte, taille_case)
+    if cle in _images:
+        _images.move_to_end(cle)
+        return _images[cle]
+    largeur, hauteur = piste.largeur * taille_case, piste.hauteur * taille_case
+    if PIL_AVAILABLE:
+        img = Image.new('RGBA', (largeur, hauteur), (0, 0, 0, 0))
+        dessin = ImageDraw.Draw(img)
+        for cx, cy, rayon, couleur in disques(piste, taille_case):
+            dessin.ellipse((cx - rayon, cy - rayon, cx + rayon, cy + rayon), fill=couleur)
+        tk_image = ImageTk.PhotoImage(img)
+    else:
+        donnees = png(largeur, hauteur, pixels(piste, taille_case))
+        tk_image = PhotoImage(data=base64.b64encode(donnees).decode('ascii'), format='png')
+    _images[cle] = tk_image
+    if len(_images) > IMAGES_MAX:
+        _images.popitem(last=False)
+    return tk_image
@@ -0,0 +1,125 @@
+"""
+Instrumentation des recherches de trajectoires.
+
+Toutes les recherches acceptent un objet `Statistiques` qu'elles tiennent à
+jour au fil du calcul : nombre d'états développés, taille de la frontière et
+de l'ensemble des visites, successeurs écartés car déjà visités ou condamnés
+(l'arrivée n'est plus accessible depuis eux), vérifications de collision
+effectuées et temps passé dans chaque phase.
+
+Ces compteurs peuvent être lus pendant la recherche. Un `Rapporteur` les
+affiche à intervalle régulier depuis un fil d'exécution séparé, ce qui permet
+de suivre une longue recherche sans la ralentir ni lancer de profileur.
+"""
+import sys
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class Statistiques:
+    """
+    Compteurs d'une recherche.
+
+    Attributs :
+        etats_developpes (int): États dont les successeurs ont été générés.
+        frontiere (int): Taille actuelle de la frontière (file, pile, tas ou couche).
+        visites (int): Nombre d'états marqués comme visités.
+        doublons (int): Successeurs écartés car déjà visités.
+        elagues (int): Successeurs écartés car l'arrivée n'est plus accessible
+            depuis eux (voir `src.recherche.Regles.vivants`).
+        verifications (int): Vérifications de collision effectuées : une par case
+            d'arrivée examinée avec les règles souples, une par segment tracé avec
+            les règles strictes (les segments retrouvés dans le cache de collisions
+            ne sont pas comptés).
+        phases (dict): Durée cumulée, en secondes, de chaque phase nommée.
+    """
+
+    def __init__(self):
+        self.etats_developpes = 0
+        self.frontiere = 0
+        self.visites = 0
+        self.doublons = 0
+        self.elagues = 0
+        self.verifications = 0
+        self.phases = {}
+        self.debut = perf_counter()
+
+    @contextmanager
+    def phase(self, nom):
+        """
+        Chronomètre un bloc de code et ajoute sa durée à la phase `nom`.
+
+        Args:
+            nom (str): Nom de la phase, par exemple 'preparation' ou 'recherche'.
+        """
+        debut = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[nom] = self.phases.get(nom, 0.0) + perf_counter() - debut
+
+    def resume(self):
+        """
+        Renvoie une copie des compteurs.
+
+        Returns:
+            dict: Les compteurs et les durées des phases, ainsi que le temps écoulé
+            depuis la création de l'objet.
+        """
+        return {
+            'etats_developpes': self.etats_developpes,
+            'frontiere': self.frontiere,
+            'visites': self.visites,
+            'doublons': self.doublons,
+            'elagues': self.elagues,
+            'verifications': self.verifications,
+            'phases': dict(self.phases),
+            'ecoule': perf_counter() - self.debut,
+        }
+
+    def __str__(self):
+        phases = ' '.join(f"{nom} {duree:.2f} s" for nom, duree in self.phases.items())
+        return (f"{perf_counter() - self.debut:7.2f} s  développés {self.etats_developpes}  "
+                f"frontière {self.frontiere}  visités {self.visites}  doublons {self.doublons}  "
+                f"élagués {self.elagues}  vérifications {self.verifications}" + (f"  [{phases}]" if phases else ""))
+
+
+class Rapporteur:
+    """
+    Affiche périodiquement les statistiques d'une recherche en cours.
+
+    S'utilise comme gestionnaire de contexte autour de la recherche :
+
+        stats = Statistiques()
+        with Rapporteur(stats, intervalle=5):
+            recherche_largeur(regles, trajectoire, stats=stats)
+    """
+
+    def __init__(self, stats, intervalle=1.0, rappel=None, sortie=sys.stderr):
+        """
+        Args:
+            stats (Statistiques): Les statistiques à surveiller.
+            intervalle (float): Délai en secondes entre deux rapports.
+            rappel (callable): Fonction appelée avec `stats` à chaque rapport ;
+                par défaut, les statistiques sont écrites sur `sortie`.
+            sortie (file): Flux utilisé en l'absence de `rappel`.
+        """
+        self.stats = stats
+        self.intervalle = intervalle
+        self.rappel = rappel or (lambda stats: print(stats, file=sortie, flush=True))
+        self.arret = threading.Event()
+        self.fil = threading.Thread(target=self.boucle, daemon=True)
+
+    def boucle(self):
+        while not self.arret.wait(self.intervalle):
+            self.rappel(self.stats)
+
+    def __enter__(self):
+        self.fil.start()
+        return self
+
+    def __exit__(self, *exception):
+        self.arret.set()
+        self.fil.join()
+        return False
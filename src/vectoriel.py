@@ -0,0 +1,242 @@
+"""
+Recherche en largeur vectorisée avec NumPy.
+
+Au lieu de développer les états un par un, `recherche_largeur_vectorielle`
+traite chaque couche du parcours en largeur d'un seul bloc : les neuf
+accélérations de tous les états de la couche sont générées, filtrées (bornes,
+collisions souples ou strictes) et dédoublonnées sous forme de tableaux.
+
+NumPy est optionnel : s'il n'est pas installé, la recherche se rabat sur
+`src.recherche.recherche_largeur`.
+"""
+from src import recherche
+from src.piste import ARRIVEE, MUR
+from src.statistiques import Statistiques
+
+try:
+    # noinspection PyUnresolvedReferences
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class VisitesTriees:
+    """
+    États visités rangés dans un tableau trié d'identifiants, quand l'espace des
+    états est trop grand pour une table de bits (voir `src.recherche.TAILLE_BITMAP_MAX`).
+
+    Les recherches se font par dichotomie (`np.searchsorted`) et chaque ajout
+    insère les nouveaux identifiants à leur place en un seul passage sur le
+    tableau, sans le retrier.
+    """
+
+    def __init__(self, ids):
+        """
+        Args:
+            ids (ndarray): Identifiants des premiers états visités.
+        """
+        self.ids = np.unique(ids)
+
+    def nouveaux(self, ids):
+        """
+        Args:
+            ids (ndarray): Identifiants d'états.
+
+        Returns:
+            ndarray: Masque des identifiants absents de l'ensemble.
+        """
+        positions = np.searchsorted(self.ids, ids)
+        presents = positions < len(self.ids)
+        presents[presents] = self.ids[positions[presents]] == ids[presents]
+        return ~presents
+
+    def ajouter(self, ids):
+        """
+        Args:
+            ids (ndarray): Identifiants distincts, absents de l'ensemble.
+
+        Returns:
+            None
+        """
+        ids = np.sort(ids)
+        self.ids = np.insert(self.ids, np.searchsorted(self.ids, ids), ids)
+
+
+def segments_libres(piste, cases, x1, y1, x2, y2):
+    """
+    Vérifie les règles strictes pour un ensemble de segments à la fois.
+
+    Les tracés de Bresenham de tous les segments avancent en parallèle, un pas
+    par itération ; un segment terminé n'est plus modifié.
+
+    Args:
+        piste (Piste): La piste de jeu.
+        cases (ndarray): Vue NumPy de `piste.cases`.
+        x1, y1 (ndarray): Positions de départ des segments.
+        x2, y2 (ndarray): Positions d'arrivée des segments.
+
+    Returns:
+        ndarray: Tableau de booléens, True pour les segments sans collision.
+    """
+    dx = np.abs(x2 - x1)
+    dy = -np.abs(y2 - y1)
+    sx = np.where(x1 < x2, 1, -1)
+    sy = np.where(y1 < y2, piste.pas, -piste.pas)
+    err = dx + dy
+    i = (y1 + piste.marge) * piste.pas + x1 + piste.marge
+    longueurs = np.maximum(dx, -dy)
+    libres = np.ones(len(x1), dtype=bool)
+    for etape in range(int(longueurs.max()) if len(x1) else 0):
+        actifs = etape < longueurs
+        libres &= ~(actifs & (cases[i] >= MUR))
+        e2 = 2 * err
+        avance_x = actifs & (e2 >= dy)
+        avance_y = actifs & (e2 <= dx)
+        err += np.where(avance_x, dy, 0) + np.where(avance_y, dx, 0)
+        i += np.where(avance_x, sx, 0) + np.where(avance_y, sy, 0)
+    return libres & (cases[i] < MUR)
+
+
+def successeurs_couche(regles, cases, x, y, vx, vy, stats=None):
+    """
+    Génère en bloc les successeurs valides de tous les états d'une couche.
+
+    Les successeurs sont renvoyés dans l'ordre où `src.recherche.successeurs`
+    les produirait en parcourant la couche état par état. Les vérifications de
+    collision (cases d'arrivée examinées avec les règles souples, segments
+    tracés avec les règles strictes) sont comptées dans `stats`, s'il est fourni.
+
+    Args:
+        regles (Regles): La piste et le mode de règles.
+        cases (ndarray): Vue NumPy de `piste.cases`.
+        x, y, vx, vy (ndarray): Positions et vitesses des états de la couche.
+        stats (Statistiques): Statistiques à tenir à jour, optionnelles.
+
+    Returns:
+        tuple: (parents, px, py, nvx, nvy) où `parents` donne, pour chaque
+        successeur, l'indice de son état d'origine dans la couche.
+    """
+    piste = regles.piste
+    index = recherche.IndexEtats(piste)
+    ax = np.array([dx for dx, _ in recherche.ACCELERATIONS])
+    ay = np.array([dy for _, dy in recherche.ACCELERATIONS])
+    parents = np.repeat(np.arange(len(x)), len(ax))
+    nvx = (vx[:, None] + ax).ravel()
+    nvy = (vy[:, None] + ay).ravel()
+    garde = (np.abs(nvx) <= index.vitesse_max_x) & (np.abs(nvy) <= index.vitesse_max_y)
+    parents, nvx, nvy = parents[garde], nvx[garde], nvy[garde]
+    px, py = x[parents] + nvx, y[parents] + nvy
+    garde = cases[(py + piste.marge) * piste.pas + px + piste.marge] < MUR
+    if regles.souple:
+        if stats is not None:
+            stats.verifications += len(garde)
+    else:
+        if stats is not None:
+            stats.verifications += int(garde.sum())
+        garde[garde] = segments_libres(piste, cases, x[parents[garde]], y[parents[garde]], px[garde], py[garde])
+    return parents[garde], px[garde], py[garde], nvx[garde], nvy[garde]
+
+
+def table_vivants(regles):
+    """
+    Renvoie l'ensemble des états vivants de `regles` (voir `src.recherche.Regles.vivants`)
+    sous forme de table de bits NumPy.
+
+    Args:
+        regles (Regles): La piste et le mode de règles.
+
+    Returns:
+        ndarray: Les octets de la table, ou None si l'élagage n'est pas disponible.
+    """
+    vivants = regles.vivants()
+    return None if vivants is None else np.frombuffer(vivants.octets(), dtype=np.uint8)
+
+
+def recherche_largeur_vectorielle(regles, trajectoire, stats=None):
+    """
+    Recherche une trajectoire gagnante par un parcours en largeur couche par couche.
+
+    Chaque couche est développée par `successeurs_couche`, puis dédoublonnée
+    contre une table de bits des états visités. La trajectoire renvoyée est la
+    même que celle de `src.recherche.recherche_largeur`.
+
+    Args:
+        regles (Regles): La piste et le mode de règles.
+        trajectoire (list): Liste de positions (x, y) ; la recherche part de la dernière. Vide,
+            la recherche part à la fois de toutes les cases de départ (voir `src.recherche.etats_initiaux`).
+        stats (Statistiques): Statistiques à tenir à jour, optionnelles.
+
+    Returns:
+        list: La trajectoire gagnante (précédée de `trajectoire`) si elle existe, sinon None.
+    """
+    if not NUMPY_AVAILABLE:
+        return recherche.recherche_largeur(regles, trajectoire, stats)
+    if stats is None:
+        stats = Statistiques()
+    piste = regles.piste
+    index = recherche.IndexEtats(piste)
+    largeur, vmax_x, vmax_y = index.largeur, index.vitesse_max_x, index.vitesse_max_y
+    cases = np.frombuffer(piste.cases, dtype=np.uint8)
+
+    departs = recherche.etats_initiaux(piste, index, trajectoire)
+    for depart in departs:
+        x0, y0, _, _ = index.decoder(depart)
+        if piste.case(x0, y0) == ARRIVEE:
+            return trajectoire[:-1] + [(x0, y0)]
+    departs = np.array(departs, dtype=np.int64)
+    with stats.phase('preparation'):
+        vivants = table_vivants(regles)
+        if index.nombre <= recherche.TAILLE_BITMAP_MAX:
+            bits = np.zeros((index.nombre + 7) // 8, dtype=np.uint8)
+            np.bitwise_or.at(bits, departs >> 3, (1 << (departs & 7)).astype(np.uint8))
+            visites = None
+        else:
+            bits = None
+            visites = VisitesTriees(departs)
+    stats.visites = len(departs)
+
+    # Chaque couche garde ses identifiants d'états et, pour chacun, l'indice de son parent.
+    couches = [(departs, None)]
+    etats = [index.decoder(int(depart)) for depart in departs]
+    x, y, vx, vy = (np.array([etat[composante] for etat in etats], dtype=np.int64) for composante in range(4))
+    with stats.phase('recherche'):
+        while len(x):
+            stats.etats_developpes += len(x)
+            stats.frontiere = len(x)
+            parents, px, py, nvx, nvy = successeurs_couche(regles, cases, x, y, vx, vy, stats)
+            case = (py - index.y0) * largeur + px - index.x0
+            ids = (case * (2 * vmax_x + 1) + nvx + vmax_x) * (2 * vmax_y + 1) + nvy + vmax_y
+            if vivants is not None:
+                garde = ((vivants[ids >> 3] >> (ids & 7)) & 1) == 1
+                stats.elagues += len(ids) - int(garde.sum())
+                ids, parents, px, py, nvx, nvy = (tableau[garde] for tableau in (ids, parents, px, py, nvx, nvy))
+            # Première occurrence de chaque état, dans l'ordre de génération.
+            _, premiers = np.unique(ids, return_index=True)
+            premiers.sort()
+            if bits is not None:
+                nouveaux = ((bits[ids[premiers] >> 3] >> (ids[premiers] & 7)) & 1) == 0
+            else:
+                nouveaux = visites.nouveaux(ids[premiers])
+            garde = premiers[nouveaux]
+            stats.doublons += len(ids) - len(garde)
+            stats.visites += len(garde)
+            ids, parents = ids[garde], parents[garde]
+            x, y, vx, vy = px[garde], py[garde], nvx[garde], nvy[garde]
+            if bits is not None:
+                np.bitwise_or.at(bits, ids >> 3, (1 << (ids & 7)).astype(np.uint8))
+            else:
+                visites.ajouter(ids)
+            couches.append((ids, parents))
+            arrivees = np.flatnonzero(cases[(y + piste.marge) * piste.pas + x + piste.marge] == ARRIVEE)
+            if len(arrivees):
+                indice = int(arrivees[0])
+                chemin = []
+                for ids_couche, parents_couche in reversed(couches):
+                    chemin.append(index.decoder(int(ids_couche[indice]))[:2])
+                    if parents_couche is not None:
+                        indice = int(parents_couche[indice])
+                chemin.reverse()
+                return trajectoire[:-1] + chemin
+    return None
@@ -0,0 +1,65 @@
+"""
+Banc d'essai (`src.banc`) et sa sous-commande `banc` de la ligne de commande.
+"""
+import json
+
+import pytest
+
+from src import banc, cli
+from src.piste import charger
+
+PISTE = 'assets/map_mini.txt'
+
+SANS_DEPART = '#######\n#....*#\n#######\n'
+
+
+@pytest.mark.parametrize('algorithme', ['largeur', 'a-etoile'])
+@pytest.mark.parametrize('regles', ['souples', 'strictes'])
+def test_mesure(algorithme, regles):
+    mesure = banc.mesurer(PISTE, algorithme, regles, repetitions=1)
+    resultat = cli.resoudre(charger(PISTE), algorithme, regles)
+    assert mesure['piste'] == PISTE
+    assert mesure['coups'] == resultat['coups'] is not None
+    assert mesure['etats'] == resultat['etats'] > 0
+    assert mesure['duree'] > 0 and mesure['memoire'] > 0
+
+
+def test_mesure_sans_depart(tmp_path):
+    fichier = tmp_path / 'piste.txt'
+    fichier.write_text(SANS_DEPART)
+    mesure = banc.mesurer(str(fichier), 'largeur', 'strictes')
+    assert (mesure['coups'], mesure['etats'], mesure['duree'], mesure['memoire']) == (None, 0, 0.0, 0)
+
+
+def test_mesure_sans_repetition():
+    with pytest.raises(ValueError):
+        banc.mesurer(PISTE, 'largeur', 'strictes', repetitions=0)
+
+
+def test_comparer():
+    ancienne = {'piste': PISTE, 'algorithme': 'largeur', 'regles': 'strictes',
+                'coups': 5, 'etats': 100, 'duree': 1.0, 'memoire': 1000}
+    assert banc.comparer([dict(ancienne)], [ancienne], 0.2) == []
+    assert banc.comparer([dict(ancienne, etats=200, piste='autre')], [ancienne], 0.2) == []
+    assert len(banc.comparer([dict(ancienne, coups=None)], [ancienne], 0.2)) == 1
+    assert len(banc.comparer([dict(ancienne, coups=6, duree=2.0, memoire=2000)], [ancienne], 0.2)) == 3
+    assert banc.comparer([dict(ancienne, etats=110)], [ancienne], 0.2) == []
+
+
+def test_commande(tmp_path, capsys):
+    sortie = tmp_path / 'mesures.json'
+    arguments = ['banc', PISTE, '--algos', 'largeur', '--regles', 'strictes', '--repetitions', '1']
+    assert cli.main(arguments + ['--sortie', str(sortie)]) == 0
+    mesures = json.loads(sortie.read_text())
+    assert [(m['algorithme'], m['regles']) for m in mesures] == [('largeur', 'strictes')]
+    mesures[0]['etats'] //= 2
+    sortie.write_text(json.dumps(mesures))
+    assert cli.main(arguments + ['--reference', str(sortie)]) == 1
+    assert 'Régression' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('repetitions', ['0', '-2', 'trois'])
+def test_commande_repetitions_invalides(repetitions, capsys):
+    with pytest.raises(SystemExit):
+        cli.main(['banc', PISTE, '--repetitions', repetitions])
+    assert '--repetitions' in capsys.readouterr().err
@@ -0,0 +1,107 @@
+"""
+Ligne de commande (`src.cli`) : sous-commandes `resoudre`, `lot` et `generer`.
+"""
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from src import cli
+
+MUR = '######\n#>.#*#\n######\n'
+"""Piste dont l'arrivée n'est atteignable qu'en sautant le mur, donc en règles souples."""
+
+DEPARTS = '#######\n#>...*#\n#######\n##>####\n#######\n'
+"""Piste dont la dernière case de départ est enfermée."""
+
+
+def ecrire(repertoire, nom, contenu):
+    fichier = repertoire / nom
+    fichier.write_text(contenu)
+    return str(fichier)
+
+
+@pytest.mark.parametrize('regles, code', [('souples', 0), ('strictes', 1)])
+def test_resoudre_code(tmp_path, capsys, regles, code):
+    fichier = ecrire(tmp_path, 'mur.txt', MUR)
+    assert cli.main(['resoudre', fichier, '--regles', regles]) == code
+    sortie = capsys.readouterr().out
+    assert ('Trajectoire trouvée' in sortie) == (code == 0)
+
+
+@pytest.mark.parametrize('contenu', [None, '#>.?*#\n'], ids=['absente', 'invalide'])
+def test_resoudre_piste_illisible(tmp_path, capsys, contenu):
+    fichier = str(tmp_path / 'piste.txt') if contenu is None else ecrire(tmp_path, 'piste.txt', contenu)
+    assert cli.main(['resoudre', fichier]) == 2
+    assert capsys.readouterr().err
+
+
+@pytest.mark.parametrize('algorithme', list(cli.ALGORITHMES))
+def test_resoudre_sortie(tmp_path, algorithme):
+    sortie = tmp_path / 'resultat.json'
+    assert cli.main(['resoudre', 'assets/map_mini.txt', '--algo', algorithme, '--sortie', str(sortie)]) == 0
+    resultat = json.loads(sortie.read_text())
+    assert resultat['piste'] == 'assets/map_mini.txt'
+    assert resultat['algorithme'] == algorithme
+    assert resultat['coups'] == len(resultat['trajectoire']) - 1
+    assert resultat['statistiques']['etats_developpes'] == resultat['etats'] > 0
+
+
+def test_resoudre_tous_departs(tmp_path):
+    fichier = ecrire(tmp_path, 'departs.txt', DEPARTS)
+    assert cli.main(['resoudre', fichier]) == 1
+    assert cli.main(['resoudre', fichier, '--tous-departs']) == 0
+
+
+def test_resoudre_elaguer(tmp_path):
+    sorties = [tmp_path / 'complet.json', tmp_path / 'elague.json']
+    cli.main(['resoudre', 'assets/map_test.txt', '--sortie', str(sorties[0])])
+    cli.main(['resoudre', 'assets/map_test.txt', '--elaguer', '--sortie', str(sorties[1])])
+    complet, elague = (json.loads(sortie.read_text()) for sortie in sorties)
+    assert elague['coups'] == complet['coups'] is not None
+    assert elague['etats'] <= complet['etats']
+    assert 'elagage' in elague['statistiques']['phases']
+
+
+def test_lot(tmp_path):
+    fichiers = [ecrire(tmp_path, 'mur.txt', MUR), ecrire(tmp_path, 'invalide.txt', '#>.?*#\n')]
+    flux = io.StringIO()
+    assert cli.lot(fichiers, ['largeur', 'a-etoile'], list(cli.REGLES), processus=2, sortie=flux) == 4
+    resultats = [json.loads(ligne) for ligne in flux.getvalue().splitlines()]
+    assert len(resultats) == 8
+    for resultat in resultats:
+        assert 'trajectoire' not in resultat
+        assert ('erreur' in resultat) == (resultat['piste'] == fichiers[1])
+    coups = {(r['algorithme'], r['regles']): r['coups'] for r in resultats if r['piste'] == fichiers[0]}
+    assert coups == {('largeur', 'souples'): 2, ('a-etoile', 'souples'): 2,
+                     ('largeur', 'strictes'): None, ('a-etoile', 'strictes'): None}
+
+
+def test_lot_commande(tmp_path):
+    ecrire(tmp_path, 'mur.txt', MUR)
+    assert cli.main(['lot', str(tmp_path), '--algos', 'largeur', '--processus', '1']) == 0
+    ecrire(tmp_path, 'invalide.txt', '#>.?*#\n')
+    assert cli.main(['lot', str(tmp_path), '--algos', 'largeur', '--processus', '1']) == 2
+    assert cli.main(['lot', str(tmp_path / 'vide')]) == 2
+
+
+def test_lot_algorithmes_par_defaut():
+    options = cli.analyseur().parse_args(['lot', 'assets'])
+    assert options.algos == cli.ALGORITHMES_LOT
+    assert 'parallele' not in options.algos and 'largeur' in options.algos
+
+
+def test_generer(tmp_path, capsys):
+    dossier = tmp_path / 'pistes'
+    assert cli.main(['generer', 'spirale', str(dossier), '--taille', '20', '12', '--graine', '5', '--nombre', '2']) == 0
+    fichiers = capsys.readouterr().out.split()
+    assert [Path(fichier).name for fichier in fichiers] == ['spirale_20x12_5.txt', 'spirale_20x12_6.txt']
+    for fichier in fichiers:
+        assert cli.main(['resoudre', fichier, '--regles', 'strictes']) == 0
+
+
+def test_generer_taille_invalide(tmp_path, capsys):
+    assert cli.main(['generer', 'couloir', str(tmp_path), '--taille', '5', '50']) == 2
+    assert 'trop petite' in capsys.readouterr().err
+    assert not list(tmp_path.iterdir())
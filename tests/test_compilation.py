@@ -0,0 +1,102 @@
+"""
+Cache des pistes compilées : relecture, reconstruction des fichiers abîmés,
+tables calculées à la demande et suppression des versions périmées.
+"""
+import os
+
+import pytest
+
+from src import compilation, recherche
+from src.piste import charger
+
+PISTE = 'assets/map_mini.txt'
+
+
+@pytest.fixture
+def fichier(tmp_path):
+    piste = compilation.charger(PISTE, str(tmp_path))
+    recherche.recherche_largeur(recherche.Regles(piste, True, elaguer=True), [])
+    compilation.completer(piste)
+    fichiers = os.listdir(tmp_path)
+    assert len(fichiers) == 1
+    return os.path.join(tmp_path, fichiers[0])
+
+
+def modifier(chemin, fonction):
+    with open(chemin, 'rb') as f:
+        donnees = bytearray(f.read())
+    with open(chemin, 'wb') as f:
+        f.write(fonction(donnees))
+
+
+def test_relecture(fichier):
+    piste = compilation.lire(fichier)
+    reference = compilation.compiler(charger(PISTE))
+    reference.tables['vivants_souples'] = recherche.etats_vivants(reference, True)
+    assert piste.cases == reference.cases
+    assert piste.tables == reference.tables
+
+
+def entete(champ, decalage):
+    def fonction(donnees):
+        valeurs = list(compilation.ENTETE.unpack_from(donnees))
+        valeurs[champ] += decalage
+        compilation.ENTETE.pack_into(donnees, 0, *valeurs)
+        return donnees
+    return fonction
+
+
+def section(rang, decalage):
+    def fonction(donnees):
+        position = compilation.ENTETE.size + rang * compilation.SECTION.size
+        nom, type_, debut, taille = compilation.SECTION.unpack_from(donnees, position)
+        compilation.SECTION.pack_into(donnees, position, nom, type_, debut, taille + decalage)
+        return donnees
+    return fonction
+
+
+@pytest.mark.parametrize('abimer', [
+    entete(1, 1),
+    entete(4, 1),
+    entete(5, -1),
+    section(1, -4),
+    section(len(compilation.TABLES) + 1, -1),
+    lambda donnees: donnees[:len(donnees) // 2],
+    lambda donnees: b'',
+], ids=['version', 'largeur', 'hauteur', 'distances', 'vivants', 'tronque', 'vide'])
+def test_fichier_abime_reconstruit(fichier, abimer):
+    modifier(fichier, abimer)
+    assert compilation.lire(fichier) is None
+    piste = compilation.charger(PISTE, os.path.dirname(fichier))
+    assert piste.cases == charger(PISTE).cases
+    assert compilation.lire(fichier) is not None
+
+
+def test_etats_vivants_calcules_a_la_demande(tmp_path):
+    piste = compilation.charger(PISTE, str(tmp_path))
+    assert not any(nom in piste.tables for nom in compilation.OPTIONNELLES)
+    stricte = recherche.Regles(piste, False, elaguer=True)
+    assert recherche.recherche_largeur(stricte, []) is not None
+    assert 'vivants_strictes' in piste.tables and 'vivants_souples' not in piste.tables
+    compilation.completer(piste)
+    relue = compilation.charger(PISTE, str(tmp_path))
+    assert relue.tables['vivants_strictes'] == piste.tables['vivants_strictes']
+    assert 'vivants_souples' not in relue.tables
+
+
+def test_versions_perimees_supprimees(tmp_path):
+    cache = tmp_path / 'cache'
+    texte = tmp_path / 'piste.txt'
+    autre = tmp_path / 'autre.txt'
+    with open(PISTE, 'rb') as f:
+        donnees = f.read()
+    autre.write_bytes(donnees)
+    compilation.charger(str(autre), str(cache))
+    gardee, = os.listdir(cache)
+    (cache / 'ancienne.piste').write_bytes(b'RTPC' + bytes(compilation.ENTETE.size))
+    (cache / 'notes.txt').write_bytes(b'')
+    for contenu in (donnees, donnees.replace(b'.', b'#', 1), donnees):
+        texte.write_bytes(contenu)
+        compilation.charger(str(texte), str(cache))
+    courante = compilation.nom_fichier(str(texte), donnees)
+    assert sorted(os.listdir(cache)) == sorted([gardee, courante, 'notes.txt'])
@@ -0,0 +1,42 @@
+"""
+Pistes synthétiques (`src.generateur`) : validité, déterminisme et existence d'une solution.
+"""
+import pytest
+
+from src import cli, generateur
+from src.piste import analyser, charger
+
+TAILLES = [(10, 10), (23, 17), (30, 41)]
+
+
+@pytest.mark.parametrize('graine', range(4))
+@pytest.mark.parametrize('largeur, hauteur', TAILLES, ids=[f'{l}x{h}' for l, h in TAILLES])
+@pytest.mark.parametrize('forme', list(generateur.FORMES))
+def test_solution(forme, largeur, hauteur, graine):
+    lignes = generateur.generer(forme, largeur, hauteur, graine)
+    assert len(lignes) == hauteur and {len(ligne) for ligne in lignes} == {largeur}
+    piste = analyser('\n'.join(lignes).encode())
+    assert piste.departs and piste.arrivees
+    for regles in cli.REGLES:
+        assert cli.resoudre(piste, 'largeur', regles)['trajectoire'] is not None
+
+
+@pytest.mark.parametrize('forme', list(generateur.FORMES))
+def test_deterministe(forme):
+    assert generateur.generer(forme, 30, 20, 7) == generateur.generer(forme, 30, 20, 7)
+    assert any(generateur.generer(forme, 30, 20, graine) != generateur.generer(forme, 30, 20, 0)
+               for graine in range(1, 5))
+
+
+@pytest.mark.parametrize('forme, largeur, hauteur', [('spirale', generateur.TAILLE_MIN - 1, 20),
+                                                      ('couloir', 20, 3), ('inconnue', 20, 20)])
+def test_parametres_invalides(forme, largeur, hauteur):
+    with pytest.raises(ValueError):
+        generateur.generer(forme, largeur, hauteur)
+
+
+def test_ecrire(tmp_path):
+    lignes = generateur.generer('labyrinthe', 15, 12, 3)
+    fichier = tmp_path / 'piste.txt'
+    generateur.ecrire(str(fichier), lignes)
+    assert charger(str(fichier)).empreinte == analyser('\n'.join(lignes).encode()).empreinte
@@ -0,0 +1,69 @@
+"""
+Recherche en largeur répartie : même trajectoire que la recherche séquentielle,
+et erreurs des processus relancées dans le processus principal.
+"""
+import multiprocessing
+import os
+
+import pytest
+
+from src import parallele, recherche, vectoriel
+from src.piste import charger
+
+pytestmark = pytest.mark.skipif(not vectoriel.NUMPY_AVAILABLE, reason="NumPy n'est pas installé")
+
+PISTE = 'assets/map_test.txt'
+
+
+@pytest.mark.parametrize('souple', [True, False], ids=['souples', 'strictes'])
+@pytest.mark.parametrize('processus', [1, 3])
+def test_meme_trajectoire_que_largeur(souple, processus):
+    piste = charger(PISTE)
+    reference = recherche.recherche_largeur(recherche.Regles(piste, souple), [])
+    assert parallele.recherche_largeur_parallele(recherche.Regles(piste, souple), [], processus=processus) == reference
+
+
+def defaillant(rang_fautif, panne):
+    executer_ordres = parallele.executer_ordres
+
+    def remplacant(connexion, piste, souple, rang, processus, departs):
+        if rang == rang_fautif:
+            connexion.recv()
+            panne()
+        executer_ordres(connexion, piste, souple, rang, processus, departs)
+
+    return remplacant
+
+
+def lever():
+    raise KeyError('panne')
+
+
+@pytest.fixture
+def fork():
+    if multiprocessing.get_start_method() != 'fork':
+        pytest.skip("les processus doivent hériter de la fonction remplacée")
+
+
+@pytest.mark.parametrize('souple', [True, False], ids=['souples', 'strictes'])
+def test_sans_table_de_bits(fork, monkeypatch, souple):
+    piste = charger(PISTE)
+    reference = recherche.recherche_largeur(recherche.Regles(piste, souple), [])
+    monkeypatch.setattr(recherche, 'TAILLE_BITMAP_MAX', 0)
+    assert parallele.recherche_largeur_parallele(recherche.Regles(piste, souple), [], processus=3) == reference
+
+
+@pytest.mark.parametrize('rang', [0, 2])
+def test_erreur_d_un_processus_relancee(fork, monkeypatch, rang):
+    monkeypatch.setattr(parallele, 'executer_ordres', defaillant(rang, lever))
+    with pytest.raises(KeyError, match='panne') as erreur:
+        parallele.recherche_largeur_parallele(recherche.Regles(charger(PISTE), False), [], processus=3)
+    assert isinstance(erreur.value.__cause__, parallele.ErreurProcessus)
+    assert 'lever' in str(erreur.value.__cause__)
+
+
+@pytest.mark.parametrize('rang', [0, 2])
+def test_processus_arrete_sans_repondre(fork, monkeypatch, rang):
+    monkeypatch.setattr(parallele, 'executer_ordres', defaillant(rang, lambda: os._exit(1)))
+    with pytest.raises(parallele.ErreurProcessus, match=f'processus {rang}'):
+        parallele.recherche_largeur_parallele(recherche.Regles(charger(PISTE), False), [], processus=3)
@@ -0,0 +1,57 @@
+"""
+Lecture des fichiers de pistes et position des erreurs signalées.
+"""
+import pytest
+
+from src.piste import ARRIVEE, DEPART, PisteInvalide, analyser
+
+
+def test_analyse():
+    piste = analyser(b'#####\r\n#>.*#\r\n#####\r\n')
+    assert (piste.largeur, piste.hauteur) == (5, 3)
+    assert piste.case(1, 1) == DEPART
+    assert piste.case(3, 1) == ARRIVEE
+
+
+def test_blancs_ignores_en_bord_de_ligne():
+    assert analyser(b'\n  ###\n  #>*  \n\n').largeur == 3
+
+
+@pytest.mark.parametrize('donnees, ligne, colonne', [
+    (b'###\n#x#\n', 2, 2),
+    (b'###\n# #\n', 2, 2),
+    (b'###\r\n##\t#\r\n', 2, 3),
+    (b'##\r#\t#\r', 2, 2),
+])
+def test_caractere_invalide(donnees, ligne, colonne):
+    with pytest.raises(PisteInvalide) as erreur:
+        analyser(donnees)
+    assert (erreur.value.ligne, erreur.value.colonne) == (ligne, colonne)
+
+
+@pytest.mark.parametrize('donnees', [b'###\n\n##\n', b'###\r\n\r\n##\r\n', b'###\r\r##\r'])
+def test_lignes_inegales(donnees):
+    with pytest.raises(PisteInvalide) as erreur:
+        analyser(donnees)
+    assert erreur.value.ligne == 3
+
+
+@pytest.mark.parametrize('fin', [b'\n', b'\r\n', b'\r'], ids=['unix', 'windows', 'mac'])
+def test_fins_de_ligne(fin):
+    piste = analyser(fin.join([b'#####', b'#>.*#', b'#####', b'']))
+    assert (piste.largeur, piste.hauteur) == (5, 3)
+    assert piste.case(3, 1) == ARRIVEE
+
+
+def test_piste_vide():
+    with pytest.raises(PisteInvalide):
+        analyser(b' \r\n\n')
+
+
+@pytest.mark.parametrize('donnees, message', [
+    ('##\n#é\n'.encode(), "caractère invalide 'é'"),
+    (b'##\n#\xe9#\n', "octet invalide 0xe9"),
+])
+def test_caractere_non_ascii(donnees, message):
+    with pytest.raises(PisteInvalide, match=message):
+        analyser(donnees)
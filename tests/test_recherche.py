@@ -0,0 +1,203 @@
+"""
+Moteur de recherche de trajectoires (`src.recherche`).
+"""
+import threading
+
+import pytest
+
+from src import recherche
+from src.piste import ARRIVEE, MUR, analyser, charger
+
+PISTE = 'assets/map_mini.txt'
+
+
+def test_coups_sans_issue_essayes_en_dernier():
+    piste = analyser(b'#######\n#>...*#\n#######\n')
+    distances = recherche.Regles(piste, False).distances()
+    ordre = recherche.ordre_coups(piste, 2, 1, 0, 0, distances)
+    cibles = [distances[piste.indice(2 + recherche.ACCELERATIONS[coup][0], 1 + recherche.ACCELERATIONS[coup][1])]
+              for coup in ordre]
+    # Les coups sont dépilés depuis la fin : les murs d'abord, puis de la plus loin à la plus proche de l'arrivée.
+    assert cibles == [-1] * 6 + [4, 3, 2]
+
+
+@pytest.mark.parametrize('fichier', [PISTE, 'assets/map_test.txt'])
+@pytest.mark.parametrize('souple', [True, False], ids=['souples', 'strictes'])
+def test_profondeur_ordonnee_developpe_moins_d_etats(fichier, souple):
+    piste = charger(fichier)
+    depart = piste.coordonnees(piste.departs[-1])
+    resultats = []
+    for ordonner in (False, True):
+        stats = recherche.Statistiques()
+        trajectoire = recherche.recherche_profondeur(recherche.Regles(piste, souple), [depart], ordonner=ordonner,
+                                                     stats=stats)
+        assert trajectoire[0] == depart and piste.case(*trajectoire[-1]) == ARRIVEE
+        resultats.append((stats.etats_developpes, len(trajectoire)))
+    (etats, longueur), (etats_ordonnes, longueur_ordonnee) = resultats
+    assert etats_ordonnes * 5 < etats
+    assert longueur_ordonnee < longueur
+
+
+@pytest.mark.parametrize('souple', [True, False], ids=['souples', 'strictes'])
+def test_elagage_garde_la_trajectoire(souple):
+    reference = recherche.recherche_largeur(recherche.Regles(charger(PISTE), souple), [])
+    stats = recherche.Statistiques()
+    trajectoire = recherche.recherche_largeur(recherche.Regles(charger(PISTE), souple, elaguer=True), [], stats)
+    assert trajectoire == reference
+    assert stats.elagues > 0
+
+
+def test_ensemble_visites_alloue_a_la_demande():
+    visites = recherche.EnsembleVisites(1 << 30)
+    etat = (5 << recherche.DECALAGE_TRANCHE) + 3
+    visites.add(etat)
+    visites.add(etat)
+    assert etat in visites and etat + 1 not in visites and 3 not in visites
+    assert len(visites) == 1
+    assert [rang for rang, tranche in enumerate(visites.tranches) if tranche is not None] == [5]
+
+
+def test_ensemble_visites_depuis_octets():
+    octets = bytearray(recherche.OCTETS_TRANCHE + 2)
+    octets[0], octets[-1] = 0b1, 0b10000000
+    visites = recherche.EnsembleVisites.depuis_octets(octets)
+    dernier = len(octets) * 8 - 1
+    assert len(visites.tranches) == 2
+    assert 0 in visites and dernier in visites and 1 not in visites
+    assert len(visites) == 2
+    assert visites.octets() == octets
+
+
+def test_cache_lru_partage_entre_fils():
+    piste = charger('assets/map_test.txt')
+    cache = recherche.CacheCollisions(piste, taille_max=2)
+    cache.table = None
+    segments = [((x, y), (x + dx, y + dy)) for x in range(0, piste.largeur - 3, 3) for y in range(0, piste.hauteur - 3, 3)
+                for dx in range(-3, 4) for dy in range(-3, 4)
+                if 0 <= x + dx < piste.largeur and 0 <= y + dy < piste.hauteur]
+    erreurs = []
+
+    def verifier():
+        try:
+            for debut, fin in segments:
+                assert cache.segment_libre(debut, fin) == recherche.verif_collision_strict(piste, debut, fin)
+        except Exception as erreur:
+            erreurs.append(erreur)
+
+    fils = [threading.Thread(target=verifier) for _ in range(4)]
+    for fil in fils:
+        fil.start()
+    for fil in fils:
+        fil.join()
+    assert not erreurs
+    assert len(cache.lru) <= 2
+
+
+def segments_de(piste, pas=3, portee=3):
+    return [((x, y), (x + dx, y + dy)) for x in range(0, piste.largeur, pas) for y in range(0, piste.hauteur, pas)
+            for dx in range(-portee, portee + 1) for dy in range(-portee, portee + 1)
+            if piste.case(x, y) < MUR and 0 <= x + dx < piste.largeur and 0 <= y + dy < piste.hauteur]
+
+
+@pytest.mark.parametrize('dense', [True, False], ids=['tableau', 'lru'])
+def test_cache_collisions_memorise(dense):
+    piste = charger('assets/map_test.txt')
+    cache = recherche.CacheCollisions(piste)
+    if not dense:
+        cache.table = None
+    segments = segments_de(piste)
+    stats = recherche.Statistiques()
+    for _ in range(2):
+        for debut, fin in segments:
+            assert cache.segment_libre(debut, fin, stats) == recherche.verif_collision_strict(piste, debut, fin)
+    # Le second passage ne retrace aucun segment.
+    assert stats.verifications == len(segments)
+
+
+def test_cache_collisions_lru_borne():
+    piste = charger('assets/map_test.txt')
+    cache = recherche.CacheCollisions(piste, taille_max=2)
+    cache.table = None
+    a, b, c = ((3, 3), (4, 4)), ((5, 5), (6, 6)), ((7, 7), (8, 8))
+    stats = recherche.Statistiques()
+    for debut, fin in (a, b, a, c, a, b):
+        cache.segment_libre(debut, fin, stats)
+    # `a`, relu avant l'ajout de `c`, reste en cache ; `b`, le plus ancien, est évincé puis retracé.
+    assert stats.verifications == 4
+    assert len(cache.lru) == 2
+
+
+def test_cache_collisions_deplacement_hors_index():
+    piste = analyser(b'#######\n#>...*#\n#######\n')
+    cache = recherche.CacheCollisions(piste)
+    stats = recherche.Statistiques()
+    debut, fin = (1, 1), (1 + cache.index.vitesse_max_x + 1, 1)
+    for _ in range(2):
+        assert cache.segment_libre(debut, fin, stats) == recherche.verif_collision_strict(piste, debut, fin)
+    assert stats.verifications == 2
+
+
+@pytest.mark.parametrize('souple', [True, False], ids=['souples', 'strictes'])
+def test_a_etoile_meme_longueur_que_largeur(souple):
+    piste = charger('assets/map_test.txt')
+    reference = recherche.recherche_largeur(recherche.Regles(piste, souple), [])
+    stats = recherche.Statistiques()
+    trajectoire = recherche.recherche_a_etoile(recherche.Regles(piste, souple), [], stats)
+    assert len(trajectoire) == len(reference)
+    assert stats.etats_developpes > 0
+
+
+def test_tours_axe():
+    taille, vmax, debut, fin = 12, 3, 7, 8
+    tours = recherche.tours_axe(taille, vmax, debut, fin)
+    # Parcours en largeur en avant depuis chaque état, pour comparaison.
+    for position in range(taille):
+        for vitesse in range(-vmax, vmax + 1):
+            couche, vus, attendu = {(position, vitesse)}, set(), -1
+            for nombre in range(4 * taille):
+                if any(debut <= p <= fin for p, _ in couche):
+                    attendu = nombre
+                    break
+                vus |= couche
+                couche = {(p + v + a, v + a) for p, v in couche for a in (-1, 0, 1)
+                          if abs(v + a) <= vmax and 0 <= p + v + a < taille} - vus
+            assert tours[position * (2 * vmax + 1) + vitesse + vmax] == attendu
+
+
+@pytest.mark.parametrize('souple', [True, False], ids=['souples', 'strictes'])
+@pytest.mark.parametrize('fichier', ['assets/map_test.txt', 'assets/map2.txt'])
+def test_bidirectionnelle_meme_longueur_en_moins_d_etats(fichier, souple):
+    piste = charger(fichier)
+    reference = recherche.Statistiques()
+    attendue = recherche.recherche_largeur(recherche.Regles(piste, souple), [], reference)
+    stats = recherche.Statistiques()
+    trajectoire = recherche.recherche_bidirectionnelle(recherche.Regles(piste, souple), [], stats)
+    assert len(trajectoire) == len(attendue)
+    assert piste.case(*trajectoire[-1]) == ARRIVEE
+    assert stats.etats_developpes < reference.etats_developpes
+
+
+def test_bidirectionnelle_sans_solution():
+    piste = analyser(b'#######\n#>.#.*#\n#######\n')
+    assert recherche.recherche_bidirectionnelle(recherche.Regles(piste, False), []) is None
+
+
+def test_index_borne_par_les_cases_praticables():
+    piste = analyser(b'#########\n#########\n###>..*##\n#########\n')
+    index = recherche.IndexEtats(piste)
+    assert (index.x0, index.y0, index.largeur, index.hauteur) == (3, 2, 4, 1)
+    assert (index.vitesse_max_x, index.vitesse_max_y) == (2, 0)
+    etats = [(x, 2, vx, 0) for x in range(3, 7) for vx in range(-2, 3)]
+    assert sorted(index.encoder(*etat) for etat in etats) == list(range(index.nombre))
+    assert [index.decoder(index.encoder(*etat)) for etat in etats] == etats
+
+
+@pytest.mark.parametrize('souple', [True, False], ids=['souples', 'strictes'])
+def test_murs_autour_de_la_piste_sans_effet(souple):
+    lignes = open(PISTE, 'rb').read().split()
+    bordee = [b'#' * (len(lignes[0]) + 10)] * 4 + [b'#' * 3 + ligne + b'#' * 7 for ligne in lignes]
+    reference = recherche.recherche_largeur(recherche.Regles(analyser(b'\n'.join(lignes)), souple), [])
+    piste = analyser(b'\n'.join(bordee))
+    assert recherche.IndexEtats(piste).nombre == recherche.IndexEtats(analyser(b'\n'.join(lignes))).nombre
+    trajectoire = recherche.recherche_largeur(recherche.Regles(piste, souple), [])
+    assert trajectoire == [(x + 3, y + 4) for x, y in reference]
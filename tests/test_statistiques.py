@@ -0,0 +1,65 @@
+"""
+Compteurs des recherches (`src.statistiques`) et leur mise à jour par les recherches.
+"""
+import io
+import threading
+
+import pytest
+
+from src import recherche
+from src.piste import analyser
+from src.statistiques import Rapporteur, Statistiques
+
+PISTE = b'#######\n#>...*#\n#######\n'
+
+
+def test_phases_cumulees():
+    stats = Statistiques()
+    for _ in range(2):
+        with stats.phase('recherche'):
+            pass
+    with pytest.raises(KeyError):
+        with stats.phase('preparation'):
+            raise KeyError
+    resume = stats.resume()
+    assert set(resume['phases']) == {'recherche', 'preparation'}
+    assert resume['ecoule'] >= resume['phases']['recherche'] >= 0
+    assert 'vérifications 0' in str(stats)
+
+
+def test_rapporteur():
+    stats = Statistiques()
+    recus = []
+    deux = threading.Event()
+
+    def rappel(vus):
+        recus.append(vus)
+        if len(recus) == 2:
+            deux.set()
+
+    with Rapporteur(stats, intervalle=0.01, rappel=rappel):
+        assert deux.wait(5)
+    nombre = len(recus)
+    assert all(vus is stats for vus in recus)
+    deux.wait(0.05)
+    assert len(recus) == nombre
+
+
+def test_rapporteur_ecrit_sur_sortie():
+    sortie = io.StringIO()
+    stats = Statistiques()
+    stats.etats_developpes = 12
+    with Rapporteur(stats, intervalle=0.01, sortie=sortie):
+        while not sortie.getvalue():
+            threading.Event().wait(0.01)
+    assert 'développés 12' in sortie.getvalue()
+
+
+@pytest.mark.parametrize('souple', [True, False], ids=['souples', 'strictes'])
+def test_verifications_comptees(souple):
+    stats = Statistiques()
+    trajectoire = recherche.recherche_largeur(recherche.Regles(analyser(PISTE), souple), [], stats)
+    assert trajectoire is not None
+    assert stats.verifications > 0
+    if souple:
+        assert stats.verifications == stats.etats_developpes * len(recherche.ACCELERATIONS)
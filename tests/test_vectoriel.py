@@ -0,0 +1,47 @@
+"""
+Recherche en largeur vectorisée : même trajectoire que la recherche séquentielle,
+y compris sans table de bits des états visités.
+"""
+import pytest
+
+from src import recherche, vectoriel
+from src.piste import charger
+
+pytestmark = pytest.mark.skipif(not vectoriel.NUMPY_AVAILABLE, reason="NumPy n'est pas installé")
+
+PISTE = 'assets/map_test.txt'
+
+
+@pytest.mark.parametrize('souple', [True, False], ids=['souples', 'strictes'])
+@pytest.mark.parametrize('depart', [[], None], ids=['tous-departs', 'un-depart'])
+def test_meme_trajectoire_que_largeur(souple, depart):
+    piste = charger(PISTE)
+    trajectoire = depart if depart is not None else [piste.coordonnees(piste.departs[0])]
+    reference = recherche.recherche_largeur(recherche.Regles(piste, souple), trajectoire)
+    assert reference is not None
+    assert vectoriel.recherche_largeur_vectorielle(recherche.Regles(piste, souple), trajectoire) == reference
+
+
+def test_visites_triees():
+    np = vectoriel.np
+    visites = vectoriel.VisitesTriees(np.array([7, 3, 3, 12], dtype=np.int64))
+    ids = np.array([12, 0, 5, 3, 20], dtype=np.int64)
+    assert visites.nouveaux(ids).tolist() == [False, True, True, False, True]
+    visites.ajouter(np.array([20, 0, 5], dtype=np.int64))
+    assert visites.ids.tolist() == [0, 3, 5, 7, 12, 20]
+    assert not visites.nouveaux(ids).any()
+
+
+@pytest.mark.parametrize('souple', [True, False], ids=['souples', 'strictes'])
+def test_sans_table_de_bits(monkeypatch, souple):
+    piste = charger(PISTE)
+    reference = recherche.recherche_largeur(recherche.Regles(piste, souple), [])
+    monkeypatch.setattr(recherche, 'TAILLE_BITMAP_MAX', 0)
+    assert vectoriel.recherche_largeur_vectorielle(recherche.Regles(piste, souple), []) == reference
+
+
+@pytest.mark.parametrize('souple', [True, False], ids=['souples', 'strictes'])
+def test_verifications_comptees(souple):
+    stats = recherche.Statistiques()
+    vectoriel.recherche_largeur_vectorielle(recherche.Regles(charger(PISTE), souple), [], stats)
+    assert stats.verifications > 0